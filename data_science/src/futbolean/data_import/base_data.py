@@ -1,18 +1,124 @@
 """Base module for fetching data from afl_data service"""
 
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, List, Union, Optional, Iterator, Sequence, Tuple, IO
+import os
 import time
+import threading
 
+import ijson
+import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as URLLib3Error
+
+from futbolean.data_import.response_cache import ResponseCache
+from futbolean.data_import.rate_limiter import RateLimiter
+from futbolean.data_import.metrics import import_metrics
+from futbolean.data_import.retry_policy import (
+    RetryPolicy,
+    DEFAULT_RETRY_POLICY,
+    ENDPOINT_RETRY_POLICIES,
+)
 
 
 LOCAL_AFL_DATA_SERVICE = "http://futbol_data:8080"
+# We only ever talk to one host, so we don't need many pools, but each pool
+# should hold enough connections for every batch we have in flight at once
+DEFAULT_POOL_CONNECTIONS = 2
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_HEADERS = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+# The data service can return rows of data as an array of row objects (the default)
+# or as an object of column arrays, which only includes each column name once
+ROWS_FORMAT = "rows"
+COLUMNS_FORMAT = "columns"
+# jsonlite writes missing numbers as strings
+MISSING_NUMBER_STRINGS = {"NA", "NaN", "Inf", "-Inf"}
+# ijson prefixes of the parts of a /player_stats response
+ROWS_PREFIX = "data.data.item"
+COLUMNS_PREFIX = "data.data"
+SKIPPED_URLS_PREFIX = "data.skipped_urls"
+ERROR_PREFIX = "error"
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_response_cache = ResponseCache()
+_rate_limiter = RateLimiter()
 
 
 class DataRequestError(Exception):
     """Raised when data source returns an unsuccessful response"""
 
 
+def make_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = False,
+) -> requests.Session:
+    """
+    Create a requests session that keeps connections to the data service alive
+    and reuses them across calls.
+
+    Args:
+        pool_connections (int): Number of connection pools (i.e. hosts) to cache.
+        pool_maxsize (int): Maximum number of connections to keep in each pool.
+            Should be at least the number of requests made concurrently.
+        pool_block (bool): Whether to block when the pool has no free connections
+            rather than opening a throwaway one.
+
+    Returns:
+        requests.Session with pooled adapters mounted for HTTP and HTTPS.
+    """
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the shared module-level session, creating it if necessary."""
+
+    global _session  # pylint: disable=global-statement
+
+    with _session_lock:
+        if _session is None:
+            _session = make_session()
+
+        return _session
+
+
+def set_session(session: Optional[requests.Session]) -> None:
+    """
+    Replace the shared module-level session used by fetch_data.
+
+    Args:
+        session (requests.Session, None): Session to use for all subsequent
+            requests. Passing None closes the current session, and a fresh one
+            with default settings gets created on the next request.
+    """
+
+    global _session  # pylint: disable=global-statement
+
+    with _session_lock:
+        if _session is not None and _session is not session:
+            _session.close()
+
+        _session = session
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the shared module-level response cache."""
+
+    return _response_cache
+
+
 def _handle_response_data(response: requests.Response) -> Dict[str, Any]:
     parsed_response = response.json()
 
@@ -25,42 +131,557 @@ def _handle_response_data(response: requests.Response) -> Dict[str, Any]:
 
 
 def _make_request(
-    url: str, params: Dict[str, Any] = {}, headers: Dict[str, str] = {}, retry=True
+    url: str,
+    params: Dict[str, Any] = {},
+    headers: Dict[str, str] = {},
+    session: Optional[requests.Session] = None,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    rate_limiter: Optional[RateLimiter] = None,
+    endpoint_path: str = "",
+    stream: bool = False,
 ) -> requests.Response:
-    response = requests.get(url, params=params, headers=headers)
+    request_session = session or get_session()
+    start_time = time.monotonic()
+    attempt = 0
+
+    while True:
+        attempt += 1
+        response: Optional[requests.Response] = None
+
+        # Retries count against the budget too, because they hit fbref all the same
+        if rate_limiter is not None:
+            rate_limiter.acquire(endpoint_path)
 
-    if response.status_code != 200:
         # If it's the first call to the data service in awhile, the response takes
-        # longer due to the container getting started, and it sometimes times out,
-        # so we'll retry once just in case
-        if retry:
-            time.sleep(10)
-            _make_request(url, params=params, headers=headers, retry=False)
-
-        raise RuntimeError(
-            "Bad response from application: "
-            f"{response.status_code} / {response.headers} / {response.text}"
+        # longer due to the container getting started, and it sometimes times out
+        # or the connection gets dropped, so those are worth retrying too
+        try:
+            response = request_session.get(
+                url, params=params, headers=headers, stream=stream
+            )
+        except (requests.ConnectionError, requests.Timeout) as error:
+            failure = f"{type(error).__name__}: {error}"
+        else:
+            if response.status_code == 200:
+                return response
+
+            failure = f"{response.status_code} / {response.headers} / {response.text}"
+            # Streamed responses hold on to their connection until they're closed
+            response.close()
+
+        status_code = None if response is None else response.status_code
+        retry_after = None if response is None else response.headers.get("Retry-After")
+        wait_seconds = retry_policy.delay(attempt, retry_after=retry_after)
+        elapsed_seconds = time.monotonic() - start_time
+
+        if (
+            not retry_policy.is_retryable(status_code)
+            or attempt >= retry_policy.max_attempts
+            or elapsed_seconds + wait_seconds > retry_policy.max_elapsed
+        ):
+            raise DataRequestError(
+                f"Bad response from application after {attempt} attempt(s): {failure}"
+            )
+
+        import_metrics.record_retry(
+            endpoint_path, attempt, wait_seconds, status_code=status_code
         )
+        time.sleep(wait_seconds)
+
 
-    return response
+def _is_cacheable(data: Dict[str, Any]) -> bool:
+    # If the data service had to skip some URLs, the response is incomplete,
+    # so we'll want to fetch it again next time
+    response_data = data.get("data")
 
+    if not isinstance(response_data, dict):
+        return True
 
-def fetch_data(path: str, params: Dict[str, Any] = {}) -> Dict[str, Any]:
+    skipped_urls = response_data.get("skipped_urls")
+
+    return skipped_urls is None or not any(skipped_urls)
+
+
+def _count_rows(data: Dict[str, Any]) -> int:
+    # Player stats come back as a dict of rows and skipped URLs,
+    # but player URLs come back as a plain list
+    response_data = data.get("data")
+
+    if isinstance(response_data, dict):
+        response_data = response_data.get("data")
+
+    return len(response_data) if isinstance(response_data, list) else 0
+
+
+def fetch_data(
+    path: str,
+    params: Dict[str, Any] = {},
+    session: Optional[requests.Session] = None,
+    use_cache: bool = True,
+    cache: Optional[ResponseCache] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    verbose: int = 0,
+) -> Dict[str, Any]:
     """
     Fetch data from the afl_data service
 
     Args:
         path (string): API endpoint to call.
         params (dict): Query parameters to include in the API request.
+        session (requests.Session, None): Session to make the request with.
+            Defaults to the shared, pooled module-level session.
+        use_cache (bool): Whether to return a fresh cached response if there is one
+            and cache the new response if there isn't. Set to False to always
+            call the data service.
+        cache (ResponseCache, None): Cache to use. Defaults to the module-level
+            cache in RESPONSE_CACHE_DIR.
+        retry_policy (RetryPolicy, None): When and how often to retry failed
+            requests. Defaults to the policy for the endpoint in
+            ENDPOINT_RETRY_POLICIES, or DEFAULT_RETRY_POLICY.
+        rate_limiter (RateLimiter, None): Limiter that paces requests to the
+            data service. Defaults to the module-level limiter, which shares
+            its budget with every process that uses RATE_LIMIT_DIR.
+            Cached responses don't count against the budget.
+        verbose (int): Whether to print info statements (1 means yes, 0 means no).
 
     Returns:
         list of dicts, representing the AFL data requested.
     """
 
+    response_cache = cache or _response_cache
+
+    if use_cache:
+        cached_data = response_cache.get(path, params)
+
+        if cached_data is not None:
+            if verbose == 1:
+                print(f"Using cached response for {path}")
+
+            import_metrics.record_cache_hit(path, _count_rows(cached_data))
+
+            return cached_data
+
     service_host = LOCAL_AFL_DATA_SERVICE
     headers: Dict[str, str] = {}
 
     service_url = service_host + path
-    response = _make_request(service_url, params=params, headers=headers)
+    request_start_time = time.monotonic()
+    response = _make_request(
+        service_url,
+        params=params,
+        headers=headers,
+        session=session,
+        retry_policy=retry_policy
+        or ENDPOINT_RETRY_POLICIES.get(path, DEFAULT_RETRY_POLICY),
+        rate_limiter=rate_limiter or _rate_limiter,
+        endpoint_path=path,
+    )
+    # Reading the content before parsing it separates time spent receiving
+    # the response from time spent parsing it
+    n_bytes = len(response.content)
+    parse_start_time = time.monotonic()
+
+    data = _handle_response_data(response)
+
+    parse_end_time = time.monotonic()
+    import_metrics.record_request(
+        path,
+        parse_start_time - request_start_time,
+        n_bytes,
+        parse_end_time - parse_start_time,
+        _count_rows(data),
+        status_code=response.status_code,
+    )
+
+    if use_cache and _is_cacheable(data):
+        response_cache.set(path, params, data)
+
+    return data
+
+
+def _iter_json_values(
+    source: IO[bytes], prefixes: Sequence[str], map_prefixes: Sequence[str] = ()
+) -> Iterator[Tuple[str, Any]]:
+    # Like ijson.items, but for several prefixes in one pass over the source.
+    # Values at map_prefixes only get built if they're objects.
+    builder: Optional[ijson.ObjectBuilder] = None
+    building_prefix = ""
+    depth = 0
+
+    for prefix, event, value in ijson.parse(source, use_float=True):
+        if builder is None:
+            if prefix not in prefixes or event in ("map_key", "end_map", "end_array"):
+                continue
+
+            if prefix in map_prefixes and event != "start_map":
+                continue
+
+            builder = ijson.ObjectBuilder()
+            building_prefix = prefix
+
+        builder.event(event, value)
+
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+
+        if depth == 0:
+            yield building_prefix, builder.value
+            builder = None
+
+
+class _ResponseReader:
+    # File-like reader of a streamed response that copies each chunk it reads
+    # to a cache file, and keeps track of time spent waiting on the network
+    def __init__(self, response: requests.Response, cache_filepath: Optional[str]):
+        response.raw.decode_content = True
+
+        self.response = response
+        self.cache_filepath = cache_filepath
+        self.n_bytes = 0
+        self.read_seconds = 0.0
+        self._cache_file = (
+            None if cache_filepath is None else open(cache_filepath, "wb")
+        )
+
+    def read(self, size: int = -1) -> bytes:
+        read_start_time = time.monotonic()
+
+        # The connection can still get dropped after _make_request has returned,
+        # partway through the body
+        try:
+            chunk = self.response.raw.read(size)
+        except (requests.RequestException, URLLib3Error) as error:
+            raise DataRequestError(
+                f"Response was cut off: {type(error).__name__}: {error}"
+            ) from error
+
+        self.read_seconds += time.monotonic() - read_start_time
+        self.n_bytes += len(chunk)
+
+        if self._cache_file is not None:
+            self._cache_file.write(chunk)
+
+        return chunk
+
+    def close(self) -> None:
+        if self._cache_file is not None:
+            self._cache_file.close()
+
+        self.response.close()
+
+    def remove_cache_file(self) -> None:
+        if self.cache_filepath is not None and os.path.isfile(self.cache_filepath):
+            os.remove(self.cache_filepath)
+
+
+def _normalize_column(values: Any) -> List[Any]:
+    # Guards against a single-row column getting unboxed into a scalar
+    column = values if isinstance(values, list) else [values]
+    # Any other string means it's a string column. Otherwise, it's a numeric
+    # column, even if all of its values are missing.
+    is_numeric = not any(
+        isinstance(value, str) and value not in MISSING_NUMBER_STRINGS
+        for value in column
+    )
+
+    if not is_numeric:
+        return column
+
+    return [
+        None if isinstance(value, str) and value in MISSING_NUMBER_STRINGS else value
+        for value in column
+    ]
+
+
+def _column_rows(columns: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    column_names = list(columns.keys())
+
+    for values in zip(*columns.values()):
+        # Row-oriented responses leave out missing values, so we do the same
+        yield {
+            column_name: value
+            for column_name, value in zip(column_names, values)
+            if value is not None
+        }
+
+
+class StreamedData:
+    """
+    Data from a /player_stats response that gets parsed as it's read, rather than
+    holding the whole response body and the whole tree of parsed objects.
+
+    Iterating yields each row (once), one at a time, whether the response is
+    row-oriented or column-oriented. to_frame builds a data frame instead,
+    straight from the columns of column-oriented responses. The response's
+    skipped URLs are available once the data has been read, and an error
+    in the response raises a DataRequestError at the end. So do responses
+    that get cut off or can't be parsed.
+
+    Data that doesn't get read in full should be closed (e.g. by using it
+    as a context manager), although it also gets closed when it's garbage
+    collected.
+    """
+
+    def __init__(self, source: IO[bytes]):
+        """
+        Args:
+            source (file-like): Binary source of the response's JSON.
+        """
+
+        self.skipped_urls: Union[List[str], str] = []
+        self.n_rows = 0
+        # Time spent reading and parsing, but not processing the rows
+        # that have been yielded
+        self.iteration_seconds = 0.0
+        self._source = source
+
+    def __enter__(self) -> "StreamedData":
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def close(self) -> None:
+        """Stop reading the data, and release the response or file it's read from"""
+
+        self._source.close()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for prefix, value in self._iter_parts():
+            if prefix == ROWS_PREFIX:
+                yield value
+            else:
+                yield from _column_rows(value)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Read the data into a data frame.
+
+        Returns:
+            pd.DataFrame with one row per row of data.
+        """
+
+        rows: List[Dict[str, Any]] = []
+        column_frames: List[pd.DataFrame] = []
+
+        for prefix, value in self._iter_parts():
+            if prefix == ROWS_PREFIX:
+                rows.append(value)
+            else:
+                column_frames.append(pd.DataFrame(value))
+
+        return column_frames[0] if column_frames else pd.DataFrame(rows)
+
+    def _iter_parts(self) -> Iterator[Tuple[str, Any]]:
+        iteration_start_time = time.monotonic()
+        consumer_seconds = 0.0
+
+        try:
+            for prefix, value in _iter_json_values(
+                self._source,
+                [ROWS_PREFIX, COLUMNS_PREFIX, SKIPPED_URLS_PREFIX, ERROR_PREFIX],
+                map_prefixes=[COLUMNS_PREFIX],
+            ):
+                if prefix == ROWS_PREFIX:
+                    self.n_rows += 1
+                elif prefix == COLUMNS_PREFIX:
+                    value = {
+                        column_name: _normalize_column(values)
+                        for column_name, values in value.items()
+                    }
+                    self.n_rows += max(
+                        (len(column) for column in value.values()), default=0
+                    )
+                elif prefix == SKIPPED_URLS_PREFIX:
+                    # R's NULL gets serialized as an empty object
+                    self.skipped_urls = value if isinstance(value, (list, str)) else []
+                    continue
+                elif value is not None and any(value):
+                    raise DataRequestError(value)
+                else:
+                    continue
+
+                yield_time = time.monotonic()
+                yield prefix, value
+                consumer_seconds += time.monotonic() - yield_time
+
+            self.iteration_seconds = (
+                time.monotonic() - iteration_start_time - consumer_seconds
+            )
+            self._on_complete()
+        except ijson.JSONError as error:
+            raise DataRequestError(
+                f"Invalid or incomplete response: {error}"
+            ) from error
+        finally:
+            self._source.close()
+
+    def _on_complete(self) -> None:
+        pass
+
+
+class _StreamedResponseData(StreamedData):
+    def __init__(
+        self,
+        reader: _ResponseReader,
+        path: str,
+        params: Dict[str, Any],
+        response_cache: ResponseCache,
+        response_seconds: float,
+    ):
+        super().__init__(reader)
+
+        self._reader = reader
+        self._path = path
+        self._params = params
+        self._response_cache = response_cache
+        self._response_seconds = response_seconds
+
+    def close(self) -> None:
+        super().close()
+        # Responses that weren't read in full don't get cached
+        self._reader.remove_cache_file()
+
+    def _iter_parts(self) -> Iterator[Tuple[str, Any]]:
+        try:
+            yield from super()._iter_parts()
+        finally:
+            # Responses that were cut off, had errors, or were incomplete
+            # don't get cached
+            self._reader.remove_cache_file()
+
+    def _on_complete(self) -> None:
+        reader = self._reader
+        reader.close()
+
+        import_metrics.record_request(
+            self._path,
+            self._response_seconds + reader.read_seconds,
+            reader.n_bytes,
+            self.iteration_seconds - reader.read_seconds,
+            self.n_rows,
+            status_code=reader.response.status_code,
+        )
+
+        if reader.cache_filepath is not None and _is_cacheable(
+            {"data": {"skipped_urls": self.skipped_urls}}
+        ):
+            self._response_cache.set_file(
+                self._path, self._params, reader.cache_filepath
+            )
+
+
+class _CachedStreamedData(StreamedData):
+    def __init__(self, source: IO[bytes], path: str):
+        super().__init__(source)
+        self._path = path
+
+    def _on_complete(self) -> None:
+        import_metrics.record_cache_hit(self._path, self.n_rows)
+
+
+def get_cached_data(
+    path: str,
+    params: Dict[str, Any] = {},
+    cache: Optional[ResponseCache] = None,
+    verbose: int = 0,
+) -> Optional[StreamedData]:
+    """
+    Get the cached response for a request, without making the request
+    if there isn't a fresh one.
+
+    Args:
+        path (string): API endpoint.
+        params (dict): Query parameters of the request.
+        cache (ResponseCache, None): Same as for fetch_data.
+        verbose (int): Whether to print info statements (1 means yes, 0 means no).
+
+    Returns:
+        StreamedData that yields each row of the cached response's data or None.
+    """
+
+    cached_filepath = (cache or _response_cache).get_filepath(path, params)
+
+    if cached_filepath is None:
+        return None
+
+    if verbose == 1:
+        print(f"Using cached response for {path}")
+
+    return _CachedStreamedData(open(cached_filepath, "rb"), path)
+
+
+def stream_data(
+    path: str,
+    params: Dict[str, Any] = {},
+    session: Optional[requests.Session] = None,
+    use_cache: bool = True,
+    cache: Optional[ResponseCache] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    response_format: str = ROWS_FORMAT,
+    verbose: int = 0,
+) -> StreamedData:
+    """
+    Fetch rows of data from the data service, parsing them as the response
+    is received rather than after it has all arrived. Meant for endpoints
+    with big responses of rows of data (i.e. /player_stats).
+
+    The raw response gets written to the cache as it's read, and only kept
+    once it has been read in full without errors or skipped URLs.
+
+    Args:
+        path (string): API endpoint to call.
+        params (dict): Query parameters to include in the API request.
+        session (requests.Session, None): Same as for fetch_data.
+        use_cache (bool): Same as for fetch_data.
+        cache (ResponseCache, None): Same as for fetch_data.
+        retry_policy (RetryPolicy, None): Same as for fetch_data.
+        rate_limiter (RateLimiter, None): Same as for fetch_data.
+        response_format (str): Shape of the data to ask for: ROWS_FORMAT or
+            COLUMNS_FORMAT. Versions of the data service that don't support
+            COLUMNS_FORMAT ignore it and return rows, which StreamedData
+            handles all the same.
+        verbose (int): Whether to print info statements (1 means yes, 0 means no).
+
+    Returns:
+        StreamedData that yields each row of the response's data.
+    """
+
+    response_cache = cache or _response_cache
+
+    if response_format != ROWS_FORMAT:
+        params = {**params, "format": response_format}
+
+    if use_cache:
+        cached_data = get_cached_data(
+            path, params=params, cache=response_cache, verbose=verbose
+        )
+
+        if cached_data is not None:
+            return cached_data
+
+    request_start_time = time.monotonic()
+    response = _make_request(
+        LOCAL_AFL_DATA_SERVICE + path,
+        params=params,
+        headers={},
+        session=session,
+        retry_policy=retry_policy
+        or ENDPOINT_RETRY_POLICIES.get(path, DEFAULT_RETRY_POLICY),
+        rate_limiter=rate_limiter or _rate_limiter,
+        endpoint_path=path,
+        stream=True,
+    )
+    response_seconds = time.monotonic() - request_start_time
+    reader = _ResponseReader(
+        response, response_cache.temp_filepath() if use_cache else None
+    )
 
-    return _handle_response_data(response)
+    return _StreamedResponseData(reader, path, params, response_cache, response_seconds)
@@ -0,0 +1,163 @@
+"""Adaptive sizing of batches of requests to the data service"""
+
+from typing import Optional
+import threading
+
+
+# Based on my experience with AFL player data, responses of roughly 30,000 rows
+# are about as big as the data service can handle without timing out.
+DEFAULT_MAX_ROWS_PER_BATCH = 30000
+# Scraping a player's pages takes a few seconds per page (the data service sleeps
+# between requests to avoid getting blocked), so a batch that takes much longer
+# than this is likely to hit a timeout somewhere between here and fbref.
+DEFAULT_TARGET_BATCH_SECONDS = 600
+# A high share of skipped URLs means the site is pushing back, so we shrink
+# the batches rather than risk getting blocked completely.
+DEFAULT_MAX_SKIP_RATE = 0.1
+GROWTH_FACTOR = 1.5
+SHRINK_FACTOR = 0.5
+# Weight of the latest observation in the running averages
+SMOOTHING = 0.5
+# Number of consecutive batches without a size change before we consider
+# the size settled
+SETTLED_AFTER_N_BATCHES = 3
+
+
+class AdaptiveBatchSizer:
+    """
+    Picks the number of items per batch based on how previous batches went.
+
+    Batches grow (by at most GROWTH_FACTOR per batch) towards the largest size
+    that is expected to stay under both the target latency and the maximum
+    number of rows per response, and shrink by SHRINK_FACTOR whenever a batch
+    fails or has too many skipped items. Updates are thread-safe, so batches
+    fetched concurrently can all report back to the same sizer.
+    """
+
+    def __init__(
+        self,
+        initial_size: int,
+        min_size: int = 1,
+        max_size: Optional[int] = None,
+        target_seconds: float = DEFAULT_TARGET_BATCH_SECONDS,
+        max_rows: int = DEFAULT_MAX_ROWS_PER_BATCH,
+        max_skip_rate: float = DEFAULT_MAX_SKIP_RATE,
+        verbose: int = 1,
+    ):
+        """
+        Args:
+            initial_size (int): Number of items in the first batch.
+            min_size (int): Smallest allowed batch size.
+            max_size (int, None): Largest allowed batch size. Defaults to no limit.
+            target_seconds (float): Response time per batch to aim for.
+            max_rows (int): Maximum number of data rows per response to aim for.
+            max_skip_rate (float): Share of skipped items in a batch above which
+                the batch size gets reduced.
+            verbose (int): Whether to print info statements (1 means yes, 0 means no).
+        """
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.max_rows = max_rows
+        self.max_skip_rate = max_skip_rate
+        self.verbose = verbose
+
+        self._size = self._clamp(initial_size)
+        self._seconds_per_item: Optional[float] = None
+        self._rows_per_item: Optional[float] = None
+        self._n_unchanged = 0
+        self._lock = threading.Lock()
+
+    @property
+    def batch_size(self) -> int:
+        """Number of items to put in the next batch"""
+
+        return self._size
+
+    @property
+    def is_settled(self) -> bool:
+        """Whether the batch size has stayed the same for the last few batches"""
+
+        return self._n_unchanged >= SETTLED_AFTER_N_BATCHES
+
+    def record_batch(
+        self, n_items: int, seconds: float, n_rows: int, n_skipped: int = 0
+    ) -> int:
+        """
+        Update the batch size based on a successful batch.
+
+        Args:
+            n_items (int): Number of items in the batch.
+            seconds (float): How long the batch took to fetch.
+            n_rows (int): Number of data rows in the response.
+            n_skipped (int): Number of items that the data service skipped.
+
+        Returns:
+            The new batch size.
+        """
+
+        if n_items < 1:
+            return self._size
+
+        with self._lock:
+            self._seconds_per_item = self._smooth(
+                self._seconds_per_item, seconds / n_items
+            )
+            self._rows_per_item = self._smooth(self._rows_per_item, n_rows / n_items)
+
+            if n_skipped / n_items > self.max_skip_rate:
+                return self._resize(self._size * SHRINK_FACTOR)
+
+            size_limits = [self._size * GROWTH_FACTOR]
+
+            if self._seconds_per_item > 0:
+                size_limits.append(self.target_seconds / self._seconds_per_item)
+
+            if self._rows_per_item > 0:
+                size_limits.append(self.max_rows / self._rows_per_item)
+
+            return self._resize(min(size_limits))
+
+    def record_error(self) -> int:
+        """
+        Shrink the batch size after a failed batch.
+
+        Returns:
+            The new batch size.
+        """
+
+        with self._lock:
+            return self._resize(self._size * SHRINK_FACTOR)
+
+    @staticmethod
+    def _smooth(average: Optional[float], value: float) -> float:
+        if average is None:
+            return value
+
+        return SMOOTHING * value + (1 - SMOOTHING) * average
+
+    def _clamp(self, size: float) -> int:
+        clamped_size = max(self.min_size, int(size))
+
+        if self.max_size is None:
+            return clamped_size
+
+        return min(self.max_size, clamped_size)
+
+    def _resize(self, size: float) -> int:
+        new_size = self._clamp(size)
+
+        if new_size == self._size:
+            self._n_unchanged += 1
+
+            if self.verbose == 1 and self._n_unchanged == SETTLED_AFTER_N_BATCHES:
+                print(f"Batch size settled at {new_size}")
+        else:
+            if self.verbose == 1:
+                print(f"Changing batch size from {self._size} to {new_size}")
+
+            self._n_unchanged = 0
+            self._size = new_size
+
+        return new_size
@@ -0,0 +1,141 @@
+"""Per-batch checkpoints for resuming interrupted data imports"""
+
+from typing import List, Optional, Set, Tuple, Union, cast
+import os
+from datetime import datetime
+
+from mypy_extensions import TypedDict
+
+from futbolean.data_import.json_lines import append_json_lines, iter_json_lines
+
+
+BatchCheckpoint = TypedDict(
+    "BatchCheckpoint",
+    {
+        "batch_id": str,
+        "player_urls": List[str],
+        "skipped_urls": Union[List[str], str],
+        "n_rows": int,
+        "data_end_offset": Optional[int],
+        "saved_at": str,
+    },
+)
+
+
+def manifest_filepath_for(data_filepath: str) -> str:
+    """Path to the checkpoint manifest that goes with the given data file"""
+
+    root, _ext = os.path.splitext(data_filepath)
+    return f"{root}.manifest.jsonl"
+
+
+def generate_run_id() -> str:
+    """Timestamp-based ID for prefixing the batch IDs of one run"""
+
+    return datetime.now().strftime("%Y%m%d%H%M%S%f")
+
+
+def record_batch_checkpoint(
+    manifest_filepath: str,
+    batch_id: str,
+    player_urls: List[str],
+    skipped_urls: Union[List[str], str],
+    n_rows: int,
+    data_end_offset: Optional[int] = None,
+) -> BatchCheckpoint:
+    """
+    Append a checkpoint for a batch whose data has been saved to the manifest.
+
+    Args:
+        manifest_filepath (str): Path to the *.manifest.jsonl file.
+        batch_id (str): Unique ID for the batch.
+        player_urls (list of str): URLs that were requested in the batch.
+        skipped_urls (list of str): URLs that the data service skipped.
+        n_rows (int): Number of data rows saved for the batch.
+        data_end_offset (int, None): Size in bytes of the data file once
+            the batch's rows were saved.
+
+    Returns:
+        The checkpoint that was recorded.
+    """
+
+    checkpoint: BatchCheckpoint = {
+        "batch_id": batch_id,
+        "player_urls": list(player_urls),
+        "skipped_urls": list(skipped_urls),
+        "n_rows": n_rows,
+        "data_end_offset": data_end_offset,
+        "saved_at": datetime.now().isoformat(),
+    }
+
+    append_json_lines(manifest_filepath, [checkpoint])
+
+    return checkpoint
+
+
+def load_checkpointed_urls(manifest_filepath: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Get the URLs covered by previous runs' checkpoints.
+
+    Args:
+        manifest_filepath (str): Path to the *.manifest.jsonl file.
+
+    Returns:
+        Tuple of the set of URLs whose data has been saved and the set of URLs
+        that were skipped and still haven't been saved.
+    """
+
+    completed_urls: Set[str] = set()
+    skipped_urls: Set[str] = set()
+
+    if not os.path.isfile(manifest_filepath):
+        return completed_urls, skipped_urls
+
+    for row in iter_json_lines(manifest_filepath):
+        checkpoint = cast(BatchCheckpoint, row)
+        batch_skipped_urls = set(checkpoint["skipped_urls"])
+
+        completed_urls |= set(checkpoint["player_urls"]) - batch_skipped_urls
+        skipped_urls |= batch_skipped_urls
+
+    return completed_urls, skipped_urls - completed_urls
+
+
+def truncate_to_last_checkpoint(data_filepath: str, manifest_filepath: str) -> int:
+    """
+    Remove any rows that were appended to the data file after the last
+    checkpoint (i.e. by a batch that got interrupted before its checkpoint
+    was recorded), so they don't get duplicated when the batch is refetched.
+
+    Args:
+        data_filepath (str): Path to the *.jsonl data file.
+        manifest_filepath (str): Path to the *.manifest.jsonl file.
+
+    Returns:
+        Number of bytes removed from the data file.
+    """
+
+    if not os.path.isfile(data_filepath) or not os.path.isfile(manifest_filepath):
+        return 0
+
+    data_end_offset = None
+
+    for row in iter_json_lines(manifest_filepath):
+        data_end_offset = cast(BatchCheckpoint, row).get("data_end_offset")
+
+    # Checkpoints from before offsets were recorded don't tell us where
+    # the saved data ends, so we leave the file as it is
+    if data_end_offset is None:
+        return 0
+
+    n_extra_bytes = os.path.getsize(data_filepath) - data_end_offset
+
+    if n_extra_bytes <= 0:
+        return 0
+
+    with open(data_filepath, "r+b") as data_file:
+        data_file.truncate(data_end_offset)
+        data_file.flush()
+        os.fsync(data_file.fileno())
+
+    return n_extra_bytes
@@ -1,18 +1,63 @@
 """Module for fetching betting data from afl_data service"""
 
-from typing import List, Dict, Any, cast, Union, Optional, Tuple
+from typing import (
+    List,
+    Dict,
+    Any,
+    cast,
+    Union,
+    Optional,
+    Tuple,
+    Set,
+    Callable,
+    Iterable,
+    Iterator,
+    TypeVar,
+)
 import re
 import os
+import shutil
 import json
 import itertools
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from warnings import warn
 from datetime import date
 
-import numpy as np
+import pandas as pd
 from mypy_extensions import TypedDict
 
-from futbolean.data_import.base_data import fetch_data, DataRequestError
-from futbolean.settings import RAW_DATA_DIR
+from futbolean.data_import.base_data import (
+    fetch_data,
+    stream_data,
+    get_cached_data,
+    get_response_cache,
+    StreamedData,
+    DataRequestError,
+    COLUMNS_FORMAT,
+    ROWS_FORMAT,
+)
+from futbolean.data_import.batch_sizing import AdaptiveBatchSizer
+from futbolean.data_import.metrics import import_metrics
+from futbolean.data_import.checkpoints import (
+    manifest_filepath_for,
+    generate_run_id,
+    record_batch_checkpoint,
+    load_checkpointed_urls,
+    truncate_to_last_checkpoint,
+)
+from futbolean.data_import.json_lines import (
+    append_json_lines,
+    iter_json_lines,
+    convert_json_to_json_lines,
+    SpooledRows,
+)
+from futbolean.data_import.player_match_parquet import (
+    update_player_match_parquet_dataset,
+)
+from futbolean.settings import RAW_DATA_DIR, INTERMEDIATE_DATA_DIR
 
 # FBRef doesn't seem to have per-match player data before the 2014-2015 season.
 # We may want data aggregated by season, which goes back a bit futher,
@@ -23,14 +68,28 @@ LAST_COMPLETE_SEASON = "2018-2019"
 # of data in a response, and 200 EPL players, averaging (very roughly)
 # 4 seasons of data each, with roughly 40 (EPL and international) matches
 # per season equals 32,000 rows of data.
-# The size of these batches will likely increase with each new season, so I may
-# have to eventually reduce the number of players per batch.
+# The size of these batches will likely increase with each new season, so
+# this is only the starting size: the number of players per batch gets adjusted
+# based on response times, row counts, and skipped URLs as batches come back.
 # PLAYER_BATCH_SIZE = 200
 PLAYER_BATCH_SIZE = 50
+MIN_PLAYER_BATCH_SIZE = 5
+MAX_PLAYER_BATCH_SIZE = 200
+# Fetching one batch at a time is the safest default for not getting rate-limited
+# by fbref, but the data service can work on a few batches at once.
+# Keep this at or below base_data.DEFAULT_POOL_MAXSIZE, or the extra requests
+# won't get to reuse pooled connections.
+DEFAULT_MAX_IN_FLIGHT = 1
 
+Item = TypeVar("Item")
+Result = TypeVar("Result")
 
 PlayerData = TypedDict(
-    "PlayerData", {"data": List[Dict[str, Any]], "skipped_urls": Union[List[str], str]}
+    "PlayerData",
+    {
+        "data": Union[List[Dict[str, Any]], pd.DataFrame],
+        "skipped_urls": Union[List[str], str],
+    },
 )
 
 
@@ -38,6 +97,7 @@ def fetch_player_urls(
     start_season: str = EARLIEST_SEASON_WITH_PLAYER_MATCH_DATA,
     end_season: str = LAST_COMPLETE_SEASON,
     verbose: int = 1,
+    use_cache: bool = True,
 ) -> PlayerData:
     """
     Get list of URLs for EPL player pages on fbref.com.
@@ -50,6 +110,8 @@ def fetch_player_urls(
             Since EPL seasons cover two calendar years, must have the format
             of two consecutive years separated by a dash (e.g. 2015-2016).
         verbose (int): Whether to print info statements (1 means yes, 0 means no).
+        use_cache (bool): Whether to use cached responses from the data service
+            when they're still fresh.
 
     Returns
         List of player URLs.
@@ -59,7 +121,10 @@ def fetch_player_urls(
         print(f"Fetching player URLs from {start_season} to {end_season}...")
 
     data = fetch_data(
-        "/player_urls", params={"start_season": start_season, "end_season": end_season}
+        "/player_urls",
+        params={"start_season": start_season, "end_season": end_season},
+        use_cache=use_cache,
+        verbose=verbose,
     )
 
     if verbose == 1:
@@ -68,96 +133,598 @@ def fetch_player_urls(
     return cast(PlayerData, data["data"])
 
 
+def _player_cache_params(
+    player_url: str, since_dates: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    # Each player's rows get cached on their own, because batch boundaries
+    # change from run to run, so a cached batch would rarely get requested again
+    return {
+        "player_url": player_url,
+        "since_date": (since_dates or {}).get(player_url, ""),
+    }
+
+
+def _player_stats_response(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"data": {"data": rows, "skipped_urls": []}, "error": {}}
+
+
+def _frame_rows(data_frame: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+    for row in data_frame.to_dict("records"):
+        # Row-oriented responses leave out missing values, so we do the same
+        yield {
+            key: value
+            for key, value in row.items()
+            if not (pd.api.types.is_scalar(value) and pd.isna(value))
+        }
+
+
+def _cache_player_rows(
+    rows: Iterable[Dict[str, Any]],
+    player_urls: List[str],
+    skipped_urls: Union[List[str], str],
+    since_dates: Optional[Dict[str, str]] = None,
+) -> None:
+    response_cache = get_response_cache()
+    urls_to_cache = set(player_urls) - set(
+        [skipped_urls] if isinstance(skipped_urls, str) else skipped_urls
+    )
+    cached_urls: Set[str] = set()
+
+    # The data service returns each player's rows together, so we only ever
+    # hold one player's rows in memory
+    for player_url, player_rows in itertools.groupby(
+        rows, key=lambda row: row.get("PlayerUrl")
+    ):
+        # Without URLs, we can't tell which rows belong to which player
+        if player_url is None:
+            return
+
+        if player_url not in urls_to_cache:
+            continue
+
+        cache_params = _player_cache_params(player_url, since_dates)
+
+        # Players whose rows are split up would only have some of them cached
+        if player_url in cached_urls:
+            response_cache.delete("/player_stats", cache_params)
+            urls_to_cache.discard(player_url)
+            continue
+
+        response_cache.set(
+            "/player_stats", cache_params, _player_stats_response(list(player_rows))
+        )
+        cached_urls.add(player_url)
+
+    # Players without any (new) matches get cached too, so we don't ask for them
+    # again either
+    for player_url in urls_to_cache - cached_urls:
+        response_cache.set(
+            "/player_stats",
+            _player_cache_params(player_url, since_dates),
+            _player_stats_response([]),
+        )
+
+
 def _fetch_player_match_data_batch(
-    player_urls: List[str], idx: int, verbose: int = 1
+    player_urls: List[str],
+    idx: int,
+    verbose: int = 1,
+    use_cache: bool = True,
+    since_dates: Optional[Dict[str, str]] = None,
+    as_frame: bool = False,
+    batch_sizer: Optional[AdaptiveBatchSizer] = None,
 ) -> PlayerData:
     if verbose == 1:
         print(f"Fetching player stats for batch {idx + 1}")
 
-    data = fetch_data("/player_stats", params={"player_urls": player_urls})
+    cached_data: List[StreamedData] = []
+    requested_urls: List[str] = []
+
+    for player_url in player_urls:
+        player_data = (
+            get_cached_data(
+                "/player_stats", params=_player_cache_params(player_url, since_dates)
+            )
+            if use_cache
+            else None
+        )
+
+        if player_data is None:
+            requested_urls.append(player_url)
+        else:
+            cached_data.append(player_data)
+
+    if verbose == 1 and cached_data:
+        print(f"Using cached data for {len(cached_data)} players in batch {idx + 1}")
+
+    requested_rows: Union[SpooledRows, pd.DataFrame, List[Dict[str, Any]]] = []
+    skipped_urls: Union[List[str], str] = []
+
+    if requested_urls:
+        start_time = time.time()
+        params: Dict[str, Any] = {"player_urls": requested_urls}
+
+        if since_dates:
+            params["since_dates"] = [since_dates.get(url, "") for url in requested_urls]
+
+        # Column-oriented responses only include each column name once rather than
+        # on every row, which makes them much smaller and quicker to parse.
+        # But each column gets parsed in full before the first row can be built,
+        # so when we only need rows, we ask for them so they're parsed one at a time.
+        streamed_data = stream_data(
+            "/player_stats",
+            params=params,
+            use_cache=False,
+            response_format=COLUMNS_FORMAT if as_frame else ROWS_FORMAT,
+            verbose=verbose,
+        )
+        # Batches can have tens of thousands of rows, so rather than building
+        # a list of rows, we build a data frame straight from the columns,
+        # or spool the rows to disk until the batch's turn to be saved
+        requested_rows = (
+            streamed_data.to_frame() if as_frame else SpooledRows(streamed_data)
+        )
+        skipped_urls = streamed_data.skipped_urls
+
+        # Cache hits take next to no time, so only the players that were requested
+        # count towards the batch size
+        if batch_sizer is not None:
+            batch_sizer.record_batch(
+                len(requested_urls),
+                time.time() - start_time,
+                len(requested_rows),
+                n_skipped=len(skipped_urls),
+            )
+
+        if use_cache:
+            _cache_player_rows(
+                _frame_rows(requested_rows) if as_frame else requested_rows,
+                requested_urls,
+                skipped_urls,
+                since_dates=since_dates,
+            )
 
     if verbose == 1:
         print(f"Data for batch {idx + 1} received!")
 
-    return cast(PlayerData, data["data"])
+    rows: Union[SpooledRows, pd.DataFrame, List[Dict[str, Any]]] = requested_rows
 
+    if as_frame:
+        frames = [player_data.to_frame() for player_data in cached_data]
+        frames += [requested_rows] if requested_urls else []
+        rows = (
+            pd.concat(frames, ignore_index=True, sort=False)
+            if frames
+            else pd.DataFrame()
+        )
+    elif cached_data:
+        rows = SpooledRows(itertools.chain(*cached_data, requested_rows))
 
-def fetch_player_match_data(
-    player_urls: List[str] = [], verbose: int = 1
-) -> Tuple[PlayerData, Optional[int]]:
+    return cast(PlayerData, {"data": rows, "skipped_urls": skipped_urls})
+
+
+def _map_in_order(
+    func: Callable[[Item], Result], items: Iterable[Item], max_in_flight: int = 1
+) -> Iterator[Result]:
     """
-    Get per-match player stats for EPL going back to the 2014-2015 season
+    Lazily apply func to each item, running up to max_in_flight calls at once
+    in worker threads, and yield the results in the same order as the items.
+
+    Any exception raised by a call is re-raised when its result is reached,
+    and calls that haven't started yet are cancelled. The same happens if the
+    generator is closed before it's exhausted.
+    """
+
+    if max_in_flight <= 1:
+        for item in items:
+            yield func(item)
+
+        return
+
+    item_iter = iter(items)
+    executor = ThreadPoolExecutor(max_workers=max_in_flight)
+    in_flight = deque(
+        executor.submit(func, item)
+        for item in itertools.islice(item_iter, max_in_flight)
+    )
+
+    try:
+        while in_flight:
+            result = in_flight.popleft().result()
+
+            for item in itertools.islice(item_iter, 1):
+                in_flight.append(executor.submit(func, item))
+
+            yield result
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+        # Requests that are already running can't be interrupted, but we don't
+        # need to wait on them either, because their results get thrown away
+        executor.shutdown(wait=False)
+
+
+def _iter_player_url_batches(
+    player_urls: List[str], batch_sizer: AdaptiveBatchSizer
+) -> Iterator[List[str]]:
+    # Batches are sliced off lazily, so each one gets whatever size the sizer
+    # has settled on by the time it's requested
+    start_idx = 0
+
+    while start_idx < len(player_urls):
+        end_idx = start_idx + batch_sizer.batch_size
+        yield player_urls[start_idx:end_idx]
+        start_idx = end_idx
+
+
+def _fetch_sized_player_match_data_batch(
+    player_url_batch: List[str],
+    idx: int,
+    batch_sizer: AdaptiveBatchSizer,
+    verbose: int = 1,
+    use_cache: bool = True,
+    since_dates: Optional[Dict[str, str]] = None,
+    as_frame: bool = False,
+) -> PlayerData:
+    start_time = time.time()
+
+    try:
+        data_batch = _fetch_player_match_data_batch(
+            player_url_batch,
+            idx,
+            verbose=verbose,
+            use_cache=use_cache,
+            since_dates=since_dates,
+            as_frame=as_frame,
+            batch_sizer=batch_sizer,
+        )
+    except DataRequestError:
+        batch_sizer.record_error()
+        raise
+
+    batch_seconds = time.time() - start_time
+    import_metrics.record_batch(
+        len(player_url_batch),
+        len(data_batch["data"]),
+        batch_seconds,
+        n_skipped=len(data_batch["skipped_urls"]),
+    )
+
+    return data_batch
+
+
+def iter_player_match_data(
+    player_urls: List[str],
+    verbose: int = 1,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    batch_sizer: Optional[AdaptiveBatchSizer] = None,
+    use_cache: bool = True,
+    since_dates: Optional[Dict[str, str]] = None,
+    as_frame: bool = False,
+) -> Iterator[Tuple[List[str], PlayerData]]:
+    """
+    Lazily fetch per-match player stats in batches, yielding each batch
+    as soon as it (and every batch before it) has been received.
+
+    Batches are contiguous slices of player_urls, so if iteration stops early
+    because of a DataRequestError, the first URL that wasn't fetched is at the
+    index equal to the total number of URLs in the batches already yielded.
 
     Args:
         player_urls (array-like): List of URLs to player pages on fbref.com.
         verbose (int): Whether to print info statements (1 means yes, 0 means no).
+        max_in_flight (int): Maximum number of batches to request from the data
+            service at the same time. Results are still returned in batch order,
+            and no new batches are requested after the first one that fails.
+        batch_sizer (AdaptiveBatchSizer, None): Decides the number of players
+            in each batch. Defaults to one that starts at PLAYER_BATCH_SIZE.
+        use_cache (bool): Whether to use cached responses from the data service
+            when they're still fresh.
+        since_dates (dict, None): Map of player URLs to dates (YYYY-MM-DD).
+            Only matches after a player's date get fetched, and players
+            without a date get all their matches.
+        as_frame (bool): Whether each batch's data should be a data frame
+            rather than rows of dicts.
 
     Returns
-        list of dicts of player data.
+        Iterator of tuples of the player URLs in the batch and the batch's data.
     """
 
-    n_urls = len(player_urls)
-
-    if n_urls > PLAYER_BATCH_SIZE:
-        n_batches = round(n_urls / PLAYER_BATCH_SIZE)
-        player_url_batches = np.array_split(np.array(player_urls), n_batches)
-    else:
-        player_url_batches = [player_urls]
+    batch_sizer = batch_sizer or AdaptiveBatchSizer(
+        PLAYER_BATCH_SIZE,
+        min_size=MIN_PLAYER_BATCH_SIZE,
+        max_size=MAX_PLAYER_BATCH_SIZE,
+        verbose=verbose,
+    )
 
     if verbose == 1:
-        batch_size = len(player_url_batches[0])
         print(
-            f"Fetching player-match data in {len(player_url_batches)} batches "
-            f"of roughly {batch_size} players each..."
+            f"Fetching player-match data for {len(player_urls)} players, starting "
+            f"with batches of {batch_sizer.batch_size} players each..."
         )
 
-    data_batches = []
-    idx = 0
-    error_url_idx = None
+    # Batches get created as they're requested, so we keep track of them here
+    # to know which URLs belong to each result
+    player_url_batches: List[List[str]] = []
+
+    def request_batch(player_url_batch: List[str]) -> Callable[[], PlayerData]:
+        idx = len(player_url_batches)
+        player_url_batches.append(player_url_batch)
+
+        return lambda: _fetch_sized_player_match_data_batch(
+            player_url_batch,
+            idx,
+            batch_sizer,
+            verbose=verbose,
+            use_cache=use_cache,
+            since_dates=since_dates,
+            as_frame=as_frame,
+        )
 
-    for idx, player_url_batch in enumerate(player_url_batches):
-        try:
-            data_batches.append(
-                _fetch_player_match_data_batch(player_url_batch, idx, verbose=verbose)
-            )
-        except DataRequestError as error:
-            first_url_in_batch = player_url_batch[0]
-            warn(
-                f"Tried to fetch batch #{idx} of data, which begins with URL: "
-                f"{first_url_in_batch}, but received the error below. "
-                f"Returning any data already fetched prior to the error.\n\n{error}"
-            )
+    fetched_batches = _map_in_order(
+        lambda fetch_batch: fetch_batch(),
+        (
+            request_batch(player_url_batch)
+            for player_url_batch in _iter_player_url_batches(player_urls, batch_sizer)
+        ),
+        max_in_flight=max_in_flight,
+    )
 
-            error_url_idx = player_urls.index(first_url_in_batch)
+    n_batches = 0
+
+    try:
+        for data_batch in fetched_batches:
+            yield player_url_batches[n_batches], data_batch
+            n_batches += 1
+    except DataRequestError as error:
+        first_url_in_batch = player_url_batches[n_batches][0]
+        warn(
+            f"Tried to fetch batch #{n_batches} of data, which begins with URL: "
+            f"{first_url_in_batch}, but received the error below. "
+            f"Returning any data already fetched prior to the error.\n\n{error}"
+        )
 
-            # Assuming there aren't any bugs in the code (BIG assumption, I know),
-            # the error is likely from getting rate-limited by the site, so best to
-            # save what we have and try again later.
-            break
+        # Assuming there aren't any bugs in the code (BIG assumption, I know),
+        # the error is likely from getting rate-limited by the site, so best to
+        # save what we have and try again later.
+    finally:
+        fetched_batches.close()
 
     if verbose == 1:
-        batch_text = "batch" if idx == 0 else "batches"
-        print(f"Player-match data received for {idx + 1} {batch_text}!")
+        batch_text = "batch" if n_batches == 1 else "batches"
+        print(f"Player-match data received for {n_batches} {batch_text}!")
+        print(f"Final batch size: {batch_sizer.batch_size} players")
 
-    player_data = list(
-        itertools.chain.from_iterable(
-            [data_batch["data"] for data_batch in data_batches]
+
+def fetch_player_match_data(
+    player_urls: List[str] = [],
+    verbose: int = 1,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    batch_sizer: Optional[AdaptiveBatchSizer] = None,
+    use_cache: bool = True,
+    since_dates: Optional[Dict[str, str]] = None,
+    as_frame: bool = False,
+) -> Tuple[PlayerData, Optional[int]]:
+    """
+    Get per-match player stats for EPL going back to the 2014-2015 season
+
+    Args:
+        player_urls (array-like): List of URLs to player pages on fbref.com.
+        verbose (int): Whether to print info statements (1 means yes, 0 means no).
+        max_in_flight (int): Maximum number of batches to request from the data
+            service at the same time. Results are still returned in batch order,
+            and no new batches are requested after the first one that fails.
+        batch_sizer (AdaptiveBatchSizer, None): Decides the number of players
+            in each batch. Defaults to one that starts at PLAYER_BATCH_SIZE.
+        use_cache (bool): Whether to use cached responses from the data service
+            when they're still fresh.
+        since_dates (dict, None): Map of player URLs to dates (YYYY-MM-DD).
+            Only matches after a player's date get fetched, and players
+            without a date get all their matches.
+        as_frame (bool): Whether to return the player data as a data frame,
+            built straight from the columns of each response, rather than
+            a list of dicts.
+
+    Returns
+        list of dicts (or data frame) of player data.
+    """
+
+    data_batches = list(
+        iter_player_match_data(
+            player_urls,
+            verbose=verbose,
+            max_in_flight=max_in_flight,
+            batch_sizer=batch_sizer,
+            use_cache=use_cache,
+            since_dates=since_dates,
+            as_frame=as_frame,
         )
     )
 
+    n_fetched_urls = sum(len(player_url_batch) for player_url_batch, _ in data_batches)
+    error_url_idx = None if n_fetched_urls >= len(player_urls) else n_fetched_urls
+
+    batch_data = [data_batch["data"] for _, data_batch in data_batches]
+    player_data: Union[List[Dict[str, Any]], pd.DataFrame]
+
+    if not as_frame:
+        player_data = list(itertools.chain.from_iterable(batch_data))
+    elif batch_data:
+        player_data = pd.concat(batch_data, ignore_index=True, sort=False)
+    else:
+        player_data = pd.DataFrame()
+
     skipped_urls = list(
         itertools.chain.from_iterable(
-            [data_batch["skipped_urls"] for data_batch in data_batches]
+            [data_batch["skipped_urls"] for _, data_batch in data_batches]
         )
     )
 
     return {"data": player_data, "skipped_urls": skipped_urls}, error_url_idx
 
 
+def normalize_player_name(name: str) -> str:
+    """
+    Strip accents, punctuation, and case from a player's name, so that names
+    from different sources (e.g. 'Angeliño' on fbref player pages,
+    'Angelino' in their URLs) match.
+    """
+
+    ascii_name = (
+        unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    )
+
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", ascii_name.lower()).split())
+
+
+def _normalize_player_names(names: pd.Series) -> pd.Series:
+    # Vectorized normalize_player_name
+    return (
+        names.astype(object)
+        .fillna("")
+        .astype(str)
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore")
+        .str.decode("ascii")
+        .str.lower()
+        .str.replace(r"[^a-z0-9]+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def player_key(player_url: Any, player_name: Any) -> str:
+    """
+    Key that identifies a player across data sets: their fbref player URL,
+    or their normalized name for older rows that don't have a PlayerUrl.
+
+    Args:
+        player_url (str or None): The player's fbref URL.
+        player_name (str): The player's name.
+
+    Returns:
+        The player's key.
+    """
+
+    if isinstance(player_url, str) and player_url:
+        return player_url
+
+    return normalize_player_name("" if pd.isnull(player_name) else str(player_name))
+
+
+def player_keys(player_matches: pd.DataFrame) -> pd.Series:
+    """
+    Get the player_key for each row of player match data.
+
+    Args:
+        player_matches (pd.DataFrame): Player match data from fbref.
+
+    Returns:
+        pd.Series of player keys with the same index as player_matches.
+    """
+
+    player_urls = (
+        player_matches["PlayerUrl"].astype(object)
+        if "PlayerUrl" in player_matches.columns
+        else pd.Series(None, index=player_matches.index, dtype=object)
+    )
+
+    return (
+        player_urls.where(player_urls != "")
+        .fillna(_normalize_player_names(player_matches["Player"]))
+        .astype(object)
+    )
+
+
+def _player_match_key(row: Dict[str, Any]) -> Tuple[str, str, str]:
+    return (
+        player_key(row.get("PlayerUrl"), row.get("Player", "")),
+        str(row.get("Date", "")),
+        str(row.get("Comp", "")),
+    )
+
+
+def _legacy_player_match_key(row: Dict[str, Any]) -> Tuple[str, str, str]:
+    # Key the same match would have had if it was saved before rows had a PlayerUrl
+    return _player_match_key({**row, "PlayerUrl": None})
+
+
+def _scan_saved_player_matches(
+    filepath: str,
+) -> Tuple[Dict[str, str], Set[Tuple[str, str, str]]]:
+    latest_match_dates: Dict[str, str] = {}
+    saved_match_keys: Set[Tuple[str, str, str]] = set()
+
+    for row in iter_json_lines(filepath):
+        match_key = _player_match_key(row)
+        saved_match_keys.add(match_key)
+
+        saved_player_key, match_date, _comp = match_key
+
+        if match_date > latest_match_dates.get(saved_player_key, ""):
+            latest_match_dates[saved_player_key] = match_date
+
+    return latest_match_dates, saved_match_keys
+
+
+def player_url_name_key(player_url: str) -> str:
+    """Normalized player name from the slug at the end of an fbref player URL"""
+
+    player_slug = player_url.rstrip("/").split("/")[-1]
+    return normalize_player_name(player_slug)
+
+
+def _latest_match_date(
+    player_url: str, latest_match_dates: Dict[str, str]
+) -> Optional[str]:
+    # Older rows are keyed by player name, so we also check the name in the URL
+    return latest_match_dates.get(player_url) or latest_match_dates.get(
+        player_url_name_key(player_url)
+    )
+
+
+def _filter_new_player_matches(
+    rows: List[Dict[str, Any]],
+    since_dates: Dict[str, str],
+    saved_match_keys: Set[Tuple[str, str, str]],
+) -> List[Dict[str, Any]]:
+    new_rows = []
+
+    for row in rows:
+        match_key = _player_match_key(row)
+        since_date = since_dates.get(row.get("PlayerUrl", ""), "")
+        is_saved = (
+            match_key in saved_match_keys
+            or _legacy_player_match_key(row) in saved_match_keys
+        )
+
+        if is_saved or match_key[1] <= since_date:
+            continue
+
+        saved_match_keys.add(match_key)
+        new_rows.append(row)
+
+    return new_rows
+
+
+def _set_aside_player_match_data(
+    filepath: str, manifest_filepath: str, parquet_dirpath: str
+) -> None:
+    for saved_filepath in [filepath, manifest_filepath]:
+        if os.path.isfile(saved_filepath):
+            os.replace(saved_filepath, f"{saved_filepath}.previous")
+
+    # The Parquet data set's part files are named after byte ranges
+    # of the old data file, so they can't be reused for the new one
+    if os.path.isdir(parquet_dirpath):
+        shutil.rmtree(parquet_dirpath)
+
+
 def save_player_urls(
     start_season: str = EARLIEST_SEASON_WITH_PLAYER_MATCH_DATA,
     end_season: str = LAST_COMPLETE_SEASON,
     verbose: int = 1,
+    use_cache: bool = True,
 ) -> None:
     """
     Get list of URLs for EPL player pages on fbref.com.
@@ -170,12 +737,16 @@ def save_player_urls(
             Since EPL seasons cover two calendar years, must have the format
             of two consecutive years separated by a dash (e.g. 2015-2016).
         verbose (int): Whether to print info statements (1 means yes, 0 means no).
+        use_cache (bool): Whether to use cached responses from the data service
+            when they're still fresh.
 
     Returns
         None
     """
 
-    data = fetch_player_urls(start_season, end_season, verbose=verbose)
+    data = fetch_player_urls(
+        start_season, end_season, verbose=verbose, use_cache=use_cache
+    )
     skipped_urls = data.get("skipped_urls")
 
     if skipped_urls is not None and any(skipped_urls):
@@ -210,25 +781,66 @@ def save_player_match_data(
     starting_url: Optional[str] = None,
     skipped_only: bool = False,
     verbose: int = 1,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    resume: bool = True,
+    use_cache: bool = True,
+    incremental: bool = False,
 ) -> None:
     """
-    Save player data as a *.json file.
+    Save player data as a *.jsonl file, appending each batch to any data
+    that has already been saved.
+
+    After each batch is saved, a checkpoint with its URLs and row count is added
+    to a manifest file next to the data, so a run that gets interrupted
+    (or stops because of a rate-limit error) can pick up where it left off.
+    At the end, a summary of the run's request timings and throughput gets
+    logged (and printed if verbose).
 
     Args:
-        start_season (str, YYYY-YYYY): First season for which to fetch player data.
-            Since EPL seasons cover two calendar years, must have the format
-            of two consecutive years separated by a dash (e.g. 2015-2016).
-        end_season (str, YYYY-YYYY): First season for which to fetch player data.
-            Since EPL seasons cover two calendar years, must have the format
-            of two consecutive years separated by a dash (e.g. 2015-2016).
+        player_url_filepath (str): Path to the JSON list of player URLs to fetch.
+        skipped_url_filepath (str): Path to the JSON list of player URLs that
+            were skipped by previous runs, which get fetched in addition
+            to the player URLs.
+        starting_url (str, None): Player URL to start fetching from, skipping
+            any before it.
+        skipped_only (bool): Whether to only fetch the skipped player URLs.
         verbose (int): Whether to print info statements (1 means yes, 0 means no).
+        max_in_flight (int): Maximum number of batches to request from the data
+            service at the same time.
+        resume (bool): Whether to skip player URLs that have already been saved
+            according to the checkpoint manifest. Set to False to refetch all
+            of them into a new data file. The previous data file and manifest
+            are kept with a '.previous' suffix until the next such run.
+            Can't be combined with skipped_only or incremental, which only make
+            sense when adding to saved data.
+        use_cache (bool): Whether to use cached responses from the data service
+            when they're still fresh.
+        incremental (bool): Whether to only fetch matches played after the latest
+            saved match for each player. New rows for matches that are already
+            saved (same player, date, and competition) are dropped.
 
     Returns:
         None
     """
 
+    if not resume and (skipped_only or incremental):
+        raise ValueError(
+            "resume=False refetches all of the data into a new file, so it can't "
+            "be combined with skipped_only or incremental."
+        )
+
+    import_metrics.reset()
+
     seasons_match = re.search(r"\d{4}-\d{4}-to-\d{4}-\d{4}", player_url_filepath)
     seasons_label = "" if seasons_match is None else f"-{seasons_match[0]}"
+    filepath = os.path.join(RAW_DATA_DIR, f"epl-player-match-data{seasons_label}.jsonl")
+    legacy_filepath = os.path.join(
+        RAW_DATA_DIR, f"epl-player-match-data{seasons_label}.json"
+    )
+    manifest_filepath = manifest_filepath_for(filepath)
+    parquet_dirpath = os.path.join(
+        INTERMEDIATE_DATA_DIR, f"epl-player-match-data{seasons_label}"
+    )
 
     if skipped_only:
         player_urls: List[str] = []
@@ -242,20 +854,110 @@ def save_player_match_data(
     else:
         skipped_urls = []
 
-    player_urls.extend(skipped_urls)
+    completed_urls: Set[str] = set()
+
+    if resume:
+        checkpointed_urls, checkpointed_skipped_urls = load_checkpointed_urls(
+            manifest_filepath
+        )
+        # If the last run was killed, any URLs it skipped never made it
+        # into the skipped-URL file, but they're in the manifest
+        skipped_urls.extend(sorted(set(checkpointed_skipped_urls) - set(skipped_urls)))
+
+        # Incremental refreshes need to check every player for new matches,
+        # not just the ones that haven't been saved yet
+        if not incremental:
+            completed_urls = checkpointed_urls
+
+    player_urls.extend([url for url in skipped_urls if url not in player_urls])
 
     starting_index = (
         player_urls.index(starting_url) if starting_url in player_urls else 0
     )
-    data, error_url_idx = fetch_player_match_data(
-        player_urls[starting_index:], verbose=verbose
-    )
+    urls_to_fetch = [
+        url for url in player_urls[starting_index:] if url not in completed_urls
+    ]
 
-    player_data = data["data"]
-    new_skipped_urls = data["skipped_urls"]
-    urls_skipped_from_error = (
-        [] if error_url_idx is None else player_urls[error_url_idx:]
-    )
+    if verbose == 1 and completed_urls:
+        print(
+            f"Resuming from checkpoints: skipping {len(completed_urls)} player URLs "
+            "whose data is already saved."
+        )
+
+    # Data used to be saved as one big JSON list, which had to be read in full
+    # and rewritten on every run, so we move it over to the append-only file once
+    if os.path.isfile(legacy_filepath) and not os.path.isfile(filepath):
+        convert_json_to_json_lines(legacy_filepath, filepath)
+
+    # Appending refetched players to the saved data would save their rows twice
+    if not resume:
+        _set_aside_player_match_data(filepath, manifest_filepath, parquet_dirpath)
+
+    # A run that was killed partway through a batch can leave some of the batch's
+    # rows in the data file without a checkpoint, and the batch will be fetched
+    # again, so we drop those rows rather than save them twice
+    n_uncheckpointed_bytes = truncate_to_last_checkpoint(filepath, manifest_filepath)
+
+    if verbose == 1 and n_uncheckpointed_bytes > 0:
+        print(
+            f"Removed {n_uncheckpointed_bytes} bytes of data from an interrupted "
+            "batch that will be fetched again."
+        )
+
+    since_dates: Dict[str, str] = {}
+    saved_match_keys: Set[Tuple[str, str, str]] = set()
+
+    if incremental and os.path.isfile(filepath):
+        latest_match_dates, saved_match_keys = _scan_saved_player_matches(filepath)
+
+        for url in urls_to_fetch:
+            latest_match_date = _latest_match_date(url, latest_match_dates)
+
+            if latest_match_date is not None:
+                since_dates[url] = latest_match_date
+
+        if verbose == 1:
+            print(
+                f"Fetching only new matches for the {len(since_dates)} players "
+                "who already have saved data."
+            )
+
+    run_id = generate_run_id()
+    new_skipped_urls: List[str] = []
+    n_fetched_urls = 0
+
+    # Each batch gets written as soon as it arrives, so we never hold more than
+    # one batch of data in memory, and a crash only loses the current batch
+    for idx, (player_url_batch, data_batch) in enumerate(
+        iter_player_match_data(
+            urls_to_fetch,
+            verbose=verbose,
+            max_in_flight=max_in_flight,
+            use_cache=use_cache,
+            since_dates=since_dates if incremental else None,
+        )
+    ):
+        rows = (
+            _filter_new_player_matches(
+                data_batch["data"], since_dates, saved_match_keys
+            )
+            if incremental
+            else data_batch["data"]
+        )
+        n_rows = append_json_lines(filepath, rows)
+        # The checkpoint only gets recorded once the data is safely on disk
+        record_batch_checkpoint(
+            manifest_filepath,
+            f"{run_id}-{idx}",
+            player_url_batch,
+            data_batch["skipped_urls"],
+            n_rows,
+            data_end_offset=os.path.getsize(filepath),
+        )
+        new_skipped_urls.extend(data_batch["skipped_urls"])
+        n_fetched_urls += len(player_url_batch)
+
+    urls_skipped_from_error = urls_to_fetch[n_fetched_urls:]
 
     # We want to keep track of formerly-skipped URLs that we still haven't scraped
     # due to some error as well as add any newly-skipped URLs
@@ -267,25 +969,19 @@ def save_player_match_data(
         os.remove(skipped_url_filepath)
 
     if combined_skipped_urls and any(combined_skipped_urls):
-        filepath = skipped_url_filepath
-
-        with open(filepath, "w") as json_file:
+        with open(skipped_url_filepath, "w") as json_file:
             json.dump(list(combined_skipped_urls), json_file, indent=2)
 
-    filepath = os.path.join(RAW_DATA_DIR, f"epl-player-match-data{seasons_label}.json")
-
+    # The pipeline loads the typed, columnar copy of the data, which gets a new
+    # part file with just the rows that were added since the last run
     if os.path.isfile(filepath):
-        with open(filepath, "r", encoding="utf8") as json_file:
-            existing_player_data = json.load(json_file)
-            player_data.extend(existing_player_data)
+        update_player_match_parquet_dataset(filepath, parquet_dirpath)
 
-    # Result columns have a weird UTF-8 dash in the string, so coercing to ASCII
-    # results in weird encoding values
-    with open(filepath, "w", encoding="utf8") as json_file:
-        json.dump(player_data, json_file, indent=2, ensure_ascii=False)
+    import_metrics.log_summary()
 
     if verbose == 1:
         print("Player match data saved")
+        print(import_metrics.format_summary())
 
 
 if __name__ == "__main__":
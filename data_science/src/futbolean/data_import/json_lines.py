@@ -0,0 +1,139 @@
+"""Append-only storage of rows of data as JSON Lines files"""
+
+from typing import Dict, Any, Iterable, Iterator, Optional
+import os
+import json
+import tempfile
+from warnings import warn
+
+
+def append_json_lines(filepath: str, rows: Iterable[Dict[str, Any]]) -> int:
+    """
+    Append rows to a JSON Lines file (one JSON object per line), creating
+    the file if it doesn't exist. Existing rows are never read or rewritten,
+    and the new rows are flushed to disk before returning, so a crash can only
+    lose the batch that was being written at the time.
+
+    Args:
+        filepath (str): Path to the *.jsonl file.
+        rows (iterable of dicts): Rows of data to append.
+
+    Returns:
+        Number of rows appended.
+    """
+
+    needs_newline = False
+
+    if os.path.isfile(filepath) and os.path.getsize(filepath) > 0:
+        with open(filepath, "rb") as jsonl_file:
+            jsonl_file.seek(-1, os.SEEK_END)
+            # If a previous write got cut off partway through a line, we end
+            # the broken line here, so it doesn't corrupt the first new row
+            needs_newline = jsonl_file.read(1) != b"\n"
+
+    n_rows = 0
+
+    # Result columns have a weird UTF-8 dash in the string, so coercing to ASCII
+    # results in weird encoding values
+    with open(filepath, "a", encoding="utf8") as jsonl_file:
+        if needs_newline:
+            jsonl_file.write("\n")
+
+        for row in rows:
+            jsonl_file.write(json.dumps(row, ensure_ascii=False) + "\n")
+            n_rows += 1
+
+        jsonl_file.flush()
+        os.fsync(jsonl_file.fileno())
+
+    return n_rows
+
+
+def iter_json_lines(
+    filepath: str, start_offset: int = 0, end_offset: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read rows from a JSON Lines file, skipping any lines that were
+    only partially written.
+
+    Args:
+        filepath (str): Path to the *.jsonl file.
+        start_offset (int): Byte offset of the first line to read.
+        end_offset (int, None): Byte offset at which to stop reading.
+            Defaults to the end of the file.
+
+    Returns:
+        Iterator of dicts, one per row.
+    """
+
+    # Reading bytes means that offsets are always byte offsets,
+    # whatever the characters in the file
+    with open(filepath, "rb") as jsonl_file:
+        jsonl_file.seek(start_offset)
+        offset = start_offset
+
+        for line_number, line in enumerate(jsonl_file, start=1):
+            if end_offset is not None and offset >= end_offset:
+                break
+
+            offset += len(line)
+
+            if not line.strip():
+                continue
+
+            try:
+                yield json.loads(line.decode("utf8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                warn(f"Skipping incomplete row on line {line_number} of {filepath}")
+
+
+def convert_json_to_json_lines(json_filepath: str, jsonl_filepath: str) -> int:
+    """
+    Append the rows from a JSON file containing a list of dicts to a
+    JSON Lines file.
+
+    Args:
+        json_filepath (str): Path to the *.json file.
+        jsonl_filepath (str): Path to the *.jsonl file.
+
+    Returns:
+        Number of rows converted.
+    """
+
+    with open(json_filepath, "r", encoding="utf8") as json_file:
+        rows = json.load(json_file)
+
+    return append_json_lines(jsonl_filepath, rows)
+
+
+class SpooledRows:
+    """
+    Rows of data spooled to an anonymous temporary JSON Lines file, so they can be
+    counted and iterated over (any number of times) without holding them
+    in memory. The file gets deleted when the object is garbage-collected.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]):
+        """
+        Args:
+            rows (iterable of dicts): Rows of data to spool, which are written
+                to the file one at a time as they're iterated.
+        """
+
+        self._file = tempfile.TemporaryFile("w+", encoding="utf8")
+        self._n_rows = 0
+
+        for row in rows:
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self._n_rows += 1
+
+        self._file.flush()
+
+    def __len__(self) -> int:
+        return self._n_rows
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self._file.seek(0)
+
+        for line in self._file:
+            yield json.loads(line)
@@ -0,0 +1,253 @@
+"""Timing and throughput metrics for requests to the data service"""
+
+from typing import Any, Dict, Optional
+import logging
+import threading
+import time
+
+
+# Configured in conf/base/logging.yml to write each event as a line of JSON
+# to logs/metrics.log
+METRICS_LOGGER_NAME = "futbolean.data_import.metrics"
+MEGABYTE = 1024 * 1024
+
+
+class ImportMetrics:
+    """
+    Running totals of requests, retries, and batches fetched from the data service.
+
+    Each event also gets logged to the metrics logger with its numbers as
+    structured fields (e.g. 'seconds', 'n_bytes', 'n_rows'), so slow runs can
+    be broken down into time spent waiting on the data service, receiving
+    responses, and parsing them. Updates are thread-safe, so batches fetched
+    concurrently can all record to the same metrics.
+    """
+
+    def __init__(self, logger_name: str = METRICS_LOGGER_NAME):
+        """
+        Args:
+            logger_name (str): Name of the logger to log each event to.
+        """
+
+        self._logger = logging.getLogger(logger_name)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the totals and restart the clock for throughput"""
+
+        with self._lock:
+            self._started_at = time.time()
+            self._totals: Dict[str, float] = {
+                "n_requests": 0,
+                "n_cached_requests": 0,
+                "n_retries": 0,
+                "request_seconds": 0.0,
+                "max_request_seconds": 0.0,
+                "parse_seconds": 0.0,
+                "n_bytes": 0,
+                "n_rows": 0,
+                "n_batches": 0,
+                "n_players": 0,
+                "n_skipped_players": 0,
+                "batch_seconds": 0.0,
+            }
+
+    def record_request(
+        self,
+        path: str,
+        seconds: float,
+        n_bytes: int,
+        parse_seconds: float,
+        n_rows: int,
+        status_code: Optional[int] = None,
+    ) -> None:
+        """
+        Record a request that got a response from the data service.
+
+        Args:
+            path (str): API endpoint.
+            seconds (float): Time from sending the request to receiving the whole
+                response, including any retries and rate-limit waits.
+            n_bytes (int): Size of the response body.
+            parse_seconds (float): Time spent parsing the response's JSON.
+            n_rows (int): Number of rows of data in the response.
+            status_code (int, None): Response status code.
+        """
+
+        self._add(
+            n_requests=1,
+            request_seconds=seconds,
+            parse_seconds=parse_seconds,
+            n_bytes=n_bytes,
+            n_rows=n_rows,
+        )
+
+        with self._lock:
+            self._totals["max_request_seconds"] = max(
+                self._totals["max_request_seconds"], seconds
+            )
+
+        self._log(
+            "Request to %s took %.2fs (%d bytes, %d rows, %.2fs parsing)",
+            (path, seconds, n_bytes, n_rows, parse_seconds),
+            event="request",
+            path=path,
+            seconds=seconds,
+            n_bytes=n_bytes,
+            parse_seconds=parse_seconds,
+            n_rows=n_rows,
+            status_code=status_code,
+        )
+
+    def record_cache_hit(self, path: str, n_rows: int) -> None:
+        """
+        Record a request that was answered from the response cache.
+
+        Args:
+            path (str): API endpoint.
+            n_rows (int): Number of rows of data in the cached response.
+        """
+
+        self._add(n_cached_requests=1, n_rows=n_rows)
+        self._log(
+            "Used cached response for %s (%d rows)",
+            (path, n_rows),
+            event="cache_hit",
+            path=path,
+            n_rows=n_rows,
+        )
+
+    def record_retry(
+        self,
+        path: str,
+        attempt: int,
+        wait_seconds: float,
+        status_code: Optional[int] = None,
+    ) -> None:
+        """
+        Record a failed attempt at a request that is about to be retried.
+
+        Args:
+            path (str): API endpoint.
+            attempt (int): Number of the failed attempt, starting at 1.
+            wait_seconds (float): Time to wait before retrying.
+            status_code (int, None): Response status code. None means the request
+                failed without a response.
+        """
+
+        self._add(n_retries=1)
+        self._log(
+            "Attempt %d at %s failed with status %s, retrying in %.1fs",
+            (attempt, path, status_code, wait_seconds),
+            event="retry",
+            path=path,
+            attempt=attempt,
+            wait_seconds=wait_seconds,
+            status_code=status_code,
+        )
+
+    def record_batch(
+        self, n_players: int, n_rows: int, seconds: float, n_skipped: int = 0
+    ) -> None:
+        """
+        Record a batch of player match data.
+
+        Args:
+            n_players (int): Number of players requested in the batch.
+            n_rows (int): Number of rows received.
+            seconds (float): Time taken to fetch the batch.
+            n_skipped (int): Number of players the data service skipped.
+        """
+
+        self._add(
+            n_batches=1,
+            n_players=n_players,
+            n_skipped_players=n_skipped,
+            batch_seconds=seconds,
+        )
+        self._log(
+            "Fetched batch of %d players in %.1fs (%.1f rows/s, %.2f players/s)",
+            (n_players, seconds, _rate(n_rows, seconds), _rate(n_players, seconds)),
+            event="batch",
+            n_players=n_players,
+            n_rows=n_rows,
+            n_skipped=n_skipped,
+            seconds=seconds,
+            rows_per_second=_rate(n_rows, seconds),
+            players_per_second=_rate(n_players, seconds),
+        )
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Totals since the metrics were last reset, with overall throughput.
+
+        Returns:
+            Dict of metric names to values.
+        """
+
+        with self._lock:
+            totals = dict(self._totals)
+            elapsed_seconds = time.time() - self._started_at
+
+        n_requests = totals["n_requests"]
+
+        return {
+            **totals,
+            "elapsed_seconds": elapsed_seconds,
+            "mean_request_seconds": _rate(totals["request_seconds"], n_requests),
+            # Batches can be fetched concurrently, so throughput is based on
+            # wall-clock time rather than the sum of the batches' times
+            "rows_per_second": _rate(totals["n_rows"], elapsed_seconds),
+            "players_per_second": _rate(totals["n_players"], elapsed_seconds),
+        }
+
+    def format_summary(self) -> str:
+        """Human-readable version of the summary"""
+
+        summary = self.summary()
+
+        return "\n".join(
+            [
+                f"Fetched {summary['n_rows']:.0f} rows for "
+                f"{summary['n_players']:.0f} players in {summary['n_batches']:.0f} "
+                f"batches over {summary['elapsed_seconds']:.1f}s "
+                f"({summary['rows_per_second']:.1f} rows/s, "
+                f"{summary['players_per_second']:.2f} players/s)",
+                f"Requests: {summary['n_requests']:.0f} to the data service "
+                f"(mean {summary['mean_request_seconds']:.1f}s, "
+                f"max {summary['max_request_seconds']:.1f}s), "
+                f"{summary['n_cached_requests']:.0f} from the cache, "
+                f"{summary['n_retries']:.0f} retries",
+                f"Received {summary['n_bytes'] / MEGABYTE:.1f}MB, "
+                f"spent {summary['parse_seconds']:.1f}s parsing JSON",
+                f"Players skipped by the data service: "
+                f"{summary['n_skipped_players']:.0f}",
+            ]
+        )
+
+    def log_summary(self) -> None:
+        """Log the summary to the metrics logger"""
+
+        self._log(
+            "Import summary:\n%s",
+            (self.format_summary(),),
+            event="summary",
+            **self.summary(),
+        )
+
+    def _add(self, **amounts: float) -> None:
+        with self._lock:
+            for name, amount in amounts.items():
+                self._totals[name] += amount
+
+    def _log(self, message: str, args: tuple, **fields: Any) -> None:
+        self._logger.info(message, *args, extra=fields)
+
+
+def _rate(amount: float, seconds: float) -> float:
+    return amount / seconds if seconds > 0 else 0.0
+
+
+# Shared by all requests in this process, like base_data's response cache
+import_metrics = ImportMetrics()
@@ -0,0 +1,408 @@
+"""Typed, columnar storage of player match data as Parquet files"""
+
+from typing import Dict, Any, List, Optional, Sequence, Union
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from futbolean.data_import.json_lines import iter_json_lines
+
+
+SEASON_COLUMN = "Season"
+# The EPL season runs from August to May, so anything from July on belongs
+# to the season that starts that year
+SEASON_START_MONTH = 7
+
+CATEGORY_TYPE = pa.dictionary(pa.int32(), pa.string())
+CATEGORY_COLUMNS = ["Comp", "Squad", "Position"]
+# Part files in a Parquet data set directory are named after the range of bytes
+# of the JSON Lines file that they were converted from
+PART_FILENAME_TEMPLATE = "part-{start_offset:015d}-{end_offset:015d}.parquet"
+PART_FILENAME_REGEX = re.compile(r"^part-(\d+)-(\d+)\.parquet$")
+COUNT_STAT_COLUMNS = [
+    "Min",
+    "OffenseGls",
+    "OffenseAst",
+    "OffenseSh",
+    "OffenseSoT",
+    "OffenseCrs",
+    "OffenseFld",
+    "OffensePK",
+    "OffensePKatt",
+    "DefenseTkl",
+    "DefenseInt",
+    "DefenseFls",
+    "DefenseCrdY",
+    "DefenseCrdR",
+]
+# Only rows scraped after fbref started publishing expected goals have these
+EXPECTED_STAT_COLUMNS = ["ExpectedxG", "ExpectedxG-PK", "ExpectedxA"]
+GOALKEEPING_COUNT_STAT_COLUMNS = [
+    "GoalkeepingCS",
+    "GoalkeepingGA",
+    "GoalkeepingSaves",
+    "GoalkeepingSoTA",
+]
+
+# Column order matches the rows returned by the data service's /player_stats
+PLAYER_MATCH_SCHEMA = pa.schema(
+    [
+        ("Date", pa.date32()),
+        ("Day", pa.string()),
+        ("Comp", CATEGORY_TYPE),
+        ("Round", pa.string()),
+        ("Venue", pa.string()),
+        ("Result", pa.string()),
+        ("Squad", CATEGORY_TYPE),
+        ("Opponent", pa.string()),
+        ("Start", pa.string()),
+    ]
+    + [(column, pa.int32()) for column in COUNT_STAT_COLUMNS]
+    + [
+        ("Player", pa.string()),
+        ("Position", CATEGORY_TYPE),
+        ("HeightCm", pa.int32()),
+        ("WeightKg", pa.int32()),
+        ("Birthdate", pa.date32()),
+        ("NationalTeam", pa.string()),
+    ]
+    + [(column, pa.int32()) for column in GOALKEEPING_COUNT_STAT_COLUMNS]
+    + [("GoalkeepingSavePercentage", pa.float64()),]
+    + [(column, pa.float64()) for column in EXPECTED_STAT_COLUMNS]
+    + [("PlayerUrl", pa.string()), (SEASON_COLUMN, pa.string()),]
+)
+
+
+def season_label(match_date: pd.Timestamp) -> Optional[str]:
+    """Season (e.g. '2018-2019') in which a match was played"""
+
+    if pd.isnull(match_date):
+        return None
+
+    start_year = (
+        match_date.year
+        if match_date.month >= SEASON_START_MONTH
+        else match_date.year - 1
+    )
+
+    return f"{start_year}-{start_year + 1}"
+
+
+def _to_arrow_array(values: pd.Series, data_type: pa.DataType) -> pa.Array:
+    if pa.types.is_date32(data_type):
+        # Blank dates (e.g. missing birthdates) become nulls
+        timestamps = pd.to_datetime(values, errors="coerce")
+        return pa.array(timestamps, type=pa.timestamp("ns"), from_pandas=True).cast(
+            data_type
+        )
+
+    if pa.types.is_integer(data_type):
+        # The data service fills missing stats with 0, so we do the same
+        numbers = pd.to_numeric(values, errors="coerce").fillna(0)
+        return pa.array(numbers.astype(data_type.to_pandas_dtype()), type=data_type)
+
+    if pa.types.is_floating(data_type):
+        numbers = pd.to_numeric(values, errors="coerce")
+        return pa.array(numbers, type=data_type, from_pandas=True)
+
+    strings = values.where(pd.notnull(values), None).astype(object)
+    string_array = pa.array(
+        [None if value is None else str(value) for value in strings], type=pa.string(),
+    )
+
+    if pa.types.is_dictionary(data_type):
+        return string_array.dictionary_encode()
+
+    return string_array
+
+
+def _to_inferred_arrow_array(values: pd.Series) -> pa.Array:
+    try:
+        return pa.array(values, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Columns with a mix of types get saved as strings
+        return _to_arrow_array(values, pa.string())
+
+
+def player_match_table(data: Union[pd.DataFrame, List[Dict[str, Any]]]) -> pa.Table:
+    """
+    Convert player match data to an Arrow table with PLAYER_MATCH_SCHEMA,
+    adding the season of each match. Columns that aren't in the schema
+    get added after it with inferred types, and missing columns are filled
+    with nulls.
+
+    Args:
+        data (pd.DataFrame, list of dicts): Player match data.
+
+    Returns:
+        pyarrow.Table sorted by season.
+    """
+
+    data_frame = pd.DataFrame(data)
+    match_dates = pd.to_datetime(
+        data_frame.get("Date", pd.Series([None] * len(data_frame))), errors="coerce"
+    )
+    data_frame[SEASON_COLUMN] = [season_label(match_date) for match_date in match_dates]
+    data_frame = data_frame.iloc[
+        np.argsort(data_frame[SEASON_COLUMN].fillna("").values, kind="stable")
+    ].reset_index(drop=True)
+
+    empty_column = pd.Series([None] * len(data_frame), dtype=object)
+    arrays = [
+        _to_arrow_array(data_frame.get(field.name, empty_column), field.type)
+        for field in PLAYER_MATCH_SCHEMA
+    ]
+    # New columns from the data service shouldn't get lost before
+    # we get around to adding them to the schema
+    extra_columns = [
+        column
+        for column in data_frame.columns
+        if PLAYER_MATCH_SCHEMA.get_field_index(str(column)) == -1
+    ]
+    extra_arrays = [
+        _to_inferred_arrow_array(data_frame[column]) for column in extra_columns
+    ]
+    schema = pa.schema(
+        list(PLAYER_MATCH_SCHEMA)
+        + [
+            pa.field(str(column), array.type)
+            for column, array in zip(extra_columns, extra_arrays)
+        ]
+    )
+
+    return pa.Table.from_arrays(arrays + extra_arrays, schema=schema)
+
+
+def write_player_match_parquet(
+    filepath: str, data: Union[pd.DataFrame, List[Dict[str, Any]]]
+) -> int:
+    """
+    Save player match data to a Parquet file with one or more row groups
+    per season, so that loading a few seasons only reads those row groups.
+
+    Args:
+        filepath (str): Path to the *.parquet file.
+        data (pd.DataFrame, list of dicts): Player match data.
+
+    Returns:
+        Number of rows saved.
+    """
+
+    table = player_match_table(data)
+    seasons = table.column(SEASON_COLUMN).to_pandas()
+    # Rows are sorted by season, so each season is one contiguous slice
+    season_boundaries = np.flatnonzero(
+        seasons.fillna("").values[1:] != seasons.fillna("").values[:-1]
+    )
+    slice_starts = [0] + list(season_boundaries + 1)
+    slice_ends = list(season_boundaries + 1) + [table.num_rows]
+
+    directory = os.path.dirname(filepath)
+
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Writing to a temporary file first means that a crash mid-write doesn't
+    # leave a corrupted file behind
+    temp_filepath = filepath + ".tmp"
+
+    with pq.ParquetWriter(temp_filepath, table.schema) as writer:
+        for start, end in zip(slice_starts, slice_ends):
+            writer.write_table(table.slice(start, end - start))
+
+    os.replace(temp_filepath, filepath)
+
+    return table.num_rows
+
+
+def _season_row_groups(
+    parquet_file: pq.ParquetFile, seasons: Sequence[str]
+) -> List[int]:
+    season_column_idx = parquet_file.schema_arrow.get_field_index(SEASON_COLUMN)
+    row_groups = []
+
+    for row_group_idx in range(parquet_file.num_row_groups):
+        statistics = (
+            parquet_file.metadata.row_group(row_group_idx)
+            .column(season_column_idx)
+            .statistics
+        )
+
+        # Without statistics, we can't know which seasons are in the row group,
+        # so we have to read it
+        if (
+            statistics is None
+            or not statistics.has_min_max
+            or any(statistics.min <= season <= statistics.max for season in seasons)
+        ):
+            row_groups.append(row_group_idx)
+
+    return row_groups
+
+
+def _read_player_match_parquet_file(
+    filepath: str,
+    columns: Optional[Sequence[str]] = None,
+    seasons: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    parquet_file = pq.ParquetFile(filepath)
+    load_columns = None if columns is None else list(columns)
+
+    if seasons is None:
+        table = parquet_file.read(columns=load_columns)
+    else:
+        filter_columns = (
+            None
+            if load_columns is None or SEASON_COLUMN in load_columns
+            else load_columns + [SEASON_COLUMN]
+        )
+        table = parquet_file.read_row_groups(
+            _season_row_groups(parquet_file, seasons),
+            columns=filter_columns or load_columns,
+        )
+
+    data_frame = table.to_pandas(date_as_object=False)
+
+    if seasons is None:
+        return data_frame
+
+    season_data = data_frame[data_frame[SEASON_COLUMN].isin(seasons)]
+
+    if load_columns is not None:
+        season_data = season_data[load_columns]
+
+    return season_data.reset_index(drop=True)
+
+
+def _part_filepaths(directory: str) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+
+    return [
+        os.path.join(directory, filename)
+        for filename in sorted(os.listdir(directory))
+        if PART_FILENAME_REGEX.match(filename)
+    ]
+
+
+def player_match_parquet_exists(filepath: str) -> bool:
+    """Whether there's a Parquet file or data set directory with parts at filepath"""
+
+    return os.path.isfile(filepath) or any(_part_filepaths(filepath))
+
+
+def read_player_match_parquet(
+    filepath: str,
+    columns: Optional[Sequence[str]] = None,
+    seasons: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Load player match data from a Parquet file saved by write_player_match_parquet,
+    or from a directory of part files saved by update_player_match_parquet_dataset.
+
+    Args:
+        filepath (str): Path to the *.parquet file or data set directory.
+        columns (list of str, None): Columns to load. Defaults to all of them.
+        seasons (list of str, None): Seasons (e.g. '2018-2019') to load.
+            Only row groups for these seasons are read. Defaults to all seasons.
+
+    Returns:
+        pd.DataFrame with datetime dates, categorical competitions, squads,
+        and positions, and numeric stats.
+    """
+
+    if not os.path.isdir(filepath):
+        return _read_player_match_parquet_file(
+            filepath, columns=columns, seasons=seasons
+        )
+
+    part_frames = [
+        _read_player_match_parquet_file(part_filepath, columns=columns, seasons=seasons)
+        for part_filepath in _part_filepaths(filepath)
+    ]
+
+    if not part_frames:
+        return pd.DataFrame(columns=columns)
+
+    data_frame = pd.concat(part_frames, ignore_index=True, sort=False)
+
+    # Concatenating categories that differ from part to part turns them
+    # into plain objects
+    for column in CATEGORY_COLUMNS:
+        if column in data_frame.columns:
+            data_frame[column] = data_frame[column].astype("category")
+
+    return data_frame
+
+
+def convert_json_lines_to_parquet(jsonl_filepath: str, parquet_filepath: str) -> int:
+    """
+    Save the player match data from a JSON Lines file to a Parquet file.
+
+    Args:
+        jsonl_filepath (str): Path to the *.jsonl file.
+        parquet_filepath (str): Path to the *.parquet file.
+
+    Returns:
+        Number of rows converted.
+    """
+
+    return write_player_match_parquet(
+        parquet_filepath, list(iter_json_lines(jsonl_filepath))
+    )
+
+
+def update_player_match_parquet_dataset(jsonl_filepath: str, directory: str) -> int:
+    """
+    Save the player match data that has been appended to a JSON Lines file
+    since the last update as a new part file in a Parquet data set directory.
+    Only the new rows get read, so updates don't get slower as the data grows.
+
+    Args:
+        jsonl_filepath (str): Path to the *.jsonl file.
+        directory (str): Path to the data set directory.
+
+    Returns:
+        Number of rows converted.
+    """
+
+    part_filepaths = _part_filepaths(directory)
+    converted_offset = max(
+        [
+            int(PART_FILENAME_REGEX.match(os.path.basename(part_filepath))[2])
+            for part_filepath in part_filepaths
+        ],
+        default=0,
+    )
+    end_offset = os.path.getsize(jsonl_filepath)
+
+    # A JSON Lines file that's smaller than what's been converted must have been
+    # replaced, so the data set gets rebuilt from scratch
+    if end_offset < converted_offset:
+        for part_filepath in part_filepaths:
+            os.remove(part_filepath)
+
+        converted_offset = 0
+
+    rows = list(
+        iter_json_lines(
+            jsonl_filepath, start_offset=converted_offset, end_offset=end_offset
+        )
+    )
+
+    if not rows:
+        return 0
+
+    return write_player_match_parquet(
+        os.path.join(
+            directory,
+            PART_FILENAME_TEMPLATE.format(
+                start_offset=converted_offset, end_offset=end_offset
+            ),
+        ),
+        rows,
+    )
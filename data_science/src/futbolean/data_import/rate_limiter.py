@@ -0,0 +1,141 @@
+"""Token-bucket rate limiting of requests to the data service"""
+
+from typing import Dict, NamedTuple, Optional, Tuple
+import os
+import json
+import time
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Windows doesn't have fcntl, so processes there only share a budget
+    # with other threads in the same process
+    fcntl = None  # type: ignore
+
+from futbolean.settings import RATE_LIMIT_DIR
+
+
+class EndpointRate(NamedTuple):
+    """
+    Sustained request rate and burst size for an endpoint.
+
+    Args:
+        per_second (float): Requests per second that the bucket refills by.
+        burst (float): Maximum requests that can be made at once after
+            a quiet spell (i.e. the bucket's capacity).
+    """
+
+    per_second: float
+    burst: float = 1.0
+
+
+# Every /player_stats request makes the data service scrape a whole batch of
+# player pages from fbref, so it gets by far the smallest budget. Spreading
+# requests out evenly gets more data through than bursting and then getting blocked.
+ENDPOINT_RATES = {
+    "/player_stats": EndpointRate(per_second=1 / 15, burst=2),
+    "/player_urls": EndpointRate(per_second=1 / 30, burst=1),
+}
+DEFAULT_RATE = EndpointRate(per_second=1.0, burst=1)
+STATE_FILE_EXTENSION = ".json"
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with one bucket per endpoint.
+
+    Buckets are saved in state files that get locked while they're updated,
+    so every thread and process using the same state directory shares
+    one budget per endpoint.
+    """
+
+    def __init__(
+        self,
+        state_dir: str = RATE_LIMIT_DIR,
+        rates: Dict[str, EndpointRate] = ENDPOINT_RATES,
+        default_rate: Optional[EndpointRate] = DEFAULT_RATE,
+    ):
+        """
+        Args:
+            state_dir (str): Directory in which to save the buckets' state.
+            rates (dict): Request rates by endpoint path.
+            default_rate (EndpointRate, None): Rate for endpoints that aren't
+                in rates. None means they aren't limited.
+        """
+
+        self.state_dir = state_dir
+        self.rates = rates
+        self.default_rate = default_rate
+        self._lock = threading.Lock()
+
+    def acquire(self, path: str) -> float:
+        """
+        Wait until a request to the endpoint fits within its budget,
+        and take it out of the budget.
+
+        Args:
+            path (string): API endpoint.
+
+        Returns:
+            Number of seconds spent waiting.
+        """
+
+        rate = self.rates.get(path, self.default_rate)
+
+        if rate is None:
+            return 0.0
+
+        waited = 0.0
+
+        while True:
+            wait_seconds = self._take_token(path, rate)
+
+            if wait_seconds <= 0:
+                return waited
+
+            time.sleep(wait_seconds)
+            waited += wait_seconds
+
+    def _take_token(self, path: str, rate: EndpointRate) -> float:
+        os.makedirs(self.state_dir, exist_ok=True)
+
+        with self._lock, open(self._filepath(path), "a+", encoding="utf8") as file:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX)
+
+            try:
+                now = time.time()
+                tokens, updated_at = self._read_state(file, rate, now)
+                tokens = min(rate.burst, tokens + (now - updated_at) * rate.per_second)
+
+                if tokens >= 1:
+                    self._write_state(file, tokens - 1, now)
+                    return 0.0
+
+                return (1 - tokens) / rate.per_second
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read_state(file, rate: EndpointRate, now: float) -> Tuple[float, float]:
+        file.seek(0)
+
+        try:
+            state = json.loads(file.read())
+            return float(state["tokens"]), min(float(state["updated_at"]), now)
+        except (ValueError, KeyError, TypeError):
+            # A missing or corrupted bucket starts out full
+            return rate.burst, now
+
+    @staticmethod
+    def _write_state(file, tokens: float, now: float) -> None:
+        file.seek(0)
+        file.truncate()
+        json.dump({"tokens": tokens, "updated_at": now}, file)
+        file.flush()
+
+    def _filepath(self, path: str) -> str:
+        endpoint_name = path.strip("/").replace("/", "_") or "root"
+        return os.path.join(self.state_dir, endpoint_name + STATE_FILE_EXTENSION)
@@ -0,0 +1,313 @@
+"""On-disk cache of responses from the data service"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+
+from futbolean.settings import RESPONSE_CACHE_DIR
+
+
+HOUR_IN_SECONDS = 60 * 60
+DAY_IN_SECONDS = 24 * HOUR_IN_SECONDS
+# Player lists only change when players transfer in or out, but match data
+# for active players changes with every match they play
+ENDPOINT_TTLS = {"/player_urls": 7 * DAY_IN_SECONDS, "/player_stats": DAY_IN_SECONDS}
+DEFAULT_TTL = HOUR_IN_SECONDS
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1GB
+CACHE_FILE_EXTENSION = ".json"
+# Responses that are still being written, or that were abandoned partway through
+TEMP_FILE_EXTENSION = ".partial"
+# Temp files get written to as responses arrive, so ones that haven't been
+# for this long must have been abandoned (e.g. by a process that was killed)
+STALE_TEMP_FILE_SECONDS = HOUR_IN_SECONDS
+
+
+def _is_sequence(value: Any) -> bool:
+    return isinstance(value, (list, tuple)) or hasattr(value, "tolist")
+
+
+def _sort_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+def _canonicalize_dict(value: Dict[Any, Any]) -> Dict[str, Any]:
+    canonical: Dict[str, Any] = {}
+    sequences_by_length: Dict[int, List[Tuple[str, List[Any]]]] = {}
+
+    for key, val in value.items():
+        if _is_sequence(val):
+            values = val.tolist() if hasattr(val, "tolist") else list(val)
+            sequences_by_length.setdefault(len(values), []).append(
+                (str(key), [_canonicalize(item) for item in values])
+            )
+        else:
+            canonical[str(key)] = _canonicalize(val)
+
+    # Lists of the same length may be matched up by position (e.g. player_urls
+    # and their since_dates), so they get sorted together, which keeps each
+    # pairing intact while still ignoring the order of the requested items
+    for keyed_sequences in sequences_by_length.values():
+        sorted_rows = sorted(
+            zip(*[values for _, values in keyed_sequences]), key=_sort_key
+        )
+
+        for idx, (key, _values) in enumerate(keyed_sequences):
+            canonical[key] = [row[idx] for row in sorted_rows]
+
+    return canonical
+
+
+def _canonicalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _canonicalize_dict(value)
+
+    if isinstance(value, set) or _is_sequence(value):
+        values = value.tolist() if hasattr(value, "tolist") else list(value)
+        # The same set of player URLs should hit the same cache entry regardless
+        # of the order in which they were requested
+        return sorted((_canonicalize(val) for val in values), key=_sort_key)
+
+    return str(value)
+
+
+class ResponseCache:
+    """
+    Content-addressed cache of parsed JSON responses, keyed on the request path
+    and canonicalized query params.
+
+    Entries expire after a per-endpoint TTL, and the least-recently used entries
+    get evicted whenever the cache grows past its size limit. Each entry's
+    modified time is when it was fetched, and its access time is when it was
+    last used.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = RESPONSE_CACHE_DIR,
+        ttls: Dict[str, float] = ENDPOINT_TTLS,
+        default_ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Args:
+            cache_dir (str): Directory in which to save cached responses.
+            ttls (dict): Seconds for which a response stays fresh, by endpoint path.
+            default_ttl (float): Seconds for which responses from endpoints
+                that aren't in ttls stay fresh.
+            max_bytes (int): Maximum total size of all cached responses.
+        """
+
+        self.cache_dir = cache_dir
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(path: str, params: Dict[str, Any] = {}) -> str:
+        """Hash of the request path and its canonicalized params"""
+
+        request_description = json.dumps(
+            {"path": path, "params": _canonicalize(params)}, sort_keys=True
+        )
+
+        return hashlib.sha256(request_description.encode("utf8")).hexdigest()
+
+    def get(self, path: str, params: Dict[str, Any] = {}) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached response for a request if there's a fresh one.
+
+        Args:
+            path (string): API endpoint.
+            params (dict): Query parameters of the request.
+
+        Returns:
+            The parsed response or None.
+        """
+
+        filepath = self.get_filepath(path, params)
+
+        if filepath is None:
+            return None
+
+        try:
+            with open(filepath, "r", encoding="utf8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            # Another process may have evicted the entry, or it may be corrupted,
+            # either of which just means we don't have it
+            return None
+
+    def get_filepath(self, path: str, params: Dict[str, Any] = {}) -> Optional[str]:
+        """
+        Get the path to the cached response for a request if there's a fresh one,
+        for reading it incrementally rather than all at once.
+
+        Args:
+            path (string): API endpoint.
+            params (dict): Query parameters of the request.
+
+        Returns:
+            Path to the JSON file or None.
+        """
+
+        filepath = self._filepath(self.key(path, params))
+
+        try:
+            fetched_at = os.path.getmtime(filepath)
+        except OSError:
+            return None
+
+        if time.time() - fetched_at > self.ttls.get(path, self.default_ttl):
+            self._remove(filepath)
+            return None
+
+        try:
+            os.utime(filepath, (time.time(), fetched_at))
+        except OSError:
+            return None
+
+        return filepath
+
+    def set(self, path: str, params: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """
+        Save the response for a request, evicting old responses if necessary.
+
+        Args:
+            path (string): API endpoint.
+            params (dict): Query parameters of the request.
+            response (dict): Parsed response to cache.
+        """
+
+        # Writing to a temporary file first means that readers never see
+        # a partially-written response
+        temp_filepath = self.temp_filepath()
+
+        with open(temp_filepath, "w", encoding="utf8") as temp_file:
+            json.dump(response, temp_file, ensure_ascii=False)
+
+        self.set_file(path, params, temp_filepath)
+
+    def temp_filepath(self) -> str:
+        """
+        Create an empty temporary file in the cache directory, for writing
+        a response to as it's received.
+
+        Returns:
+            Path to the temporary file.
+        """
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file_descriptor, temp_filepath = tempfile.mkstemp(
+            suffix=TEMP_FILE_EXTENSION, dir=self.cache_dir
+        )
+        os.close(file_descriptor)
+
+        return temp_filepath
+
+    def set_file(self, path: str, params: Dict[str, Any], filepath: str) -> None:
+        """
+        Move a complete response file (created with temp_filepath) into the cache
+        as the response for a request, evicting old responses if necessary.
+
+        Args:
+            path (string): API endpoint.
+            params (dict): Query parameters of the request.
+            filepath (str): Path to the JSON file of the raw response.
+        """
+
+        os.replace(filepath, self._filepath(self.key(path, params)))
+
+        self.evict()
+
+    def delete(self, path: str, params: Dict[str, Any] = {}) -> None:
+        """
+        Remove the cached response for a request if there is one.
+
+        Args:
+            path (string): API endpoint.
+            params (dict): Query parameters of the request.
+        """
+
+        self._remove(self._filepath(self.key(path, params)))
+
+    def evict(self) -> None:
+        """
+        Remove abandoned temp files, then least-recently used responses until
+        the cache fits its size limit. Temp files that are still being written
+        count towards the limit, but don't get removed.
+        """
+
+        with self._lock:
+            if not os.path.isdir(self.cache_dir):
+                return
+
+            entries = []
+            temp_file_bytes = 0
+
+            for entry in os.scandir(self.cache_dir):
+                is_temp_file = entry.name.endswith(TEMP_FILE_EXTENSION)
+
+                if not is_temp_file and not entry.name.endswith(CACHE_FILE_EXTENSION):
+                    continue
+
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                if not is_temp_file:
+                    entries.append((stat.st_atime, stat.st_size, entry.path))
+                elif self._is_stale_temp_file(stat.st_mtime):
+                    self._remove(entry.path)
+                else:
+                    temp_file_bytes += stat.st_size
+
+            total_bytes = temp_file_bytes + sum(size for _, size, _ in entries)
+
+            for _, size, filepath in sorted(entries):
+                if total_bytes <= self.max_bytes:
+                    break
+
+                self._remove(filepath)
+                total_bytes -= size
+
+    def clear(self) -> None:
+        """Remove all cached responses and abandoned temp files"""
+
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(CACHE_FILE_EXTENSION):
+                self._remove(entry.path)
+                continue
+
+            if not entry.name.endswith(TEMP_FILE_EXTENSION):
+                continue
+
+            try:
+                is_stale = self._is_stale_temp_file(entry.stat().st_mtime)
+            except OSError:
+                continue
+
+            if is_stale:
+                self._remove(entry.path)
+
+    @staticmethod
+    def _is_stale_temp_file(modified_at: float) -> bool:
+        return time.time() - modified_at > STALE_TEMP_FILE_SECONDS
+
+    def _filepath(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_FILE_EXTENSION)
+
+    @staticmethod
+    def _remove(filepath: str) -> None:
+        try:
+            os.remove(filepath)
+        except FileNotFoundError:
+            pass
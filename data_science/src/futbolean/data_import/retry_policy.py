@@ -0,0 +1,108 @@
+"""Policies for retrying failed requests to the data service"""
+
+from typing import NamedTuple, Optional, FrozenSet
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import random
+
+
+# Rate limiting and server errors (including gateway timeouts while the data
+# service's container starts up) are worth retrying, but other client errors
+# will fail the same way every time
+RETRYABLE_STATUS_CODES = frozenset([429] + list(range(500, 600)))
+
+
+class RetryPolicy(NamedTuple):
+    """
+    How many times, and how long to wait between, retries of a request.
+
+    Waits grow exponentially from base_delay up to max_delay, and each wait
+    is a random amount up to that limit ('full jitter'), so concurrent batches
+    that fail together don't all retry together. A Retry-After header overrides
+    the calculated wait. Requests are never retried past max_elapsed seconds
+    since the first attempt.
+
+    Args:
+        max_attempts (int): Maximum number of attempts, including the first one.
+        base_delay (float): Maximum wait in seconds before the first retry.
+        max_delay (float): Maximum wait in seconds before any retry.
+        max_elapsed (float): Maximum total seconds to spend on a request,
+            including waits.
+        jitter (bool): Whether to randomize the waits.
+        retryable_status_codes (frozenset of int): Response status codes
+            worth retrying.
+    """
+
+    max_attempts: int = 5
+    base_delay: float = 2.0
+    max_delay: float = 60.0
+    max_elapsed: float = 300.0
+    jitter: bool = True
+    retryable_status_codes: FrozenSet[int] = RETRYABLE_STATUS_CODES
+
+    def is_retryable(self, status_code: Optional[int]) -> bool:
+        """
+        Whether a failed attempt is worth retrying.
+
+        Args:
+            status_code (int, None): Response status code. None means the request
+                failed without a response (e.g. a connection error or timeout).
+
+        Returns:
+            bool
+        """
+
+        return status_code is None or status_code in self.retryable_status_codes
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Seconds to wait before retrying.
+
+        Args:
+            attempt (int): Number of attempts made so far, starting at 1.
+            retry_after (str, None): Value of the response's Retry-After header,
+                either in seconds or as an HTTP date.
+
+        Returns:
+            float
+        """
+
+        retry_after_seconds = _parse_retry_after(retry_after)
+
+        if retry_after_seconds is not None:
+            return retry_after_seconds
+
+        max_wait = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+
+        return random.uniform(0, max_wait) if self.jitter else max_wait
+
+
+def _parse_retry_after(retry_after: Optional[str]) -> Optional[float]:
+    if not retry_after:
+        return None
+
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+# Scraping a batch of players' match data can take many minutes, so retrying
+# past a few attempts would mostly just hold up the batches behind it.
+# Player URLs come from a single quick request, so we can afford to wait longer
+# for the data service to wake up.
+ENDPOINT_RETRY_POLICIES = {
+    "/player_stats": RetryPolicy(max_attempts=3, max_elapsed=120.0),
+    "/player_urls": RetryPolicy(max_attempts=6, max_elapsed=600.0),
+}
@@ -1 +1,6 @@
-from .json_remote_data_set import JSONRemoteDataSet
+from .json_remote_data_set import JSONRemoteDataSet, prefetch_pipeline_inputs
+from .json_lines_local_data_set import JSONLinesLocalDataSet
+from .player_match_parquet_local_data_set import PlayerMatchParquetLocalDataSet
+from .filtered_sql_table_data_set import FilteredSQLTableDataSet
+from .optional_parquet_local_data_set import OptionalParquetLocalDataSet
+from .shared_memory_data_set import SharedMemoryDataSet
@@ -0,0 +1,145 @@
+"""kedro data set for loading selected columns and rows of a SQL table"""
+
+from typing import (
+    Any,
+    Callable,
+    List,
+    Dict,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from kedro.io import SQLTableDataSet
+
+
+FilterValue = Union[Any, Sequence[Any]]
+
+
+class FilteredSQLTableDataSet(SQLTableDataSet):
+    """
+    kedro data set for loading selected columns and rows of a SQL table.
+
+    Unlike SQLTableDataSet, which always reads the whole table, the column
+    selection and filters get pushed down into the SQL query, so the database
+    only returns what we need. With a chunksize, load returns an iterator
+    of DataFrames rather than one big DataFrame. Saving works the same
+    as for SQLTableDataSet.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        credentials: Dict[str, Any],
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, FilterValue]] = None,
+        chunksize: Optional[int] = None,
+        load_args: Dict[str, Any] = None,
+        save_args: Dict[str, Any] = None,
+    ) -> None:
+        """
+        Args:
+            table_name (str): Name of the table to load or save.
+            credentials (dict): Dictionary with a SQLAlchemy connection string
+                under 'con'.
+            columns (list of str, None): Columns to load. Defaults to all of them.
+            filters (dict, None): Column values to filter rows by, combined with AND.
+                A list of values matches any of them (e.g. {"season": ["2014/2015",
+                "2015/2016"], "league_id": 1729}). Defaults to loading all rows.
+            chunksize (int, None): Number of rows per DataFrame when loading as
+                an iterator. Defaults to loading one DataFrame.
+            load_args (dict, None): Extra arguments for pandas.read_sql_query.
+            save_args (dict, None): Arguments for pandas.DataFrame.to_sql.
+        """
+
+        super().__init__(
+            table_name=table_name,
+            credentials=credentials,
+            load_args=load_args,
+            save_args=save_args,
+        )
+
+        self._columns = None if columns is None else list(columns)
+        self._filters = filters or {}
+        self._chunksize = chunksize
+
+    def _query(self, quote: Callable[[str], str]) -> Tuple[str, Dict[str, Any]]:
+        column_sql = (
+            "*"
+            if self._columns is None
+            else ", ".join(quote(column) for column in self._columns)
+        )
+        conditions: List[str] = []
+        params: Dict[str, Any] = {}
+
+        for filter_idx, (column, value) in enumerate(self._filters.items()):
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            param_names = [
+                f"filter_{filter_idx}_{value_idx}" for value_idx in range(len(values))
+            ]
+            params.update(zip(param_names, values))
+
+            placeholders = ", ".join(f":{param_name}" for param_name in param_names)
+            conditions.append(f"{quote(column)} IN ({placeholders})")
+
+        where_sql = "" if not conditions else " WHERE " + " AND ".join(conditions)
+        table_sql = quote(self._load_args["table_name"])
+
+        return f"SELECT {column_sql} FROM {table_sql}{where_sql}", params
+
+    def _iter_chunks(self) -> Iterator[pd.DataFrame]:
+        engine = create_engine(self._load_args["con"])
+
+        try:
+            query, params = self._query(engine.dialect.identifier_preparer.quote)
+
+            with engine.connect() as connection:
+                for chunk in pd.read_sql_query(
+                    text(query),
+                    connection,
+                    params=params,
+                    chunksize=self._chunksize,
+                    **self._read_args(),
+                ):
+                    yield chunk
+        finally:
+            engine.dispose()
+
+    def _read_args(self) -> Dict[str, Any]:
+        # SQLTableDataSet keeps the table name and connection with the load args,
+        # but they aren't arguments for read_sql_query
+        return {
+            key: value
+            for key, value in self._load_args.items()
+            if key not in ("table_name", "con", "schema", "columns")
+        }
+
+    def _load(self) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        # The engine needs to stay open until the iterator is exhausted,
+        # so chunks come from a generator that owns the connection
+        if self._chunksize is not None:
+            return self._iter_chunks()
+
+        engine = create_engine(self._load_args["con"])
+
+        try:
+            query, params = self._query(engine.dialect.identifier_preparer.quote)
+
+            with engine.connect() as connection:
+                return pd.read_sql_query(
+                    text(query), connection, params=params, **self._read_args()
+                )
+        finally:
+            engine.dispose()
+
+    def _describe(self) -> Dict[str, Any]:
+        return {
+            **super()._describe(),
+            "columns": self._columns,
+            "filters": self._filters,
+            "chunksize": self._chunksize,
+        }
@@ -0,0 +1,32 @@
+"""kedro data set for append-only JSON Lines files saved by data_import"""
+
+from typing import Any, List, Dict
+import os
+
+from kedro.io.core import AbstractDataSet
+
+from futbolean.data_import.json_lines import append_json_lines, iter_json_lines
+
+
+class JSONLinesLocalDataSet(AbstractDataSet):
+    """kedro data set for append-only JSON Lines files saved by data_import"""
+
+    def __init__(self, filepath: str, **_kwargs):
+        self._filepath = filepath
+
+    def _load(self) -> List[Dict[str, Any]]:
+        return list(iter_json_lines(self._filepath))
+
+    def _save(self, data: List[Dict[str, Any]]) -> None:
+        # Saving through the catalog replaces the data, like other local data sets,
+        # rather than appending to it like the data import functions do
+        if os.path.isfile(self._filepath):
+            os.remove(self._filepath)
+
+        append_json_lines(self._filepath, data)
+
+    def _exists(self) -> bool:
+        return os.path.isfile(self._filepath)
+
+    def _describe(self):
+        return {"filepath": self._filepath}
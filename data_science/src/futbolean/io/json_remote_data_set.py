@@ -1,20 +1,72 @@
 """kedro data set based on fetching fresh data from the data service"""
 
-from typing import Any, List, Dict, Callable, Union
+from typing import Any, List, Dict, Callable, Union, Optional
+from concurrent.futures import Future
+import asyncio
 import importlib
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
 
 import pandas as pd
+from kedro.io import DataCatalog
 from kedro.io.core import AbstractDataSet
+from kedro.pipeline import Pipeline
 
 
 MODULE_SEPARATOR = "."
 
 
 class JSONRemoteDataSet(AbstractDataSet):
-    """kedro data set based on fetching fresh data from the data service"""
+    """
+    kedro data set based on fetching fresh data from the data service.
+
+    Fetching can start in a background thread ahead of time (either when
+    a pipeline that loads the data set starts running with prefetch=True or by
+    calling prefetch()), so the network request overlaps with other data loading
+    and node computation, and load() only waits for whatever is left of it.
+
+    With a filepath, fetched and saved data is also written to a local JSON file,
+    and loads return that local copy instead of calling the data source
+    for as long as the copy is fresh.
+    """
+
+    def __init__(
+        self,
+        data_source: Union[Callable, str],
+        load_kwargs={},
+        prefetch: bool = False,
+        timeout: Optional[float] = None,
+        filepath: Optional[str] = None,
+        max_age: Optional[float] = None,
+        **_kwargs,
+    ):
+        """
+        Args:
+            data_source (callable, str): Function (or its import path) that
+                fetches the data. It can also be an async function.
+            load_kwargs (dict): Keyword arguments to pass to data_source.
+            prefetch (bool): Whether to start fetching the data in the background
+                as soon as a pipeline that loads it starts running
+                (see prefetch_pipeline_inputs).
+            timeout (float, None): Maximum seconds for load to wait for the data.
+                Defaults to waiting indefinitely.
+            filepath (str, None): Path to a local JSON copy of the data. Defaults to
+                always fetching the data and never saving it.
+            max_age (float, None): Seconds after being saved for which the local
+                copy is fresh. Defaults to the local copy never going stale.
+        """
 
-    def __init__(self, data_source: Union[Callable, str], load_kwargs={}, **_kwargs):
         self._load_kwargs: Dict[str, Any] = load_kwargs
+        self.prefetch_on_run = prefetch
+        self._timeout = timeout
+        self._filepath = filepath
+        self._max_age = max_age
+        self._future: Optional[Future] = None
+        self._future_lock = threading.Lock()
 
         if callable(data_source):
             self.data_source = data_source
@@ -26,11 +78,156 @@ class JSONRemoteDataSet(AbstractDataSet):
 
             self.data_source = getattr(module, function_name)
 
+    def prefetch(self) -> Future:
+        """
+        Start fetching the data in a background thread, unless a fetch is
+        already underway. The next load returns the fetched data.
+
+        Returns:
+            Future that resolves to the fetched data.
+        """
+
+        with self._future_lock:
+            if self._future is None:
+                self._future = Future()
+                # A daemon thread won't keep the process alive if the data
+                # never ends up getting loaded
+                threading.Thread(
+                    target=self._fetch_into, args=(self._future,), daemon=True
+                ).start()
+
+            return self._future
+
+    def _fetch_into(self, future: Future) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            future.set_result(self._fetch())
+        except BaseException as err:  # pylint: disable=broad-except
+            future.set_exception(err)
+
+    def _is_local_copy_fresh(self) -> bool:
+        if self._filepath is None or not os.path.isfile(self._filepath):
+            return False
+
+        if self._max_age is None:
+            return True
+
+        return time.time() - os.path.getmtime(self._filepath) <= self._max_age
+
+    def _fetch(self) -> Any:
+        if self._is_local_copy_fresh():
+            with open(self._filepath, "r", encoding="utf8") as json_file:
+                return json.load(json_file)
+
+        data = self._fetch_remote()
+        self._write_local_copy(data)
+
+        return data
+
+    def _fetch_remote(self) -> Any:
+        data = self.data_source(**self._load_kwargs)
+
+        if not inspect.isawaitable(data):
+            return data
+
+        # Async data sources get their own event loop, because we're either
+        # in a background thread or in kedro's synchronous runner
+        event_loop = asyncio.new_event_loop()
+
+        try:
+            return event_loop.run_until_complete(data)
+        finally:
+            event_loop.close()
+
     def _load(self) -> List[Dict[str, Any]]:
-        return self.data_source(**self._load_kwargs)
+        future = self.prefetch()
+
+        try:
+            return future.result(timeout=self._timeout)
+        finally:
+            # Each load should get fresh data, so we don't hold on to the result
+            with self._future_lock:
+                if self._future is future:
+                    self._future = None
 
-    def _save(self, data: pd.DataFrame) -> None:
-        pass
+    def _save(self, data: Union[pd.DataFrame, List[Dict[str, Any]]]) -> None:
+        # Any data prefetched before the save is now out of date
+        with self._future_lock:
+            self._future = None
+
+        self._write_local_copy(data)
+
+    def _write_local_copy(self, data: Union[pd.DataFrame, List[Dict[str, Any]]]):
+        if self._filepath is None:
+            return
+
+        if isinstance(data, pd.DataFrame):
+            data = data.to_dict("records")
+
+        directory = os.path.dirname(self._filepath)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Writing to a temporary file first means that a concurrent load never
+        # sees a partially-written copy
+        file_descriptor, temp_filepath = tempfile.mkstemp(dir=directory or None)
+
+        # Result columns have a weird UTF-8 dash in the string, so coercing to ASCII
+        # results in weird encoding values
+        with os.fdopen(file_descriptor, "w", encoding="utf8") as json_file:
+            json.dump(data, json_file, ensure_ascii=False, indent=2)
+
+        os.replace(temp_filepath, self._filepath)
+
+    def _exists(self) -> bool:
+        return self._filepath is not None and os.path.isfile(self._filepath)
 
     def _describe(self):
-        return self._load_kwargs
+        return {
+            **self._load_kwargs,
+            "timeout": self._timeout,
+            "filepath": self._filepath,
+            "max_age": self._max_age,
+        }
+
+    def __getstate__(self):
+        # Futures and locks can't be pickled (e.g. for kedro's ParallelRunner),
+        # so worker processes just fetch the data themselves
+        state = self.__dict__.copy()
+        state["_future"] = None
+        del state["_future_lock"]
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._future_lock = threading.Lock()
+
+
+def prefetch_pipeline_inputs(pipeline: Pipeline, catalog: DataCatalog) -> List[str]:
+    """
+    Start fetching the data for the pipeline's inputs that are JSONRemoteDataSets
+    with prefetch=True. Data sets that the pipeline doesn't load never get fetched.
+
+    Args:
+        pipeline (Pipeline): Pipeline that's about to run.
+        catalog (DataCatalog): Catalog that the pipeline runs with.
+
+    Returns:
+        Names of the data sets that started prefetching.
+    """
+
+    data_sets = catalog._data_sets  # pylint: disable=protected-access
+    prefetched_names = []
+
+    for name in sorted(pipeline.inputs()):
+        data_set = data_sets.get(name)
+
+        if isinstance(data_set, JSONRemoteDataSet) and data_set.prefetch_on_run:
+            data_set.prefetch()
+            prefetched_names.append(name)
+
+    return prefetched_names
@@ -0,0 +1,22 @@
+"""kedro Parquet data set that loads as empty until something has been saved"""
+
+from pathlib import Path
+
+import pandas as pd
+from kedro.io import ParquetLocalDataSet
+
+
+class OptionalParquetLocalDataSet(ParquetLocalDataSet):
+    """
+    kedro Parquet data set that loads as empty until something has been saved.
+
+    Nodes that build on their own previous output (e.g. indexes that only process
+    new data) can take the saved output as an input without the first run failing
+    for lack of it.
+    """
+
+    def _load(self) -> pd.DataFrame:
+        if not Path(self._get_load_path()).exists():
+            return pd.DataFrame()
+
+        return super()._load()
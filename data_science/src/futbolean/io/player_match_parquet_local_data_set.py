@@ -0,0 +1,66 @@
+"""kedro data set for player match data saved as typed Parquet files"""
+
+from typing import Any, List, Dict, Optional, Sequence, Union
+import os
+
+import pandas as pd
+from kedro.io.core import AbstractDataSet, DataSetError
+
+from futbolean.data_import.player_match_parquet import (
+    read_player_match_parquet,
+    write_player_match_parquet,
+    player_match_parquet_exists,
+)
+
+
+class PlayerMatchParquetLocalDataSet(AbstractDataSet):
+    """
+    kedro data set for player match data saved as typed Parquet files.
+
+    The filepath can be a single *.parquet file or a directory of part files
+    that save_player_match_data adds to on each run. Directories can only
+    be loaded, because they're built from the JSON Lines data.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        columns: Optional[Sequence[str]] = None,
+        seasons: Optional[Sequence[str]] = None,
+        **_kwargs,
+    ):
+        """
+        Args:
+            filepath (str): Path to the *.parquet file or data set directory.
+            columns (list of str, None): Columns to load. Defaults to all of them.
+            seasons (list of str, None): Seasons (e.g. '2018-2019') to load.
+                Defaults to all seasons.
+        """
+
+        self._filepath = filepath
+        self._columns = columns
+        self._seasons = seasons
+
+    def _load(self) -> pd.DataFrame:
+        return read_player_match_parquet(
+            self._filepath, columns=self._columns, seasons=self._seasons
+        )
+
+    def _save(self, data: Union[pd.DataFrame, List[Dict[str, Any]]]) -> None:
+        if os.path.isdir(self._filepath):
+            raise DataSetError(
+                f"{self._filepath} is a data set directory, which only gets "
+                "updated from the JSON Lines data by save_player_match_data"
+            )
+
+        write_player_match_parquet(self._filepath, data)
+
+    def _exists(self) -> bool:
+        return player_match_parquet_exists(self._filepath)
+
+    def _describe(self):
+        return {
+            "filepath": self._filepath,
+            "columns": self._columns,
+            "seasons": self._seasons,
+        }
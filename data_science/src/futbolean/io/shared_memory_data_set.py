@@ -0,0 +1,149 @@
+"""kedro data set for handing data frames between processes via memory-mapped Arrow files"""
+
+from typing import Any, List, Optional
+import os
+import pickle
+import tempfile
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+from kedro.io.core import AbstractDataSet, DataSetError
+
+
+# /dev/shm is backed by RAM on Linux, so files there never touch the disk
+SHARED_MEMORY_DIR = "/dev/shm"
+
+
+def _default_directory() -> str:
+    if os.path.isdir(SHARED_MEMORY_DIR) and os.access(SHARED_MEMORY_DIR, os.W_OK):
+        return SHARED_MEMORY_DIR
+
+    return tempfile.gettempdir()
+
+
+class SharedMemoryDataSet(AbstractDataSet):
+    """
+    kedro data set for handing data frames between nodes that run in different
+    processes (e.g. with ParallelRunner or futbolean.runner.HybridRunner).
+
+    Saving writes the data frame once to an uncompressed Arrow file in shared memory,
+    and loading memory-maps that file, so numeric columns without nulls
+    are shared between processes rather than pickled and copied into each one.
+    Those columns are read-only: nodes should assign new columns rather than
+    modify loaded ones in place. Data that Arrow can't represent (e.g. columns
+    of mixed types or anything that isn't a data frame) gets pickled instead.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        name: Optional[str] = None,
+        fallback_directory: Optional[str] = None,
+    ):
+        """
+        Args:
+            directory (str, None): Directory for the shared files. Defaults to
+                /dev/shm if available, otherwise the system temp directory.
+            name (str, None): Base name of the shared files. Defaults to
+                a random one, so concurrent runs don't overwrite each other.
+            fallback_directory (str, None): Directory for the files when they
+                can't be written to directory (e.g. because Docker's default /dev/shm
+                is only 64MB). Defaults to the system temp directory.
+        """
+
+        self._directory = directory or _default_directory()
+        self._fallback_directory = fallback_directory or tempfile.gettempdir()
+        self._name = name or f"futbolean-{uuid.uuid4().hex}"
+
+    def _paths(self, extension: str) -> List[str]:
+        # Data sets loaded in other processes are copies that don't know whether
+        # the save fell back, so they look in both directories
+        directories = list(dict.fromkeys([self._directory, self._fallback_directory]))
+
+        return [
+            os.path.join(directory, f"{self._name}.{extension}")
+            for directory in directories
+        ]
+
+    def _load(self) -> Any:
+        for arrow_path, pickle_path in zip(self._paths("arrow"), self._paths("pickle")):
+            if os.path.isfile(arrow_path):
+                with pa.memory_map(arrow_path) as source:
+                    table = pa.ipc.open_file(source).read_all()
+
+                # Splitting blocks stops pandas from consolidating (i.e. copying)
+                # the memory-mapped columns into 2D blocks
+                return table.to_pandas(split_blocks=True)
+
+            if os.path.isfile(pickle_path):
+                with open(pickle_path, "rb") as file:
+                    return pickle.load(file)
+
+        raise DataSetError(f"No data has been saved to {self._name}")
+
+    def _save(self, data: Any) -> None:
+        self._release()
+
+        arrow_paths = self._paths("arrow")
+        pickle_paths = self._paths("pickle")
+
+        try:
+            self._write(data, arrow_paths[0], pickle_paths[0])
+        except OSError:
+            # Running out of space in shared memory (ENOSPC) shouldn't fail the run
+            self._write(data, arrow_paths[-1], pickle_paths[-1])
+
+    @staticmethod
+    def _write(data: Any, arrow_path: str, pickle_path: str) -> None:
+        if isinstance(data, pd.DataFrame):
+            try:
+                table = pa.Table.from_pandas(data)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                table = None
+
+            if table is not None:
+                tmp_path = f"{arrow_path}.tmp"
+
+                try:
+                    with pa.OSFile(tmp_path, "wb") as sink:
+                        with pa.ipc.new_file(sink, table.schema) as writer:
+                            writer.write_table(table)
+                except OSError:
+                    if os.path.isfile(tmp_path):
+                        os.remove(tmp_path)
+
+                    raise
+
+                # Readers in other processes never see a partially-written file
+                os.replace(tmp_path, arrow_path)
+                return
+
+        try:
+            with open(pickle_path, "wb") as file:
+                pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            if os.path.isfile(pickle_path):
+                os.remove(pickle_path)
+
+            raise
+
+    def _exists(self) -> bool:
+        return any(
+            os.path.isfile(path)
+            for path in self._paths("arrow") + self._paths("pickle")
+        )
+
+    def _release(self) -> None:
+        # Data frames that are already loaded keep their memory maps,
+        # so removing the files only frees the memory once they're gone too
+        for path in self._paths("arrow") + self._paths("pickle"):
+            if os.path.isfile(path):
+                os.remove(path)
+
+    def _describe(self):
+        return {
+            "directory": self._directory,
+            "fallback_directory": self._fallback_directory,
+            "name": self._name,
+        }
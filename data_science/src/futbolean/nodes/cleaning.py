@@ -0,0 +1,160 @@
+"""Pipeline nodes for cleaning each raw data source on its own"""
+
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from futbolean.data_import.epl_player_data import player_keys
+
+
+PLAYER_KEY_COLUMN = "player_key"
+PLAYER_MATCH_KEY_COLUMNS = [PLAYER_KEY_COLUMN, "Date", "Comp"]
+
+
+def clean_countries(countries: pd.DataFrame) -> pd.DataFrame:
+    """Rename Country columns so they don't clash with other tables' when joined"""
+
+    return countries.rename(columns={"id": "country_id", "name": "country_name"})
+
+
+def clean_leagues(leagues: pd.DataFrame) -> pd.DataFrame:
+    """Rename League columns so they don't clash with other tables' when joined"""
+
+    return leagues.rename(columns={"id": "league_id", "name": "league_name"})
+
+
+def clean_teams(teams: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean the Team table.
+
+    Args:
+        teams (pd.DataFrame): Raw Team data.
+
+    Returns:
+        pd.DataFrame with one row per team_api_id.
+    """
+
+    return (
+        teams.drop(columns=["id"])
+        .rename(columns={"team_long_name": "team_name"})
+        .drop_duplicates(subset=["team_api_id"])
+    )
+
+
+def clean_team_attributes(team_attributes: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean the Team_Attributes table.
+
+    Args:
+        team_attributes (pd.DataFrame): Raw Team_Attributes data.
+
+    Returns:
+        pd.DataFrame with datetime dates, sorted by team and date.
+    """
+
+    return (
+        team_attributes.drop(columns=["id"])
+        .assign(date=lambda df: pd.to_datetime(df["date"]))
+        .sort_values(["team_api_id", "date"])
+        .reset_index(drop=True)
+    )
+
+
+def clean_players(players: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean the Player table.
+
+    Args:
+        players (pd.DataFrame): Raw Player data.
+
+    Returns:
+        pd.DataFrame with one row per player_api_id and datetime birthdays.
+    """
+
+    return (
+        players.drop(columns=["id"])
+        .assign(birthday=lambda df: pd.to_datetime(df["birthday"]))
+        .drop_duplicates(subset=["player_api_id"])
+        .reset_index(drop=True)
+    )
+
+
+def clean_player_attributes(player_attributes: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean the Player_Attributes table.
+
+    Args:
+        player_attributes (pd.DataFrame): Raw Player_Attributes data.
+
+    Returns:
+        pd.DataFrame with datetime dates, sorted by player and date.
+    """
+
+    return (
+        player_attributes.drop(columns=["id"])
+        .assign(date=lambda df: pd.to_datetime(df["date"]))
+        .sort_values(["player_api_id", "date"])
+        .reset_index(drop=True)
+    )
+
+
+def clean_matches(matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean the Match table.
+
+    Args:
+        matches (pd.DataFrame): Raw Match data.
+
+    Returns:
+        pd.DataFrame with one row per match_api_id and datetime dates,
+        sorted by date.
+    """
+
+    return (
+        matches.drop(columns=["id"], errors="ignore")
+        .assign(date=lambda df: pd.to_datetime(df["date"]))
+        .drop_duplicates(subset=["match_api_id"])
+        .sort_values(["date", "match_api_id"])
+        .reset_index(drop=True)
+    )
+
+
+def clean_player_urls(player_url_data: Dict[str, Any]) -> List[str]:
+    """
+    Get the list of fbref player URLs from the data service's response.
+
+    Args:
+        player_url_data (dict): Player URL data from the data service,
+            with the URLs under 'data' and any that were skipped under
+            'skipped_urls'.
+
+    Returns:
+        List of player URLs, without duplicates.
+    """
+
+    return list(dict.fromkeys(player_url_data["data"]))
+
+
+def clean_epl_player_matches(player_matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clean the player match data scraped from fbref.com.
+
+    Args:
+        player_matches (pd.DataFrame): Player match data loaded from Parquet.
+
+    Returns:
+        pd.DataFrame without blank or duplicate rows, sorted by player and date.
+    """
+
+    # Player match logs include blank separator rows between seasons,
+    # and retried batches can save the same match twice. Players are told apart
+    # by URL, because some share a name (e.g. the two Danny Wards).
+    dated_matches = player_matches.dropna(subset=["Date"])
+
+    return (
+        dated_matches.assign(**{PLAYER_KEY_COLUMN: player_keys(dated_matches)})
+        .drop_duplicates(subset=PLAYER_MATCH_KEY_COLUMNS)
+        .sort_values([PLAYER_KEY_COLUMN, "Date"], kind="mergesort")
+        .drop(columns=PLAYER_KEY_COLUMN)
+        .reset_index(drop=True)
+    )
@@ -0,0 +1,99 @@
+"""Pipeline nodes for shrinking data frames' memory footprint"""
+
+from typing import Optional, Sequence
+import logging
+
+import numpy as np
+import pandas as pd
+
+
+# Converting strings to categoricals only saves memory when values repeat a lot
+MAX_CATEGORY_RATIO = 0.5
+PLAYER_MATCH_DATE_COLUMNS = ["Date", "Birthdate"]
+MEGABYTE = 1024 * 1024
+
+
+def _memory_usage(data_frame: pd.DataFrame) -> int:
+    return int(data_frame.memory_usage(deep=True).sum())
+
+
+def _downcast_numeric(values: pd.Series) -> pd.Series:
+    non_null_values = values.dropna()
+    is_integral = bool(np.all(np.mod(non_null_values, 1) == 0))
+
+    # Integer types can't hold NaNs, so columns with missing values stay floats
+    if is_integral and len(non_null_values) == len(values):
+        downcast = "unsigned" if (non_null_values >= 0).all() else "integer"
+        return pd.to_numeric(values, downcast=downcast)
+
+    return pd.to_numeric(values, downcast="float")
+
+
+def downcast_dtypes(
+    data_frame: pd.DataFrame,
+    date_columns: Sequence[str] = (),
+    max_category_ratio: float = MAX_CATEGORY_RATIO,
+    name: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Convert columns to the smallest dtypes that can hold their values:
+    whole numbers to the smallest (unsigned) integer type, other numbers to
+    float32, dates to datetime64, and repeated strings to categoricals.
+
+    Args:
+        data_frame (pd.DataFrame): Data to downcast.
+        date_columns (list of str): Columns to parse as dates.
+        max_category_ratio (float): Maximum ratio of unique values to rows for
+            a string column to become categorical.
+        name (str, None): Name of the data to use when logging memory usage.
+
+    Returns:
+        pd.DataFrame with the same values in smaller dtypes.
+    """
+
+    memory_before = _memory_usage(data_frame)
+    downcast_data = data_frame.copy()
+
+    for column in downcast_data.columns:
+        values = downcast_data[column]
+
+        if column in date_columns:
+            downcast_data[column] = pd.to_datetime(values, errors="coerce")
+        elif isinstance(values.dtype, pd.CategoricalDtype) or (
+            pd.api.types.is_bool_dtype(values)
+        ):
+            continue
+        elif pd.api.types.is_numeric_dtype(values):
+            downcast_data[column] = _downcast_numeric(values)
+        elif pd.api.types.is_string_dtype(
+            values
+        ) and values.nunique() <= max_category_ratio * len(values):
+            downcast_data[column] = values.astype("category")
+
+    memory_after = _memory_usage(downcast_data)
+
+    logging.getLogger(__name__).info(
+        "Downcast %s from %.1fMB to %.1fMB",
+        name or "data",
+        memory_before / MEGABYTE,
+        memory_after / MEGABYTE,
+    )
+
+    return downcast_data
+
+
+def downcast_player_matches(player_matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink player match data by downcasting its stats, dates, and repeated
+    strings (e.g. Comp, Squad, Opponent, Venue, Result).
+
+    Args:
+        player_matches (pd.DataFrame): Cleaned player match data.
+
+    Returns:
+        pd.DataFrame with the same values in smaller dtypes.
+    """
+
+    return downcast_dtypes(
+        player_matches, date_columns=PLAYER_MATCH_DATE_COLUMNS, name="player matches"
+    )
@@ -0,0 +1,57 @@
+"""Pipeline nodes for adding model features to joined data"""
+
+import numpy as np
+import pandas as pd
+
+
+DAYS_PER_YEAR = 365.25
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+
+def add_team_match_features(team_matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add match result features to team match data.
+
+    Args:
+        team_matches (pd.DataFrame): Data with one row per team per match,
+            including goals and oppo_goals.
+
+    Returns:
+        pd.DataFrame with goal_difference, result ('W', 'D', or 'L'),
+        and points columns added.
+    """
+
+    goal_difference = team_matches["goals"] - team_matches["oppo_goals"]
+    result = np.select(
+        [goal_difference > 0, goal_difference == 0], ["W", "D"], default="L"
+    )
+    points = np.select(
+        [goal_difference > 0, goal_difference == 0], [WIN_POINTS, DRAW_POINTS], 0
+    )
+
+    return team_matches.assign(
+        goal_difference=goal_difference,
+        result=pd.Categorical(result, categories=["W", "D", "L"]),
+        points=points,
+    )
+
+
+def add_player_match_features(player_matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add features about the player to player match data.
+
+    Args:
+        player_matches (pd.DataFrame): Cleaned player match data.
+
+    Returns:
+        pd.DataFrame with age (in years on the match date, missing for players
+        without a known birthdate) and started (whether the player was in
+        the starting lineup) columns added.
+    """
+
+    age_in_days = (player_matches["Date"] - player_matches["Birthdate"]).dt.days
+
+    return player_matches.assign(
+        age=age_in_days / DAYS_PER_YEAR, started=player_matches["Start"] == "Y"
+    )
@@ -0,0 +1,211 @@
+"""Pipeline nodes for joining cleaned data sources together"""
+
+from typing import Optional, Sequence
+
+import pandas as pd
+
+from futbolean.data_import.epl_player_data import (
+    normalize_player_name,
+    player_keys,
+)
+
+
+TEAM_MATCH_COLUMNS = [
+    "match_api_id",
+    "date",
+    "season",
+    "stage",
+    "league_name",
+    "country_name",
+    "team_api_id",
+    "team_name",
+    "oppo_team_api_id",
+    "oppo_team_name",
+    "at_home",
+    "goals",
+    "oppo_goals",
+]
+ROW_POSITION_COLUMN = "_row_position"
+
+
+def _team_perspective(matches: pd.DataFrame, team_side: str) -> pd.DataFrame:
+    oppo_side = "away" if team_side == "home" else "home"
+
+    return matches.rename(
+        columns={
+            f"{team_side}_team_api_id": "team_api_id",
+            f"{oppo_side}_team_api_id": "oppo_team_api_id",
+            f"{team_side}_team_goal": "goals",
+            f"{oppo_side}_team_goal": "oppo_goals",
+        }
+    ).assign(at_home=team_side == "home")
+
+
+def join_team_matches(
+    matches: pd.DataFrame,
+    leagues: pd.DataFrame,
+    countries: pd.DataFrame,
+    teams: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Join matches with their leagues, countries, and teams, and reshape them
+    to one row per team per match.
+
+    Args:
+        matches (pd.DataFrame): Cleaned Match data.
+        leagues (pd.DataFrame): Cleaned League data.
+        countries (pd.DataFrame): Cleaned Country data.
+        teams (pd.DataFrame): Cleaned Team data.
+
+    Returns:
+        pd.DataFrame with two rows per match (one from each team's perspective),
+        sorted by date.
+    """
+
+    team_names = teams[["team_api_id", "team_name"]]
+    oppo_team_names = team_names.rename(
+        columns={"team_api_id": "oppo_team_api_id", "team_name": "oppo_team_name"}
+    )
+
+    team_matches = pd.concat(
+        [_team_perspective(matches, "home"), _team_perspective(matches, "away")],
+        sort=False,
+    )
+
+    return (
+        team_matches.merge(leagues[["league_id", "league_name"]], on="league_id")
+        .merge(countries[["country_id", "country_name"]], on="country_id")
+        .merge(team_names, on="team_api_id", how="left")
+        .merge(oppo_team_names, on="oppo_team_api_id", how="left")
+        .loc[:, TEAM_MATCH_COLUMNS]
+        .sort_values(["date", "match_api_id", "at_home"], ascending=[True, True, False])
+        .reset_index(drop=True)
+    )
+
+
+def join_player_attributes(
+    players: pd.DataFrame, player_attributes: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Add each player's biographical data (name, birthday, height, weight)
+    to their attribute ratings.
+
+    Args:
+        players (pd.DataFrame): Cleaned Player data.
+        player_attributes (pd.DataFrame): Cleaned Player_Attributes data.
+
+    Returns:
+        pd.DataFrame with one row per player attribute rating.
+    """
+
+    return player_attributes.merge(
+        players.drop(columns=["player_fifa_api_id"], errors="ignore"),
+        on="player_api_id",
+        how="left",
+    )
+
+
+def merge_latest(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_on: str,
+    right_on: str,
+    by: str,
+    right_columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Join each left row to the latest right row with the same 'by' key
+    whose date is on or before the left row's date (i.e. an as-of join),
+    using one sorted merge rather than a lookup per row.
+
+    Args:
+        left (pd.DataFrame): Data to join to (e.g. player matches).
+        right (pd.DataFrame): Dated snapshots to join (e.g. player attributes).
+        left_on (str): Date column in left.
+        right_on (str): Date column in right.
+        by (str): Column that both data frames have to match on (e.g. player ID).
+        right_columns (list of str, None): Columns of right to join.
+            Defaults to all of them.
+
+    Returns:
+        pd.DataFrame with the same rows in the same order as left. Rows without
+        a date, a key, or an earlier snapshot get nulls for right's columns.
+    """
+
+    join_columns = [
+        column
+        for column in (right.columns if right_columns is None else right_columns)
+        if column != by
+    ]
+    snapshots = (
+        right.loc[:, [by] + join_columns]
+        .dropna(subset=[by, right_on])
+        .astype({by: "int64", right_on: "datetime64[ns]"})
+        .sort_values(right_on)
+    )
+
+    positioned_left = left.assign(**{ROW_POSITION_COLUMN: range(len(left))})
+    is_joinable = positioned_left[left_on].notnull() & positioned_left[by].notnull()
+    joinable_left = (
+        positioned_left[is_joinable]
+        .astype({by: "int64", left_on: "datetime64[ns]"})
+        .sort_values(left_on)
+    )
+
+    # merge_asof matches on the sorted dates, and 'by' limits the matches
+    # to each player's own snapshots
+    joined = pd.merge_asof(
+        joinable_left,
+        snapshots,
+        left_on=left_on,
+        right_on=right_on,
+        by=by,
+        direction="backward",
+    )
+    unjoinable_left = positioned_left[~is_joinable]
+
+    return (
+        pd.concat([joined, unjoinable_left], sort=False)
+        .sort_values(ROW_POSITION_COLUMN)
+        .drop(columns=[ROW_POSITION_COLUMN])
+        .reset_index(drop=True)
+    )
+
+
+def join_player_match_attributes(
+    player_matches: pd.DataFrame,
+    player_index: pd.DataFrame,
+    player_attributes: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Add each player's latest FIFA attribute ratings as of the match date
+    to their match data.
+
+    Args:
+        player_matches (pd.DataFrame): Player match data from fbref.
+        player_index (pd.DataFrame): Index of fbref player URLs to player_api_ids.
+        player_attributes (pd.DataFrame): Cleaned Player_Attributes data.
+
+    Returns:
+        pd.DataFrame with player_api_id and attribute columns added.
+    """
+
+    # Older rows don't have a PlayerUrl, so their player keys are normalized
+    # names, which we match to the names in the index
+    ids_by_key = {
+        normalize_player_name(str(player_name)): player_api_id
+        for player_name, player_api_id in zip(
+            player_index["Player"], player_index["player_api_id"]
+        )
+        if isinstance(player_name, str)
+    }
+    ids_by_key.update(zip(player_index["PlayerUrl"], player_index["player_api_id"]))
+    player_api_ids = player_keys(player_matches).map(ids_by_key)
+
+    return merge_latest(
+        player_matches.assign(player_api_id=player_api_ids.astype("float64")),
+        player_attributes.drop(columns=["player_fifa_api_id"], errors="ignore"),
+        left_on="Date",
+        right_on="date",
+        by="player_api_id",
+    ).rename(columns={"date": "attributes_date"})
@@ -0,0 +1,238 @@
+"""Pipeline nodes for parsing the XML event columns of the Match table"""
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from xml.etree import ElementTree
+import io
+import itertools
+import os
+
+import pandas as pd
+
+
+EVENT_COLUMNS = [
+    "goal",
+    "shoton",
+    "shotoff",
+    "foulcommit",
+    "card",
+    "cross",
+    "corner",
+    "possession",
+]
+# Maps the tags of each event's XML elements to event table columns
+EVENT_FIELDS = {
+    "id": "event_id",
+    "sortorder": "sortorder",
+    "elapsed": "elapsed",
+    "elapsed_plus": "elapsed_plus",
+    "team": "team_api_id",
+    "player1": "player1_api_id",
+    "player2": "player2_api_id",
+    "type": "type",
+    "subtype": "subtype",
+    "comment": "comment",
+    "card_type": "card_type",
+    "goal_type": "goal_type",
+    "homepos": "homepos",
+    "awaypos": "awaypos",
+}
+NUMERIC_FIELDS = [
+    "event_id",
+    "sortorder",
+    "elapsed",
+    "elapsed_plus",
+    "team_api_id",
+    "player1_api_id",
+    "player2_api_id",
+    "homepos",
+    "awaypos",
+]
+CATEGORICAL_FIELDS = [
+    "event_column",
+    "type",
+    "subtype",
+    "comment",
+    "card_type",
+    "goal_type",
+]
+MATCH_EVENT_COLUMNS = ["match_api_id", "event_column"] + list(EVENT_FIELDS.values())
+DEFAULT_CHUNK_SIZE = 1000
+# Enough to keep every worker busy while the results of earlier chunks come back
+MAX_PENDING_CHUNKS_PER_WORKER = 2
+
+MatchData = Union[pd.DataFrame, Iterable[pd.DataFrame]]
+Item = TypeVar("Item")
+Result = TypeVar("Result")
+
+
+def _parse_event_xml(xml: str) -> Iterator[Dict[str, Optional[str]]]:
+    if not isinstance(xml, str) or not xml.strip():
+        return
+
+    depth = 0
+
+    # Parsing incrementally lets us clear each event's elements as we go,
+    # rather than building the whole tree for matches with lots of events
+    for event, element in ElementTree.iterparse(
+        io.BytesIO(xml.encode("utf8")), events=("start", "end")
+    ):
+        if event == "start":
+            depth += 1
+            continue
+
+        depth -= 1
+
+        # Events are the <value> elements directly under the root element
+        if depth == 1 and element.tag == "value":
+            yield {
+                column: element.findtext(tag) for tag, column in EVENT_FIELDS.items()
+            }
+            element.clear()
+
+
+def _parse_match_event_records(
+    records: List[Dict[str, Any]]
+) -> List[Dict[str, Optional[str]]]:
+    return [
+        {"match_api_id": record["match_api_id"], "event_column": event_column, **event}
+        for record in records
+        for event_column in EVENT_COLUMNS
+        for event in _parse_event_xml(record.get(event_column))
+    ]
+
+
+def _iter_record_chunks(
+    matches: MatchData, chunk_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    match_chunks = [matches] if isinstance(matches, pd.DataFrame) else matches
+    columns = ["match_api_id"] + EVENT_COLUMNS
+
+    for match_chunk in match_chunks:
+        match_columns = match_chunk[
+            [column for column in columns if column in match_chunk.columns]
+        ]
+
+        # Only one chunk's records exist at a time, rather than the whole table's
+        for idx in range(0, len(match_columns), chunk_size):
+            yield match_columns.iloc[idx : idx + chunk_size].to_dict("records")
+
+
+def _event_data_frame(event_rows: List[Dict[str, Optional[str]]]) -> pd.DataFrame:
+    events = pd.DataFrame(event_rows, columns=MATCH_EVENT_COLUMNS)
+    events["match_api_id"] = events["match_api_id"].astype("int64")
+
+    # IDs and times can be missing, so they're floats rather than ints
+    for column in NUMERIC_FIELDS:
+        events[column] = pd.to_numeric(events[column], errors="coerce").astype(
+            "float64"
+        )
+
+    for column in CATEGORICAL_FIELDS:
+        events[column] = events[column].astype("category")
+
+    return events
+
+
+def _parse_match_event_chunk(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    return _event_data_frame(_parse_match_event_records(records))
+
+
+def _concat_event_data_frames(event_frames: List[pd.DataFrame]) -> pd.DataFrame:
+    if not event_frames:
+        return _event_data_frame([])
+
+    # pd.concat turns categorical columns with different categories back into
+    # strings, so each chunk gets all of the chunks' categories first
+    for column in CATEGORICAL_FIELDS:
+        categories = sorted(
+            set(
+                itertools.chain.from_iterable(
+                    event_frame[column].cat.categories for event_frame in event_frames
+                )
+            )
+        )
+
+        for event_frame in event_frames:
+            event_frame[column] = event_frame[column].cat.set_categories(categories)
+
+    return pd.concat(event_frames, ignore_index=True)
+
+
+def _map_in_order(
+    executor: Executor,
+    func: Callable[[Item], Result],
+    items: Iterable[Item],
+    max_pending: int,
+) -> Iterator[Result]:
+    # Unlike executor.map, only submits a few items at a time, so the items
+    # and results of the rest don't all pile up in memory at once
+    item_iter = iter(items)
+    pending = deque(
+        executor.submit(func, item) for item in itertools.islice(item_iter, max_pending)
+    )
+
+    while pending:
+        result = pending.popleft().result()
+
+        for item in itertools.islice(item_iter, 1):
+            pending.append(executor.submit(func, item))
+
+        yield result
+
+
+def parse_match_events(
+    matches: MatchData,
+    n_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Parse the XML event columns (goal, shoton, shotoff, foulcommit, card, cross,
+    corner, possession) of the Match table into a long table of events.
+
+    Args:
+        matches (pd.DataFrame, iterable of pd.DataFrames): Match data with
+            match_api_id and XML event columns, either as one data frame
+            or as chunks (e.g. from FilteredSQLTableDataSet with a chunksize).
+        n_workers (int, None): Number of processes to parse with. 1 parses in
+            the current process. Defaults to the number of CPUs.
+        chunk_size (int): Number of matches to send to a worker process at a time.
+
+    Returns:
+        pd.DataFrame with one row per event, keyed by match_api_id and event_column
+        (the name of the XML column the event came from).
+    """
+
+    # Each chunk's events become a data frame as soon as they're parsed,
+    # so we never hold more than a few chunks' worth of event dicts
+    record_chunks = _iter_record_chunks(matches, chunk_size)
+
+    if n_workers == 1:
+        return _concat_event_data_frames(
+            list(map(_parse_match_event_chunk, record_chunks))
+        )
+
+    max_workers = n_workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return _concat_event_data_frames(
+            list(
+                _map_in_order(
+                    executor,
+                    _parse_match_event_chunk,
+                    record_chunks,
+                    max_pending=MAX_PENDING_CHUNKS_PER_WORKER * max_workers,
+                )
+            )
+        )
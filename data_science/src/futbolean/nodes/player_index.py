@@ -0,0 +1,188 @@
+"""Pipeline nodes for linking fbref players to European Soccer Database players"""
+
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+from collections import defaultdict
+import logging
+
+import pandas as pd
+
+from futbolean.data_import.epl_player_data import (
+    normalize_player_name,
+    player_key,
+    player_url_name_key,
+)
+
+
+PLAYER_INDEX_COLUMNS = ["PlayerUrl", "Player", "player_api_id", "match_method"]
+# Heights from the two sources are rounded differently
+HEIGHT_TOLERANCE_CM = 3
+
+PlayerBio = Tuple[str, Optional[pd.Timestamp], Optional[float]]
+
+
+class _PlayerLookup:
+    # Hash tables keyed on name and birthdate, so each fbref player is only
+    # compared with the few Kaggle players that share a key, rather than all of them
+    def __init__(self, players: pd.DataFrame):
+        self.by_name_birthdate: Dict[Hashable, Set[int]] = defaultdict(set)
+        self.by_birthdate: Dict[Hashable, List[Tuple[int, Set[str]]]] = defaultdict(
+            list
+        )
+        self.by_name: Dict[str, List[Tuple[int, Optional[float]]]] = defaultdict(list)
+
+        for player_api_id, player_name, birthday, height in zip(
+            players["player_api_id"],
+            players["player_name"],
+            pd.to_datetime(players["birthday"]).dt.normalize(),
+            players["height"],
+        ):
+            name_key = normalize_player_name(player_name)
+
+            self.by_name_birthdate[(name_key, birthday)].add(player_api_id)
+            self.by_birthdate[birthday].append((player_api_id, set(name_key.split())))
+            self.by_name[name_key].append((player_api_id, height))
+
+    def match(self, name_key: str, birthdate, height) -> Tuple[Optional[int], str]:
+        if not pd.isnull(birthdate):
+            player_api_ids = self.by_name_birthdate.get((name_key, birthdate), set())
+
+            if len(player_api_ids) == 1:
+                return next(iter(player_api_ids)), "name_birthdate"
+
+            # One source often has a player's full name and the other only part
+            # of it (e.g. 'Ederson' vs 'Ederson Moraes')
+            name_parts = set(name_key.split())
+            player_api_ids = {
+                player_api_id
+                for player_api_id, candidate_name_parts in self.by_birthdate.get(
+                    birthdate, []
+                )
+                if name_parts & candidate_name_parts
+            }
+
+            if len(player_api_ids) == 1:
+                return next(iter(player_api_ids)), "partial_name_birthdate"
+
+        candidates = self.by_name.get(name_key, [])
+
+        # fbref has 0 for unknown heights
+        if _is_known(height):
+            candidates = [
+                (player_api_id, candidate_height)
+                for player_api_id, candidate_height in candidates
+                if _is_known(candidate_height)
+                and abs(candidate_height - height) <= HEIGHT_TOLERANCE_CM
+            ]
+            method = "name_height"
+        else:
+            method = "name"
+
+        if len(candidates) == 1:
+            return candidates[0][0], method
+
+        return None, "unmatched"
+
+
+def _is_known(value: Any) -> bool:
+    return not pd.isnull(value) and value > 0
+
+
+def _player_bios(player_matches: pd.DataFrame) -> Dict[str, PlayerBio]:
+    bio_columns = ["Player", "Birthdate", "HeightCm"]
+    url_column = (
+        player_matches["PlayerUrl"]
+        if "PlayerUrl" in player_matches.columns
+        else pd.Series(None, index=player_matches.index)
+    )
+    player_bios = player_matches[bio_columns].assign(PlayerUrl=url_column)
+    player_bios = player_bios.drop_duplicates(subset=["Player", "PlayerUrl"])
+
+    bios: Dict[str, PlayerBio] = {}
+
+    for player_name, birthdate, height, player_url in player_bios.itertuples(
+        index=False, name=None
+    ):
+        bio = (player_name, pd.to_datetime(birthdate, errors="coerce"), height)
+        bios.setdefault(player_key(player_url, player_name), bio)
+
+    return bios
+
+
+def build_player_index(
+    player_urls: List[str],
+    player_matches: pd.DataFrame,
+    players: pd.DataFrame,
+    previous_player_index: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Match fbref player URLs to European Soccer Database player_api_ids by
+    normalized name, birthdate, and height. Only URLs that weren't matched
+    in the previous index get matched again.
+
+    Args:
+        player_urls (list of str): fbref player URLs.
+        player_matches (pd.DataFrame): Player match data from fbref, with each
+            player's name, birthdate, and height.
+        players (pd.DataFrame): Cleaned European Soccer Database Player data.
+        previous_player_index (pd.DataFrame): Index saved by the previous run.
+            Empty if there isn't one.
+
+    Returns:
+        pd.DataFrame with one row per matched player URL, and the method used
+        to match it.
+    """
+
+    previous_index = (
+        previous_player_index[PLAYER_INDEX_COLUMNS]
+        if len(previous_player_index.columns)
+        else pd.DataFrame(columns=PLAYER_INDEX_COLUMNS)
+    )
+    indexed_urls = set(previous_index["PlayerUrl"])
+    new_urls = [url for url in dict.fromkeys(player_urls) if url not in indexed_urls]
+
+    lookup = _PlayerLookup(players)
+    bios = _player_bios(player_matches)
+    new_rows = []
+
+    for player_url in new_urls:
+        name_key = player_url_name_key(player_url)
+        player_name, birthdate, height = bios.get(
+            player_url, bios.get(name_key, (None, None, None))
+        )
+
+        if player_name is not None:
+            name_key = normalize_player_name(str(player_name))
+
+        player_api_id, match_method = lookup.match(
+            name_key, None if pd.isnull(birthdate) else birthdate.normalize(), height
+        )
+
+        if player_api_id is not None:
+            new_rows.append((player_url, player_name, player_api_id, match_method))
+
+    logging.getLogger(__name__).info(
+        "Matched %d of %d new player URLs", len(new_rows), len(new_urls)
+    )
+
+    new_index = pd.DataFrame(new_rows, columns=PLAYER_INDEX_COLUMNS)
+
+    return (
+        pd.concat([previous_index, new_index], ignore_index=True, sort=False)
+        .astype({"player_api_id": "int64"})
+        .reset_index(drop=True)
+    )
+
+
+def player_index_lookup(player_index: pd.DataFrame) -> Dict[str, int]:
+    """
+    Convert a player index to a dict for constant-time lookups of a
+    player_api_id by fbref player URL.
+
+    Args:
+        player_index (pd.DataFrame): Index built by build_player_index.
+
+    Returns:
+        Dict of player URLs to player_api_ids.
+    """
+
+    return dict(zip(player_index["PlayerUrl"], player_index["player_api_id"]))
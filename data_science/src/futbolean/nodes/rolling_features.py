@@ -0,0 +1,157 @@
+"""Pipeline nodes for rolling per-player form features over match history"""
+
+from typing import Optional, Sequence
+
+import pandas as pd
+
+from futbolean.data_import.epl_player_data import player_keys
+
+
+ROLLING_STAT_COLUMNS = [
+    "OffenseGls",
+    "Min",
+    "OffenseSh",
+    "OffenseSoT",
+    "DefenseCrdY",
+    "DefenseCrdR",
+]
+DEFAULT_WINDOWS = (3, 5, 10)
+DEFAULT_EWM_SPANS = (5,)
+PLAYER_KEY_COLUMN = "player_key"
+MATCH_KEY_COLUMNS = [PLAYER_KEY_COLUMN, "Date", "Comp"]
+
+
+def add_rolling_features(
+    player_matches: pd.DataFrame,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    ewm_spans: Sequence[int] = DEFAULT_EWM_SPANS,
+    stat_columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Add each player's form going into each match: sums of their stats over their
+    last N matches, and exponentially-weighted means of their stats over all
+    their previous matches. A match's own stats are never part of its features.
+
+    Args:
+        player_matches (pd.DataFrame): Player match data.
+        windows (list of int): Numbers of previous matches to sum stats over.
+        ewm_spans (list of int): Spans (in matches) of the exponentially-weighted
+            means.
+        stat_columns (list of str, None): Stats to calculate form for.
+            Defaults to goals, minutes, shots, shots on target, and cards.
+
+    Returns:
+        pd.DataFrame sorted by player and date, with a player_key column, and
+        columns named like 'OffenseGls_last_5' and 'OffenseGls_ewm_5'.
+        Exponentially-weighted means are missing for players' first matches.
+    """
+
+    stats = list(ROLLING_STAT_COLUMNS if stat_columns is None else stat_columns)
+    sorted_matches = (
+        player_matches.assign(**{PLAYER_KEY_COLUMN: player_keys(player_matches)})
+        .sort_values([PLAYER_KEY_COLUMN, "Date"], kind="mergesort")
+        .reset_index(drop=True)
+    )
+    sorted_player_keys = sorted_matches[PLAYER_KEY_COLUMN]
+
+    # Shifting by one match means each match's features only use earlier matches
+    previous_stats = (
+        sorted_matches[stats]
+        .astype("float64")
+        .groupby(sorted_player_keys, sort=False)
+        .shift(1)
+    )
+
+    # One cumulative sum per player gives us every window size: the sum over
+    # the last N matches is the running total minus the total N matches earlier
+    cumulative_stats = (
+        previous_stats.fillna(0).groupby(sorted_player_keys, sort=False).cumsum()
+    )
+    feature_columns = {}
+
+    for window in windows:
+        lagged_cumulative_stats = (
+            cumulative_stats.groupby(sorted_player_keys, sort=False)
+            .shift(window)
+            .fillna(0)
+        )
+        window_sums = cumulative_stats - lagged_cumulative_stats
+
+        for stat in stats:
+            feature_columns[f"{stat}_last_{window}"] = window_sums[stat]
+
+    for span in ewm_spans:
+        ewm_means = previous_stats.groupby(sorted_player_keys, sort=False).transform(
+            lambda values, span=span: values.ewm(span=span).mean()
+        )
+
+        for stat in stats:
+            feature_columns[f"{stat}_ewm_{span}"] = ewm_means[stat]
+
+    return sorted_matches.assign(**feature_columns)
+
+
+def update_rolling_features(
+    rolling_features: pd.DataFrame,
+    new_player_matches: pd.DataFrame,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    ewm_spans: Sequence[int] = DEFAULT_EWM_SPANS,
+    stat_columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Add new player matches to previously-calculated rolling features,
+    only recalculating the features of the players who have new matches.
+
+    Args:
+        rolling_features (pd.DataFrame): Output of add_rolling_features.
+        new_player_matches (pd.DataFrame): Player match data to add. Matches
+            that are already in rolling_features are ignored.
+        windows (list of int): Same as for add_rolling_features.
+        ewm_spans (list of int): Same as for add_rolling_features.
+        stat_columns (list of str, None): Same as for add_rolling_features.
+
+    Returns:
+        pd.DataFrame with the same columns as add_rolling_features.
+    """
+
+    new_matches = new_player_matches.assign(
+        **{PLAYER_KEY_COLUMN: player_keys(new_player_matches)}
+    )
+    existing_match_keys = pd.MultiIndex.from_frame(
+        rolling_features[MATCH_KEY_COLUMNS].astype(object)
+    )
+    is_new_match = ~pd.MultiIndex.from_frame(
+        new_matches[MATCH_KEY_COLUMNS].astype(object)
+    ).isin(existing_match_keys)
+    new_matches = new_matches[is_new_match]
+
+    if not len(new_matches):
+        return rolling_features
+
+    is_updated_player = rolling_features[PLAYER_KEY_COLUMN].isin(
+        new_matches[PLAYER_KEY_COLUMN]
+    )
+    # We only need the raw data of updated players' previous matches,
+    # because their features all get recalculated
+    raw_columns = [
+        column for column in new_matches.columns if column != PLAYER_KEY_COLUMN
+    ]
+    updated_player_matches = pd.concat(
+        [
+            rolling_features[is_updated_player].reindex(columns=raw_columns),
+            new_matches[raw_columns],
+        ],
+        sort=False,
+    )
+    updated_features = add_rolling_features(
+        updated_player_matches,
+        windows=windows,
+        ewm_spans=ewm_spans,
+        stat_columns=stat_columns,
+    )
+
+    return (
+        pd.concat([rolling_features[~is_updated_player], updated_features], sort=False)
+        .sort_values([PLAYER_KEY_COLUMN, "Date"], kind="mergesort")
+        .reset_index(drop=True)
+    )
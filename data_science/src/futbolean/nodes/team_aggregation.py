@@ -0,0 +1,146 @@
+"""Pipeline nodes for rolling player match data up to team matches"""
+
+from typing import Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from futbolean.data_import.epl_player_data import normalize_player_name
+
+
+TEAM_MATCH_KEY_COLUMNS = ["Squad", "Date"]
+TEAM_SUM_COLUMNS = [
+    "OffenseGls",
+    "OffenseAst",
+    "OffenseSh",
+    "OffenseSoT",
+    "DefenseTkl",
+    "DefenseInt",
+    "DefenseFls",
+    "DefenseCrdY",
+    "DefenseCrdR",
+    "Min",
+]
+RATING_COLUMNS = ["overall_rating", "potential"]
+# fbref abbreviates some club names that the European Soccer Database spells out
+TEAM_NAME_ALIASES = {
+    "Manchester Utd": "Manchester United",
+    "Newcastle Utd": "Newcastle United",
+    "Sheffield Utd": "Sheffield United",
+    "Tottenham": "Tottenham Hotspur",
+    "West Ham": "West Ham United",
+    "West Brom": "West Bromwich Albion",
+    "Wolves": "Wolverhampton Wanderers",
+    "QPR": "Queens Park Rangers",
+    "Brighton": "Brighton & Hove Albion",
+    "Bolton": "Bolton Wanderers",
+    "Blackburn": "Blackburn Rovers",
+    "Birmingham": "Birmingham City",
+}
+TEAM_KEY_COLUMN = "team_key"
+KAGGLE_TEAM_MATCH_COLUMNS = [
+    "match_api_id",
+    "season",
+    "team_api_id",
+    "oppo_team_api_id",
+    "at_home",
+    "goals",
+    "oppo_goals",
+]
+
+
+def _team_keys(team_names: pd.Series) -> pd.Series:
+    return (
+        team_names.astype(object)
+        .map(lambda name: TEAM_NAME_ALIASES.get(name, name))
+        .astype(str)
+        .map(normalize_player_name)
+    )
+
+
+def _group_codes(
+    data_frame: pd.DataFrame, key_columns: Sequence[str]
+) -> Tuple[np.ndarray, pd.DataFrame]:
+    # Factorizing the keys once gives every row an integer group code, so each
+    # aggregation is a single bincount rather than another multi-column groupby
+    group_codes, group_keys = pd.MultiIndex.from_frame(
+        data_frame[list(key_columns)].astype(object)
+    ).factorize()
+
+    # Factorizing drops the level names
+    group_key_frame = group_keys.to_frame(index=False)
+    group_key_frame.columns = list(key_columns)
+
+    return group_codes, group_key_frame
+
+
+def aggregate_team_matches(
+    player_match_data: pd.DataFrame, team_matches: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Roll player match data up to one row per team per match, with summed stats
+    and minutes-weighted player ratings, and join it to the European Soccer
+    Database's team matches.
+
+    Args:
+        player_match_data (pd.DataFrame): Player match data, with player
+            attribute ratings where available.
+        team_matches (pd.DataFrame): Team match data from join_team_matches.
+
+    Returns:
+        pd.DataFrame with one row per fbref squad per match date. Matches that
+        aren't in the European Soccer Database have nulls for its columns.
+    """
+
+    player_rows = player_match_data.dropna(subset=TEAM_MATCH_KEY_COLUMNS)
+    group_codes, team_player_matches = _group_codes(player_rows, TEAM_MATCH_KEY_COLUMNS)
+    n_groups = len(team_player_matches)
+    minutes = player_rows["Min"].astype("float64").fillna(0).values
+
+    team_player_matches["n_players"] = np.bincount(group_codes, minlength=n_groups)
+
+    for column in TEAM_SUM_COLUMNS:
+        team_player_matches[column] = np.bincount(
+            group_codes,
+            weights=player_rows[column].astype("float64").fillna(0).values,
+            minlength=n_groups,
+        )
+
+    for column in [col for col in RATING_COLUMNS if col in player_rows.columns]:
+        ratings = player_rows[column].astype("float64").values
+        # Players without ratings shouldn't drag the team's average down
+        has_rating = ~np.isnan(ratings)
+        rated_minutes = np.bincount(
+            group_codes[has_rating], weights=minutes[has_rating], minlength=n_groups
+        )
+        weighted_ratings = np.bincount(
+            group_codes[has_rating],
+            weights=ratings[has_rating] * minutes[has_rating],
+            minlength=n_groups,
+        )
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            team_player_matches[f"{column}_weighted"] = np.where(
+                rated_minutes > 0, weighted_ratings / rated_minutes, np.nan
+            )
+
+    team_player_matches[TEAM_KEY_COLUMN] = _team_keys(team_player_matches["Squad"])
+    team_player_matches["Date"] = pd.to_datetime(team_player_matches["Date"]).astype(
+        "datetime64[ns]"
+    )
+
+    kaggle_team_matches = team_matches.assign(
+        **{
+            TEAM_KEY_COLUMN: _team_keys(team_matches["team_name"]),
+            "Date": pd.to_datetime(team_matches["date"]).astype("datetime64[ns]"),
+        }
+    )[[TEAM_KEY_COLUMN, "Date"] + KAGGLE_TEAM_MATCH_COLUMNS]
+
+    return (
+        team_player_matches.merge(
+            kaggle_team_matches, on=[TEAM_KEY_COLUMN, "Date"], how="left"
+        )
+        .drop(columns=[TEAM_KEY_COLUMN])
+        .sort_values(["Date", "Squad"])
+        .reset_index(drop=True)
+    )
@@ -29,6 +29,18 @@
 
 from kedro.pipeline import Pipeline, node
 
+from futbolean.nodes import (
+    cleaning,
+    joining,
+    features,
+    downcasting,
+    player_index,
+    rolling_features,
+    team_aggregation,
+)
+from futbolean.nodes.match_events import parse_match_events
+from futbolean.runner import IO_TAG, CPU_TAG
+
 
 def create_pipeline(**_kwargs):
     """Create the project's pipeline.
@@ -41,22 +53,146 @@ def create_pipeline(**_kwargs):
 
     """
 
+    # Each node only takes the data sets it needs, so independent branches
+    # can run in parallel, and each raw table can be released once it's cleaned.
+    # With HybridRunner, 'io' nodes (mostly waiting on databases and files) run
+    # in threads and 'cpu' nodes run in processes. parse_match_events is an 'io'
+    # node, because it already farms its parsing out to its own process pool.
     pipeline = Pipeline(
         [
             node(
-                lambda *x: x,
-                [
-                    "european_player_attributes",
-                    "european_players",
-                    "european_matches",
-                    "european_leagues",
-                    "european_countries",
-                    "european_teams",
-                    "european_team_attributes",
-                    "epl_player_matches",
-                ],
-                "data",
-            )
+                cleaning.clean_countries,
+                "european_countries",
+                "countries",
+                name="clean_countries",
+                tags=[IO_TAG],
+            ),
+            node(
+                cleaning.clean_leagues,
+                "european_leagues",
+                "leagues",
+                name="clean_leagues",
+                tags=[IO_TAG],
+            ),
+            node(
+                cleaning.clean_teams,
+                "european_teams",
+                "teams",
+                name="clean_teams",
+                tags=[IO_TAG],
+            ),
+            node(
+                cleaning.clean_team_attributes,
+                "european_team_attributes",
+                "team_attributes",
+                name="clean_team_attributes",
+                tags=[IO_TAG],
+            ),
+            node(
+                cleaning.clean_players,
+                "european_players",
+                "players",
+                name="clean_players",
+                tags=[IO_TAG],
+            ),
+            node(
+                cleaning.clean_player_attributes,
+                "european_player_attributes",
+                "player_attributes",
+                name="clean_player_attributes",
+                tags=[IO_TAG],
+            ),
+            node(
+                cleaning.clean_matches,
+                "epl_matches",
+                "matches",
+                name="clean_matches",
+                tags=[IO_TAG],
+            ),
+            node(
+                cleaning.clean_player_urls,
+                "remote_epl_player_urls",
+                "player_urls",
+                name="clean_player_urls",
+                tags=[IO_TAG],
+            ),
+            node(
+                cleaning.clean_epl_player_matches,
+                "epl_player_matches",
+                "clean_player_matches",
+                name="clean_epl_player_matches",
+                tags=[IO_TAG],
+            ),
+            node(
+                downcasting.downcast_player_matches,
+                "clean_player_matches",
+                "player_matches",
+                name="downcast_player_matches",
+                tags=[CPU_TAG],
+            ),
+            node(
+                parse_match_events,
+                "european_match_event_xml",
+                "match_events",
+                name="parse_match_events",
+                tags=[IO_TAG],
+            ),
+            node(
+                joining.join_team_matches,
+                ["matches", "leagues", "countries", "teams"],
+                "team_matches",
+                name="join_team_matches",
+                tags=[CPU_TAG],
+            ),
+            node(
+                joining.join_player_attributes,
+                ["players", "player_attributes"],
+                "player_attribute_data",
+                name="join_player_attributes",
+                tags=[CPU_TAG],
+            ),
+            node(
+                player_index.build_player_index,
+                ["player_urls", "player_matches", "players", "previous_player_index",],
+                "player_index",
+                name="build_player_index",
+                tags=[CPU_TAG],
+            ),
+            node(
+                features.add_team_match_features,
+                "team_matches",
+                "team_match_features",
+                name="add_team_match_features",
+                tags=[CPU_TAG],
+            ),
+            node(
+                joining.join_player_match_attributes,
+                ["player_matches", "player_index", "player_attributes"],
+                "player_match_data",
+                name="join_player_match_attributes",
+                tags=[CPU_TAG],
+            ),
+            node(
+                team_aggregation.aggregate_team_matches,
+                ["player_match_data", "team_matches"],
+                "team_player_match_stats",
+                name="aggregate_team_matches",
+                tags=[CPU_TAG],
+            ),
+            node(
+                features.add_player_match_features,
+                "player_match_data",
+                "player_match_base_features",
+                name="add_player_match_features",
+                tags=[CPU_TAG],
+            ),
+            node(
+                rolling_features.add_rolling_features,
+                "player_match_base_features",
+                "player_match_features",
+                name="add_rolling_features",
+                tags=[CPU_TAG],
+            ),
         ]
     )
 
@@ -1,12 +1,14 @@
 """Application entry point."""
 
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Dict, Iterable
 
 from kedro.context import KedroContext
+from kedro.io import DataCatalog
 from kedro.runner import AbstractRunner
 from kedro.pipeline import Pipeline
 
+from futbolean.io import prefetch_pipeline_inputs
 from futbolean.pipeline import create_pipeline
 
 
@@ -23,6 +25,47 @@ class ProjectContext(KedroContext):
     def pipeline(self) -> Pipeline:
         return create_pipeline()
 
+    def run(  # pylint: disable=too-many-arguments
+        self,
+        tags: Iterable[str] = None,
+        runner: AbstractRunner = None,
+        node_names: Iterable[str] = None,
+        from_nodes: Iterable[str] = None,
+        to_nodes: Iterable[str] = None,
+        pipeline: Pipeline = None,
+        catalog: DataCatalog = None,
+    ) -> Dict[str, Any]:
+        """
+        Run the pipeline like KedroContext.run, but first start fetching the remote
+        data that it loads (see prefetch_pipeline_inputs), whichever runner it uses.
+        """
+
+        pipeline = pipeline or self.pipeline
+
+        if tags:
+            pipeline = pipeline & self.pipeline.only_nodes_with_tags(*tags)
+        if from_nodes:
+            pipeline = pipeline & self.pipeline.from_nodes(*from_nodes)
+        if to_nodes:
+            pipeline = pipeline & self.pipeline.to_nodes(*to_nodes)
+        if node_names:
+            pipeline = pipeline & self.pipeline.only_nodes(*node_names)
+
+        # The catalog property builds new data sets each time, so the run has to use
+        # the same catalog that the prefetching data sets are in
+        catalog = catalog or self.catalog
+        prefetch_pipeline_inputs(pipeline, catalog)
+
+        return super().run(
+            tags,
+            runner,
+            node_names,
+            from_nodes,
+            to_nodes,
+            pipeline=pipeline,
+            catalog=catalog,
+        )
+
 
 def main(
     tags: Iterable[str] = None,
@@ -0,0 +1,190 @@
+"""Kedro runner that splits nodes between thread and process pools"""
+
+from typing import Iterable, Optional, Set
+from collections import Counter
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import chain
+
+from kedro.io import AbstractDataSet, DataCatalog, MemoryDataSet
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+from kedro.runner import AbstractRunner, ParallelRunner, run_node
+from kedro.runner.parallel_runner import ParallelRunnerManager
+
+from futbolean.io import prefetch_pipeline_inputs
+from futbolean.settings import RUNNER_MAX_PROCESS_WORKERS, RUNNER_MAX_THREAD_WORKERS
+
+
+IO_TAG = "io"
+CPU_TAG = "cpu"
+
+
+class HybridRunner(AbstractRunner):
+    """
+    Runs nodes tagged 'cpu' in a process pool and all other nodes (e.g. ones
+    that wait on HTTP requests or databases) in a thread pool. Unlike kedro's
+    ParallelRunner, data only gets pickled between processes when a CPU node
+    reads or writes it. Remote data sets that the pipeline loads start
+    prefetching as soon as the run starts.
+    """
+
+    def __init__(
+        self,
+        max_thread_workers: Optional[int] = RUNNER_MAX_THREAD_WORKERS,
+        max_process_workers: Optional[int] = RUNNER_MAX_PROCESS_WORKERS,
+        cpu_tag: str = CPU_TAG,
+    ):
+        """
+        Args:
+            max_thread_workers (int, None): Maximum number of nodes to run
+                in threads at once. Defaults to the RUNNER_MAX_THREAD_WORKERS
+                setting (None lets concurrent.futures decide).
+            max_process_workers (int, None): Maximum number of nodes to run
+                in processes at once. Defaults to the RUNNER_MAX_PROCESS_WORKERS
+                setting (None means one per CPU).
+            cpu_tag (str): Tag of the nodes to run in processes.
+        """
+
+        self.max_thread_workers = max_thread_workers
+        self.max_process_workers = max_process_workers
+        self.cpu_tag = cpu_tag
+
+        self._manager: Optional[ParallelRunnerManager] = None
+        self._shared_data_sets: Set[str] = set()
+
+    def run(self, pipeline: Pipeline, catalog: DataCatalog):
+        # Only data sets that CPU nodes touch need to live in a manager process;
+        # everything else stays in this process for the threads to share
+        self._shared_data_sets = {
+            data_set
+            for node in pipeline.nodes
+            if self._runs_in_process(node)
+            for data_set in node.inputs + node.outputs
+        }
+
+        # Remote data can take minutes to fetch, so we start on it while
+        # the first nodes load local data
+        prefetch_pipeline_inputs(pipeline, catalog)
+
+        try:
+            return super().run(pipeline, catalog)
+        finally:
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
+
+    def create_default_data_set(self, ds_name: str) -> AbstractDataSet:
+        if ds_name not in self._shared_data_sets:
+            return MemoryDataSet()
+
+        if self._manager is None:
+            self._manager = ParallelRunnerManager()
+            self._manager.start()
+
+        return self._manager.MemoryDataSet()  # pylint: disable=no-member
+
+    def _runs_in_process(self, node: Node) -> bool:
+        return self.cpu_tag in node.tags
+
+    @staticmethod
+    def _node_catalog(node: Node, catalog: DataCatalog) -> DataCatalog:
+        # Process nodes only get pickled copies of their own data sets,
+        # rather than the whole catalog
+        data_sets = catalog._data_sets  # pylint: disable=protected-access
+
+        return DataCatalog(
+            {name: data_sets[name] for name in node.inputs + node.outputs}
+        )
+
+    def _validate_process_nodes(
+        self, process_nodes: Iterable[Node], catalog: DataCatalog
+    ) -> None:
+        process_nodes = list(process_nodes)
+        # pylint: disable=protected-access
+        ParallelRunner._validate_nodes(process_nodes)
+        ParallelRunner._validate_catalog(
+            DataCatalog(
+                {
+                    name: data_set
+                    for name, data_set in catalog._data_sets.items()
+                    if name in self._shared_data_sets
+                }
+            ),
+            Pipeline(process_nodes),
+        )
+
+    def _submit(
+        self,
+        node: Node,
+        catalog: DataCatalog,
+        thread_pool: Executor,
+        process_pool: Executor,
+    ):
+        if self._runs_in_process(node):
+            return process_pool.submit(
+                run_node, node, self._node_catalog(node, catalog)
+            )
+
+        return thread_pool.submit(run_node, node, catalog)
+
+    def _run(self, pipeline: Pipeline, catalog: DataCatalog) -> None:
+        nodes = pipeline.nodes
+        process_nodes = [node for node in nodes if self._runs_in_process(node)]
+
+        if process_nodes:
+            self._validate_process_nodes(process_nodes, catalog)
+
+        load_counts = Counter(chain.from_iterable(node.inputs for node in nodes))
+        node_dependencies = pipeline.node_dependencies
+        todo_nodes = set(node_dependencies.keys())
+        done_nodes: Set[Node] = set()
+        futures = set()
+
+        # ProcessPoolExecutor doesn't start any processes until a node is submitted,
+        # so pipelines without CPU nodes never pay for them
+        with ThreadPoolExecutor(
+            max_workers=self.max_thread_workers
+        ) as thread_pool, ProcessPoolExecutor(
+            max_workers=self.max_process_workers
+        ) as process_pool:
+            while True:
+                ready = {
+                    node for node in todo_nodes if node_dependencies[node] <= done_nodes
+                }
+                todo_nodes -= ready
+
+                for node in ready:
+                    futures.add(self._submit(node, catalog, thread_pool, process_pool))
+
+                if not futures:
+                    assert not todo_nodes, (todo_nodes, done_nodes)
+                    break
+
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    node = future.result()
+                    done_nodes.add(node)
+                    self._release_data_sets(node, pipeline, catalog, load_counts)
+
+    @staticmethod
+    def _release_data_sets(
+        node: Node, pipeline: Pipeline, catalog: DataCatalog, load_counts: Counter
+    ) -> None:
+        # Releasing data sets as soon as nothing else needs them keeps big
+        # intermediate data frames from piling up in memory
+        for data_set in node.inputs:
+            load_counts[data_set] -= 1
+
+            if load_counts[data_set] < 1 and data_set not in pipeline.inputs():
+                catalog.release(data_set)
+
+        for data_set in node.outputs:
+            if load_counts[data_set] < 1 and data_set not in pipeline.outputs():
+                catalog.release(data_set)
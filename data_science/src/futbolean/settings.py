@@ -5,3 +5,19 @@ import os
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
 RAW_DATA_DIR = os.path.join(BASE_DIR, "data/01_raw/")
+INTERMEDIATE_DATA_DIR = os.path.join(BASE_DIR, "data/02_intermediate/")
+RESPONSE_CACHE_DIR = os.path.join(BASE_DIR, "data/01_raw/response_cache/")
+RATE_LIMIT_DIR = os.path.join(BASE_DIR, "data/01_raw/rate_limits/")
+
+# Worker limits for futbolean.runner.HybridRunner. Unset means concurrent.futures
+# picks the defaults (one process per CPU).
+RUNNER_MAX_THREAD_WORKERS = (
+    int(os.environ["RUNNER_MAX_THREAD_WORKERS"])
+    if os.getenv("RUNNER_MAX_THREAD_WORKERS")
+    else None
+)
+RUNNER_MAX_PROCESS_WORKERS = (
+    int(os.environ["RUNNER_MAX_PROCESS_WORKERS"])
+    if os.getenv("RUNNER_MAX_PROCESS_WORKERS")
+    else None
+)
@@ -0,0 +1,62 @@
+# pylint: disable=missing-docstring
+
+import os
+from unittest import TestCase
+
+import yaml
+from kedro.config import ConfigLoader
+from kedro.io import DataCatalog
+
+from futbolean.pipeline import create_pipeline
+from futbolean.settings import BASE_DIR
+
+
+CONF_DIR = os.path.join(BASE_DIR, "conf/base")
+CATALOG_FILEPATH = os.path.join(CONF_DIR, "catalog.yml")
+
+
+class UniqueKeyLoader(yaml.SafeLoader):
+    # PyYAML silently keeps the last of any duplicate keys
+    def construct_mapping(self, node, deep=False):
+        keys = [key_node.value for key_node, _ in node.value if key_node.value != "<<"]
+        duplicate_keys = {key for key in keys if keys.count(key) > 1}
+
+        if duplicate_keys:
+            raise yaml.constructor.ConstructorError(
+                None, None, f"Duplicate keys: {duplicate_keys}", node.start_mark
+            )
+
+        return super().construct_mapping(node, deep=deep)
+
+
+class TestCatalog(TestCase):
+    def setUp(self):
+        self.catalog_config = ConfigLoader([CONF_DIR]).get("catalog*")
+        self.catalog = DataCatalog.from_config(
+            self.catalog_config, {"european_soccer_credentials": {"con": "sqlite://"}},
+        )
+
+    def test_catalog_yml(self):
+        with open(CATALOG_FILEPATH, "r") as catalog_file:
+            yaml.load(catalog_file, Loader=UniqueKeyLoader)
+
+    def test_pipeline_inputs(self):
+        missing_inputs = create_pipeline().inputs() - set(self.catalog.list())
+
+        self.assertEqual(missing_inputs, set())
+
+    def test_remote_data_set_filepaths(self):
+        # Local copies of remote data are in the data source's format, so they
+        # can't be shared with data sets that expect some other format
+        for name, config in self.catalog_config.items():
+            if config["type"] != "futbolean.io.JSONRemoteDataSet":
+                continue
+
+            with self.subTest(name):
+                other_filepaths = {
+                    other_config.get("filepath")
+                    for other_name, other_config in self.catalog_config.items()
+                    if other_name != name
+                }
+
+                self.assertNotIn(config.get("filepath"), other_filepaths - {None})
@@ -11,15 +11,23 @@ named ``test_*`` which test a unit of logic.
 To run the tests, run ``kedro test``.
 """
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
+from kedro.io import DataCatalog
+from kedro.pipeline import Pipeline, node
+from kedro.runner import SequentialRunner
 
+from futbolean.io import JSONRemoteDataSet, prefetch_pipeline_inputs
 from futbolean.run import ProjectContext
 
 
 @pytest.fixture
 def project_context():
-    return ProjectContext(str(Path.cwd()))
+    # The project's logging config writes to the files in logs/, which every test
+    # after this one would then log to as well
+    with patch.object(ProjectContext, "_setup_logging"):
+        yield ProjectContext(str(Path.cwd()))
 
 
 class TestProjectContext:
@@ -30,3 +38,23 @@ class TestProjectContext:
     @staticmethod
     def test_project_version(project_context):
         assert project_context.project_version == "0.15.0"
+
+    @staticmethod
+    def test_run(project_context):
+        remote_data_set = JSONRemoteDataSet(lambda: [1, 2, 3], prefetch=True)
+        catalog = DataCatalog({"remote_numbers": remote_data_set})
+        pipeline = Pipeline([node(sum, "remote_numbers", "total")])
+
+        with patch(
+            "futbolean.run.prefetch_pipeline_inputs", wraps=prefetch_pipeline_inputs
+        ) as mock_prefetch:
+            outputs = project_context.run(
+                runner=SequentialRunner(), pipeline=pipeline, catalog=catalog
+            )
+
+        # Remote data starts prefetching with any runner, in the catalog
+        # that the pipeline runs with
+        prefetch_pipeline, prefetch_catalog = mock_prefetch.call_args[0]
+        assert prefetch_pipeline.inputs() == {"remote_numbers"}
+        assert prefetch_catalog is catalog
+        assert outputs == {"total": 6}
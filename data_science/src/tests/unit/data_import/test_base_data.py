@@ -0,0 +1,422 @@
+# pylint: disable=missing-docstring
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse, parse_qs
+import io
+import json
+import os
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from futbolean.data_import import base_data
+from futbolean.data_import.base_data import (
+    fetch_data,
+    stream_data,
+    make_session,
+    get_session,
+    set_session,
+    DataRequestError,
+    LOCAL_AFL_DATA_SERVICE,
+    COLUMNS_FORMAT,
+)
+from futbolean.data_import.response_cache import ResponseCache
+from futbolean.data_import.retry_policy import RetryPolicy
+from futbolean.data_import.rate_limiter import RateLimiter
+
+
+PLAYER_STATS_COLUMNS = {
+    "Player": ["Ederson", "Ederson", "Kyle Walker"],
+    "Min": [90, "NA", 75],
+    "Comp": ["Premier League", "Premier League", "NA"],
+    "ExpectedxG": ["NA", "NA", "NA"],
+}
+NUMBER_COLUMNS = {"Min", "ExpectedxG"}
+
+
+class FakeDataServiceHandler(BaseHTTPRequestHandler):
+    """Stand-in for the data service's /player_stats endpoint"""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        query = parse_qs(urlparse(self.path).query)
+        columns = PLAYER_STATS_COLUMNS
+
+        # jsonlite serializes a data frame as rows, leaving out missing values,
+        # or as lists of columns, with missing numbers as 'NA'
+        if query.get("format") == [COLUMNS_FORMAT] and self.server.supports_columns:
+            data = columns
+        else:
+            data = [
+                {
+                    key: value
+                    for key, value in zip(columns, row)
+                    if value != "NA" or key not in NUMBER_COLUMNS
+                }
+                for row in zip(*columns.values())
+            ]
+
+        body = json.dumps(
+            {"data": {"data": data, "skipped_urls": []}, "error": {}}
+        ).encode("utf8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        # Simulates the connection getting dropped partway through the body
+        self.wfile.write(body[: len(body) // 2] if self.server.cuts_off else body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class TestBaseData(TestCase):
+    def setUp(self):
+        self.response = MagicMock(status_code=200)
+        self.response.json.return_value = {
+            "data": {"data": [{"Player": "Ederson"}], "skipped_urls": []},
+            "error": {},
+        }
+        self.session = MagicMock()
+        self.session.get.return_value = self.response
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(cache_dir=self.cache_dir.name)
+        self.rate_limiter = RateLimiter(
+            state_dir=self.cache_dir.name, rates={}, default_rate=None
+        )
+        self.rate_limiter_patch = patch.object(
+            base_data, "_rate_limiter", self.rate_limiter
+        )
+        self.rate_limiter_patch.start()
+
+    def tearDown(self):
+        self.rate_limiter_patch.stop()
+        set_session(None)
+        self.cache_dir.cleanup()
+
+    def test_fetch_data(self):
+        params = {"player_urls": ["https://fbref.com/en/players/3bb7b8b4/Ederson"]}
+        data = fetch_data(
+            "/player_stats", params=params, session=self.session, cache=self.cache
+        )
+
+        self.session.get.assert_called_with(
+            LOCAL_AFL_DATA_SERVICE + "/player_stats",
+            params=params,
+            headers={},
+            stream=False,
+        )
+        self.assertEqual(data, self.response.json.return_value)
+
+        with self.subTest("with a cached response"):
+            cached_data = fetch_data(
+                "/player_stats", params=params, session=self.session, cache=self.cache
+            )
+
+            self.assertEqual(self.session.get.call_count, 1)
+            self.assertEqual(cached_data, data)
+
+        with self.subTest("bypassing the cache"):
+            fetch_data(
+                "/player_stats",
+                params=params,
+                session=self.session,
+                cache=self.cache,
+                use_cache=False,
+            )
+
+            self.assertEqual(self.session.get.call_count, 2)
+
+        with self.subTest("with the shared session"):
+            set_session(self.session)
+            fetch_data("/player_urls", use_cache=False)
+
+            self.assertEqual(self.session.get.call_count, 3)
+
+        with self.subTest("records metrics"):
+            with self.assertLogs("futbolean.data_import.metrics", level="INFO") as logs:
+                fetch_data("/player_stats", session=self.session, use_cache=False)
+
+            self.assertEqual(logs.records[0].event, "request")
+            self.assertEqual(logs.records[0].n_rows, 1)
+
+        with self.subTest("with a rate limiter"):
+            rate_limiter = MagicMock()
+            fetch_data(
+                "/player_stats",
+                session=self.session,
+                use_cache=False,
+                rate_limiter=rate_limiter,
+            )
+
+            rate_limiter.acquire.assert_called_once_with("/player_stats")
+
+        with self.subTest("with an error in the response"):
+            self.response.json.return_value = {"data": {}, "error": ["Rate limited"]}
+
+            with self.assertRaises(DataRequestError):
+                fetch_data("/player_stats", session=self.session, cache=self.cache)
+
+    def test_stream_data(self):
+        params = {"player_urls": ["https://fbref.com/en/players/3bb7b8b4/Ederson"]}
+        response_data = {
+            "data": {
+                "data": [{"Player": "Ederson", "Min": 90}, {"Player": "Ederson"}],
+                "skipped_urls": [],
+            },
+            "error": {},
+        }
+
+        def stream_response(data):
+            response = MagicMock(status_code=200)
+            response.raw = io.BytesIO(json.dumps(data).encode("utf8"))
+            return response
+
+        self.session.get.return_value = stream_response(response_data)
+
+        streamed_data = stream_data(
+            "/player_stats", params=params, session=self.session, cache=self.cache
+        )
+
+        self.assertEqual(list(streamed_data), response_data["data"]["data"])
+        self.assertEqual(streamed_data.skipped_urls, [])
+        self.assertEqual(self.session.get.call_args[1]["stream"], True)
+
+        with self.subTest("tees the response into the cache"):
+            self.assertEqual(self.cache.get("/player_stats", params), response_data)
+
+            cached_data = stream_data(
+                "/player_stats", params=params, session=self.session, cache=self.cache
+            )
+
+            self.assertEqual(list(cached_data), response_data["data"]["data"])
+            self.assertEqual(self.session.get.call_count, 1)
+
+        with self.subTest("with skipped URLs"):
+            self.cache.clear()
+            skipped_data = {
+                "data": {"data": [], "skipped_urls": params["player_urls"]},
+                "error": {},
+            }
+            self.session.get.return_value = stream_response(skipped_data)
+
+            streamed_data = stream_data(
+                "/player_stats", params=params, session=self.session, cache=self.cache
+            )
+
+            self.assertEqual(list(streamed_data), [])
+            self.assertEqual(streamed_data.skipped_urls, params["player_urls"])
+            self.assertIsNone(self.cache.get("/player_stats", params))
+            self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+        with self.subTest("with an error in the response"):
+            self.session.get.return_value = stream_response(
+                {"data": {"data": {}, "skipped_urls": {}}, "error": ["Rate limited"]}
+            )
+            streamed_data = stream_data(
+                "/player_stats", params=params, session=self.session, cache=self.cache
+            )
+
+            with self.assertRaises(DataRequestError):
+                list(streamed_data)
+
+            self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+        with self.subTest("when it isn't read in full"):
+            self.session.get.return_value = stream_response(response_data)
+
+            with stream_data(
+                "/player_stats", params=params, session=self.session, cache=self.cache
+            ) as streamed_data:
+                next(iter(streamed_data))
+
+            self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+            self.session.get.return_value = stream_response(response_data)
+            streamed_data = stream_data(
+                "/player_stats", params=params, session=self.session, cache=self.cache
+            )
+            del streamed_data
+
+            self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+        with self.subTest("with incomplete JSON"):
+            response = stream_response(response_data)
+            response.raw = io.BytesIO(response.raw.getvalue()[:-10])
+            self.session.get.return_value = response
+            streamed_data = stream_data(
+                "/player_stats", params=params, session=self.session, cache=self.cache
+            )
+
+            with self.assertRaises(DataRequestError):
+                list(streamed_data)
+
+            self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+    def test_stream_data_formats(self):
+        server = HTTPServer(("127.0.0.1", 0), FakeDataServiceHandler)
+        server.supports_columns = True
+        server.cuts_off = False
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        service_patch = patch.object(
+            base_data,
+            "LOCAL_AFL_DATA_SERVICE",
+            f"http://127.0.0.1:{server.server_address[1]}",
+        )
+        service_patch.start()
+        self.addCleanup(service_patch.stop)
+
+        params = {"player_urls": ["https://fbref.com/en/players/3bb7b8b4/Ederson"]}
+        expected_rows = [
+            {"Player": "Ederson", "Min": 90, "Comp": "Premier League"},
+            {"Player": "Ederson", "Comp": "Premier League"},
+            {"Player": "Kyle Walker", "Min": 75, "Comp": "NA"},
+        ]
+
+        for supports_columns in [True, False]:
+            server.supports_columns = supports_columns
+            self.cache.clear()
+
+            with self.subTest(supports_columns=supports_columns):
+                streamed_data = stream_data(
+                    "/player_stats",
+                    params=params,
+                    cache=self.cache,
+                    response_format=COLUMNS_FORMAT,
+                )
+
+                self.assertEqual(list(streamed_data), expected_rows)
+
+                data_frame = stream_data(
+                    "/player_stats",
+                    params=params,
+                    cache=self.cache,
+                    response_format=COLUMNS_FORMAT,
+                ).to_frame()
+
+                self.assertEqual(
+                    list(data_frame["Player"]), ["Ederson", "Ederson", "Kyle Walker"]
+                )
+                self.assertEqual(
+                    data_frame["Min"].isna().tolist(), [False, True, False]
+                )
+                # Missing strings aren't mistaken for missing numbers
+                self.assertEqual(data_frame["Comp"].iloc[2], "NA")
+
+                if supports_columns:
+                    # Even when none of a number column's values are known
+                    self.assertTrue(data_frame["ExpectedxG"].isna().all())
+
+        with self.subTest("with a response that gets cut off"):
+            server.cuts_off = True
+            self.cache.clear()
+            streamed_data = stream_data(
+                "/player_stats", params=params, cache=self.cache
+            )
+
+            with self.assertRaises(DataRequestError):
+                list(streamed_data)
+
+            self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+    @patch("futbolean.data_import.base_data.time.sleep")
+    def test_fetch_data_retries(self, mock_sleep):
+        retry_policy = RetryPolicy(max_attempts=3, jitter=False)
+        server_error = MagicMock(status_code=503, headers={}, text="Starting up")
+        self.session.get.side_effect = [
+            requests.ConnectionError("Connection refused"),
+            server_error,
+            self.response,
+        ]
+
+        data = fetch_data(
+            "/player_stats",
+            session=self.session,
+            use_cache=False,
+            retry_policy=retry_policy,
+        )
+
+        self.assertEqual(data, self.response.json.return_value)
+        self.assertEqual(self.session.get.call_count, 3)
+        self.assertEqual([call[0][0] for call in mock_sleep.call_args_list], [2.0, 4.0])
+
+        with self.subTest("with Retry-After"):
+            mock_sleep.reset_mock()
+            rate_limited = MagicMock(
+                status_code=429, headers={"Retry-After": "7"}, text="Slow down"
+            )
+            self.session.get.side_effect = [rate_limited, self.response]
+
+            fetch_data(
+                "/player_stats",
+                session=self.session,
+                use_cache=False,
+                retry_policy=retry_policy,
+            )
+
+            mock_sleep.assert_called_once_with(7.0)
+
+        with self.subTest("when attempts run out"):
+            self.session.get.side_effect = None
+            self.session.get.return_value = server_error
+            self.session.get.reset_mock()
+
+            with self.assertRaisesRegex(DataRequestError, "after 3 attempt"):
+                fetch_data(
+                    "/player_stats",
+                    session=self.session,
+                    use_cache=False,
+                    retry_policy=retry_policy,
+                )
+
+            self.assertEqual(self.session.get.call_count, 3)
+
+        with self.subTest("when the wait would exceed the max elapsed time"):
+            self.session.get.reset_mock()
+
+            with self.assertRaises(DataRequestError):
+                fetch_data(
+                    "/player_stats",
+                    session=self.session,
+                    use_cache=False,
+                    retry_policy=retry_policy._replace(max_elapsed=1.0),
+                )
+
+            self.assertEqual(self.session.get.call_count, 1)
+
+        with self.subTest("with a client error"):
+            self.session.get.reset_mock()
+            self.session.get.return_value = MagicMock(
+                status_code=404, headers={}, text="Not found"
+            )
+
+            with self.assertRaises(DataRequestError):
+                fetch_data(
+                    "/player_stats",
+                    session=self.session,
+                    use_cache=False,
+                    retry_policy=retry_policy,
+                )
+
+            self.assertEqual(self.session.get.call_count, 1)
+
+    def test_make_session(self):
+        session = make_session(pool_connections=1, pool_maxsize=4)
+        adapter = session.get_adapter(LOCAL_AFL_DATA_SERVICE)
+
+        self.assertIsInstance(session, requests.Session)
+        self.assertEqual(adapter._pool_maxsize, 4)  # pylint: disable=protected-access
+        self.assertIn("gzip", session.headers["Accept-Encoding"])
+
+    def test_get_session(self):
+        set_session(None)
+        session = get_session()
+
+        self.assertIs(session, get_session())
+        self.assertIs(session, base_data._session)  # pylint: disable=protected-access
@@ -0,0 +1,67 @@
+# pylint: disable=missing-docstring
+
+from unittest import TestCase
+
+from futbolean.data_import.batch_sizing import (
+    AdaptiveBatchSizer,
+    GROWTH_FACTOR,
+    SHRINK_FACTOR,
+    SETTLED_AFTER_N_BATCHES,
+)
+
+
+INITIAL_SIZE = 50
+
+
+class TestAdaptiveBatchSizer(TestCase):
+    def setUp(self):
+        self.batch_sizer = AdaptiveBatchSizer(
+            INITIAL_SIZE,
+            min_size=5,
+            max_size=200,
+            target_seconds=100,
+            max_rows=1000,
+            verbose=0,
+        )
+
+    def test_record_batch(self):
+        with self.subTest("with a fast, small response"):
+            new_size = self.batch_sizer.record_batch(INITIAL_SIZE, 1, 10)
+
+            self.assertEqual(new_size, int(INITIAL_SIZE * GROWTH_FACTOR))
+
+        with self.subTest("with too many rows"):
+            batch_sizer = AdaptiveBatchSizer(INITIAL_SIZE, max_rows=1000, verbose=0)
+            new_size = batch_sizer.record_batch(INITIAL_SIZE, 1, 4000)
+
+            # 80 rows per player means 12 players fit under the max
+            self.assertEqual(new_size, 12)
+
+        with self.subTest("with a slow response"):
+            batch_sizer = AdaptiveBatchSizer(INITIAL_SIZE, target_seconds=10, verbose=0)
+            new_size = batch_sizer.record_batch(INITIAL_SIZE, 100, 10)
+
+            self.assertEqual(new_size, 5)
+
+        with self.subTest("with too many skipped URLs"):
+            batch_sizer = AdaptiveBatchSizer(INITIAL_SIZE, verbose=0)
+            new_size = batch_sizer.record_batch(INITIAL_SIZE, 1, 10, n_skipped=10)
+
+            self.assertEqual(new_size, int(INITIAL_SIZE * SHRINK_FACTOR))
+
+        with self.subTest("with size limits"):
+            for _ in range(10):
+                self.batch_sizer.record_batch(self.batch_sizer.batch_size, 0.1, 1)
+
+            self.assertEqual(self.batch_sizer.batch_size, 200)
+            self.assertTrue(self.batch_sizer.is_settled)
+
+    def test_record_error(self):
+        self.batch_sizer.record_error()
+        self.assertEqual(self.batch_sizer.batch_size, int(INITIAL_SIZE * SHRINK_FACTOR))
+
+        for _ in range(SETTLED_AFTER_N_BATCHES + 3):
+            self.batch_sizer.record_error()
+
+        self.assertEqual(self.batch_sizer.batch_size, 5)
+        self.assertTrue(self.batch_sizer.is_settled)
@@ -0,0 +1,78 @@
+# pylint: disable=missing-docstring
+
+import os
+import tempfile
+from unittest import TestCase
+
+from futbolean.data_import.checkpoints import (
+    manifest_filepath_for,
+    record_batch_checkpoint,
+    load_checkpointed_urls,
+    truncate_to_last_checkpoint,
+)
+
+
+class TestCheckpoints(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manifest_filepath = manifest_filepath_for(
+            os.path.join(self.temp_dir.name, "epl-player-match-data.jsonl")
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_manifest_filepath_for(self):
+        self.assertEqual(
+            os.path.basename(self.manifest_filepath),
+            "epl-player-match-data.manifest.jsonl",
+        )
+
+    def test_load_checkpointed_urls(self):
+        self.assertEqual(load_checkpointed_urls(self.manifest_filepath), (set(), set()))
+
+        record_batch_checkpoint(
+            self.manifest_filepath, "run-0", ["a", "b", "c"], ["b", "c"], 10
+        )
+        record_batch_checkpoint(self.manifest_filepath, "run-1", ["d", "b"], "", 5)
+
+        completed_urls, skipped_urls = load_checkpointed_urls(self.manifest_filepath)
+
+        self.assertEqual(completed_urls, {"a", "b", "d"})
+        self.assertEqual(skipped_urls, {"c"})
+
+    def test_truncate_to_last_checkpoint(self):
+        data_filepath = os.path.join(self.temp_dir.name, "epl-player-match-data.jsonl")
+
+        with open(data_filepath, "w") as data_file:
+            data_file.write('{"Player": "Ederson"}\n')
+
+        with self.subTest("without offsets in the checkpoints"):
+            record_batch_checkpoint(self.manifest_filepath, "run-0", ["a"], [], 1)
+
+            self.assertEqual(
+                truncate_to_last_checkpoint(data_filepath, self.manifest_filepath), 0
+            )
+
+        checkpointed_size = os.path.getsize(data_filepath)
+        record_batch_checkpoint(
+            self.manifest_filepath,
+            "run-1",
+            ["a"],
+            [],
+            1,
+            data_end_offset=checkpointed_size,
+        )
+
+        with open(data_filepath, "a") as data_file:
+            data_file.write('{"Player": "Kyle Walker"}\n{"Player": "Kyle')
+
+        n_bytes = truncate_to_last_checkpoint(data_filepath, self.manifest_filepath)
+
+        self.assertGreater(n_bytes, 0)
+        self.assertEqual(os.path.getsize(data_filepath), checkpointed_size)
+
+        with self.subTest("with nothing after the last checkpoint"):
+            self.assertEqual(
+                truncate_to_last_checkpoint(data_filepath, self.manifest_filepath), 0
+            )
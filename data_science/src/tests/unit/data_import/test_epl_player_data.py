@@ -1,14 +1,34 @@
 # pylint: disable=missing-docstring
 
+import io
 import os
+import tempfile
 from unittest import TestCase
 from unittest.mock import patch, mock_open
 import json
 
+import pandas as pd
+
+from futbolean.data_import import base_data
+from futbolean.data_import.base_data import (
+    DataRequestError,
+    StreamedData,
+    COLUMNS_FORMAT,
+    ROWS_FORMAT,
+)
 from futbolean.data_import.epl_player_data import (
     save_player_urls,
     save_player_match_data,
+    fetch_player_match_data,
+    player_key,
+    player_keys,
+    DEFAULT_MAX_IN_FLIGHT,
 )
+from futbolean.data_import.json_lines import iter_json_lines
+from futbolean.data_import.checkpoints import manifest_filepath_for
+from futbolean.data_import.batch_sizing import AdaptiveBatchSizer
+from futbolean.data_import.response_cache import ResponseCache
+from futbolean.data_import.player_match_parquet import read_player_match_parquet
 from futbolean.settings import BASE_DIR, RAW_DATA_DIR
 
 
@@ -30,6 +50,16 @@ class TestEplPlayerData(TestCase):
         )
         self.fake_player_match_data = json.load(open(player_data_filepath, "r"))
 
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.cache_patch = patch.object(
+            base_data, "_response_cache", ResponseCache(cache_dir=self.cache_dir.name)
+        )
+        self.cache_patch.start()
+
+    def tearDown(self):
+        self.cache_patch.stop()
+        self.cache_dir.cleanup()
+
     @patch(f"{EPL_PLAYER_DATA_MODULE_PATH}.fetch_player_urls")
     @patch("builtins.open", mock_open())
     @patch("json.dump")
@@ -41,7 +71,9 @@ class TestEplPlayerData(TestCase):
 
         save_player_urls(start_season=START_SEASON, end_season=END_SEASON, verbose=0)
 
-        mock_fetch_data.assert_called_with(START_SEASON, END_SEASON, verbose=0)
+        mock_fetch_data.assert_called_with(
+            START_SEASON, END_SEASON, verbose=0, use_cache=True
+        )
 
         data_filepath = os.path.join(
             RAW_DATA_DIR, f"epl-player-urls-{START_SEASON}-to-{END_SEASON}.json"
@@ -50,36 +82,359 @@ class TestEplPlayerData(TestCase):
         dump_args, _dump_kwargs = json.dump.call_args
         self.assertIn(self.fake_player_urls, dump_args)
 
-    @patch(f"{EPL_PLAYER_DATA_MODULE_PATH}.fetch_player_match_data")
-    @patch("builtins.open", mock_open())
-    @patch("json.load")
-    @patch("json.dump")
-    def test_save_player_match_data(
-        self, _mock_json_dump, mock_json_load, mock_fetch_data
-    ):
-        # Just need to mock loading of URLs, and existing player data
-        # (which doesn't matter here). The skipped URLs won't get loaded,
-        # because there's no file to load.
-        mock_json_load.side_effect = [self.fake_player_urls, []]
-        mock_fetch_data.return_value = (
-            {"data": self.fake_player_match_data, "skipped_urls": ""},
-            None,
-        )
+    @patch(f"{EPL_PLAYER_DATA_MODULE_PATH}.PLAYER_BATCH_SIZE", 5)
+    @patch(f"{EPL_PLAYER_DATA_MODULE_PATH}.stream_data")
+    def test_fetch_player_match_data(self, mock_fetch_data):
+        def fake_fetch_data(_path, params={}, **kwargs):
+            player_urls = list(params["player_urls"])
+            response = {
+                "data": {
+                    "data": (
+                        {"PlayerUrl": player_urls}
+                        if kwargs.get("response_format") == COLUMNS_FORMAT
+                        else [{"PlayerUrl": url} for url in player_urls]
+                    ),
+                    "skipped_urls": [],
+                },
+                "error": {},
+            }
 
-        skipped_url_filepath = os.path.join(
-            EPL_PLAYER_DATA_PATH, "skipped-epl-player-urls.json"
-        )
-        save_player_match_data(
-            player_url_filepath=self.url_filepath,
-            skipped_url_filepath=skipped_url_filepath,
-            verbose=0,
-        )
+            return StreamedData(io.BytesIO(json.dumps(response).encode("utf8")))
 
-        mock_fetch_data.assert_called_with(self.fake_player_urls, verbose=0)
+        mock_fetch_data.side_effect = fake_fetch_data
 
-        data_filepath = os.path.join(
-            RAW_DATA_DIR, f"epl-player-match-data-{START_SEASON}-to-{END_SEASON}.json"
+        for max_in_flight in [1, 4]:
+            with self.subTest(max_in_flight=max_in_flight):
+                data, error_url_idx = fetch_player_match_data(
+                    self.fake_player_urls,
+                    verbose=0,
+                    max_in_flight=max_in_flight,
+                    use_cache=False,
+                )
+
+                self.assertIsNone(error_url_idx)
+                self.assertEqual(
+                    [row["PlayerUrl"] for row in data["data"]], self.fake_player_urls
+                )
+                # Rows get parsed one at a time, rather than a column at a time
+                self.assertEqual(
+                    mock_fetch_data.call_args[1]["response_format"], ROWS_FORMAT
+                )
+
+        with self.subTest("as a data frame"):
+            data, error_url_idx = fetch_player_match_data(
+                self.fake_player_urls,
+                verbose=0,
+                max_in_flight=4,
+                use_cache=False,
+                as_frame=True,
+            )
+
+            self.assertIsNone(error_url_idx)
+            self.assertEqual(list(data["data"]["PlayerUrl"]), self.fake_player_urls)
+            self.assertEqual(
+                mock_fetch_data.call_args[1]["response_format"], COLUMNS_FORMAT
+            )
+
+        with self.subTest("with cached players"):
+            mock_fetch_data.reset_mock()
+            fetch_player_match_data(self.fake_player_urls[:7], verbose=0)
+
+            self.assertEqual(mock_fetch_data.call_count, 2)
+
+            # Cached players are found regardless of which batch they're in
+            mock_fetch_data.reset_mock()
+            batch_sizer = AdaptiveBatchSizer(initial_size=4)
+            data, _ = fetch_player_match_data(
+                self.fake_player_urls[2:10], verbose=0, batch_sizer=batch_sizer
+            )
+
+            requested_urls = [
+                url
+                for call_args in mock_fetch_data.call_args_list
+                for url in call_args[1]["params"]["player_urls"]
+            ]
+            self.assertEqual(requested_urls, self.fake_player_urls[7:10])
+            self.assertEqual(
+                sorted(row["PlayerUrl"] for row in data["data"]),
+                sorted(self.fake_player_urls[2:10]),
+            )
+
+            data, _ = fetch_player_match_data(
+                self.fake_player_urls[:10], verbose=0, as_frame=True
+            )
+
+            self.assertEqual(
+                sorted(data["data"]["PlayerUrl"]), sorted(self.fake_player_urls[:10])
+            )
+
+        with self.subTest("with a rate-limit error"):
+            error_batch_call = 2
+
+            def fake_fetch_data_with_error(path, params={}, **_kwargs):
+                if mock_fetch_data.call_count == error_batch_call:
+                    raise DataRequestError("Too many requests")
+
+                return fake_fetch_data(path, params=params)
+
+            mock_fetch_data.reset_mock()
+            mock_fetch_data.side_effect = fake_fetch_data_with_error
+
+            data, error_url_idx = fetch_player_match_data(
+                self.fake_player_urls, verbose=0, max_in_flight=1, use_cache=False
+            )
+
+            self.assertEqual(mock_fetch_data.call_count, error_batch_call)
+            self.assertEqual(error_url_idx, len(data["data"]))
+            self.assertEqual(
+                [row["PlayerUrl"] for row in data["data"]],
+                self.fake_player_urls[:error_url_idx],
+            )
+
+    @patch(f"{EPL_PLAYER_DATA_MODULE_PATH}.iter_player_match_data")
+    def test_save_player_match_data(self, mock_iter_data):
+        half_idx = len(self.fake_player_match_data) // 2
+        data_batches = [
+            self.fake_player_match_data[:half_idx],
+            self.fake_player_match_data[half_idx:],
+        ]
+        skipped_urls = self.fake_player_urls[10:12]
+        mock_iter_data.return_value = [
+            (self.fake_player_urls[:10], {"data": data_batches[0], "skipped_urls": []}),
+            (
+                self.fake_player_urls[10:],
+                {"data": data_batches[1], "skipped_urls": skipped_urls},
+            ),
+        ]
+
+        with tempfile.TemporaryDirectory() as raw_data_dir:
+            skipped_url_filepath = os.path.join(
+                raw_data_dir, "skipped-epl-player-urls.json"
+            )
+            data_filepath = os.path.join(
+                raw_data_dir,
+                f"epl-player-match-data-{START_SEASON}-to-{END_SEASON}.jsonl",
+            )
+
+            with patch(
+                f"{EPL_PLAYER_DATA_MODULE_PATH}.RAW_DATA_DIR", raw_data_dir
+            ), patch(
+                f"{EPL_PLAYER_DATA_MODULE_PATH}.INTERMEDIATE_DATA_DIR", raw_data_dir
+            ):
+                save_player_match_data(
+                    player_url_filepath=self.url_filepath,
+                    skipped_url_filepath=skipped_url_filepath,
+                    verbose=0,
+                )
+
+                mock_iter_data.assert_called_with(
+                    self.fake_player_urls,
+                    verbose=0,
+                    max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                    use_cache=True,
+                    since_dates=None,
+                )
+                self.assertEqual(
+                    list(iter_json_lines(data_filepath)), self.fake_player_match_data
+                )
+
+                with open(skipped_url_filepath, "r") as url_file:
+                    self.assertEqual(sorted(json.load(url_file)), sorted(skipped_urls))
+
+                parquet_dirpath = data_filepath.replace(".jsonl", "")
+                parquet_data = read_player_match_parquet(parquet_dirpath)
+                self.assertEqual(len(parquet_data), len(self.fake_player_match_data))
+
+                manifest = list(iter_json_lines(manifest_filepath_for(data_filepath)))
+                self.assertEqual(
+                    [checkpoint["n_rows"] for checkpoint in manifest],
+                    [len(data_batch) for data_batch in data_batches],
+                )
+
+                with self.subTest("when retrying skipped URLs"):
+                    mock_iter_data.return_value = None
+                    mock_iter_data.side_effect = lambda urls, **_kwargs: [
+                        (urls[:1], {"data": data_batches[0], "skipped_urls": []})
+                    ]
+
+                    with patch("json.load", wraps=json.load) as mock_json_load:
+                        save_player_match_data(
+                            player_url_filepath=self.url_filepath,
+                            skipped_url_filepath=skipped_url_filepath,
+                            skipped_only=True,
+                            verbose=0,
+                        )
+
+                        # We should only ever load the skipped URLs,
+                        # never the existing data
+                        self.assertEqual(mock_json_load.call_count, 1)
+
+                    retried_urls = mock_iter_data.call_args[0][0]
+                    self.assertEqual(sorted(retried_urls), sorted(skipped_urls))
+                    self.assertEqual(
+                        list(iter_json_lines(data_filepath)),
+                        self.fake_player_match_data + data_batches[0],
+                    )
+
+                    with open(skipped_url_filepath, "r") as url_file:
+                        self.assertEqual(json.load(url_file), retried_urls[1:])
+
+                    # Only the new rows get added to the Parquet data set
+                    self.assertEqual(len(os.listdir(parquet_dirpath)), 2)
+                    self.assertEqual(
+                        len(read_player_match_parquet(parquet_dirpath)),
+                        len(self.fake_player_match_data) + len(data_batches[0]),
+                    )
+
+                with self.subTest("when resuming from checkpoints"):
+                    save_player_match_data(
+                        player_url_filepath=self.url_filepath,
+                        skipped_url_filepath=skipped_url_filepath,
+                        verbose=0,
+                    )
+
+                    # Only the URL that's still skipped should get fetched again
+                    self.assertEqual(mock_iter_data.call_args[0][0], retried_urls[1:])
+
+                with self.subTest("after a run was killed partway through a batch"):
+                    n_saved_rows = len(list(iter_json_lines(data_filepath)))
+
+                    with open(data_filepath, "a") as data_file:
+                        data_file.write(json.dumps(data_batches[1][0]) + "\n")
+
+                    save_player_match_data(
+                        player_url_filepath=self.url_filepath,
+                        skipped_url_filepath=skipped_url_filepath,
+                        verbose=0,
+                    )
+
+                    # The uncheckpointed row gets dropped, and only the refetched
+                    # batch's rows are saved
+                    self.assertEqual(
+                        len(list(iter_json_lines(data_filepath))),
+                        n_saved_rows + len(data_batches[0]),
+                    )
+
+                with self.subTest("without resuming"):
+                    for _ in range(2):
+                        save_player_match_data(
+                            player_url_filepath=self.url_filepath,
+                            skipped_url_filepath=skipped_url_filepath,
+                            verbose=0,
+                            resume=False,
+                        )
+
+                        self.assertEqual(
+                            mock_iter_data.call_args[0][0], self.fake_player_urls
+                        )
+                        # Refetched rows go into a new file, rather than getting
+                        # added to the saved ones a second time
+                        self.assertEqual(
+                            list(iter_json_lines(data_filepath)), data_batches[0]
+                        )
+                        self.assertEqual(
+                            len(read_player_match_parquet(parquet_dirpath)),
+                            len(data_batches[0]),
+                        )
+
+                    self.assertTrue(os.path.isfile(f"{data_filepath}.previous"))
+
+                    with self.assertRaises(ValueError):
+                        save_player_match_data(
+                            player_url_filepath=self.url_filepath,
+                            skipped_url_filepath=skipped_url_filepath,
+                            verbose=0,
+                            resume=False,
+                            incremental=True,
+                        )
+
+                with self.subTest("with an incremental refresh"):
+                    # Older rows don't have a PlayerUrl, so the saved data
+                    # is matched to players by name
+                    player_url = "https://fbref.com/en/players/8c8e3a8c/Angelino"
+                    url_filepath = os.path.join(
+                        raw_data_dir,
+                        f"epl-player-urls-{START_SEASON}-to-{END_SEASON}.json",
+                    )
+
+                    with open(url_filepath, "w") as url_file:
+                        json.dump([player_url], url_file)
+
+                    saved_rows = [
+                        row
+                        for row in self.fake_player_match_data
+                        if row["Player"] == "Angeli\u00f1o"
+                    ]
+                    latest_row = max(saved_rows, key=lambda row: row["Date"])
+                    new_row = {
+                        **latest_row,
+                        "Date": "2019-08-10",
+                        "PlayerUrl": player_url,
+                    }
+                    mock_iter_data.side_effect = lambda urls, **_kwargs: [
+                        (
+                            urls,
+                            {
+                                "data": [{**latest_row, "PlayerUrl": player_url}]
+                                + [new_row, new_row],
+                                "skipped_urls": [],
+                            },
+                        )
+                    ]
+                    n_saved_rows = len(list(iter_json_lines(data_filepath)))
+
+                    save_player_match_data(
+                        player_url_filepath=url_filepath,
+                        skipped_url_filepath=skipped_url_filepath,
+                        verbose=0,
+                        incremental=True,
+                    )
+
+                    self.assertEqual(mock_iter_data.call_args[0][0], [player_url])
+                    self.assertEqual(
+                        mock_iter_data.call_args[1]["since_dates"],
+                        {player_url: latest_row["Date"]},
+                    )
+
+                    saved_data = list(iter_json_lines(data_filepath))
+                    self.assertEqual(len(saved_data), n_saved_rows + 1)
+                    self.assertEqual(saved_data[-1], new_row)
+
+    def test_player_keys(self):
+        player_urls = [
+            "https://fbref.com/en/players/1/Danny-Ward",
+            "https://fbref.com/en/players/2/Danny-Ward",
+        ]
+        player_matches = pd.DataFrame(
+            {
+                "Player": ["Danny Ward", "Danny Ward", "Angeli\u00f1o"],
+                "PlayerUrl": pd.Categorical(player_urls + [None]),
+            }
         )
-        open.assert_called_with(data_filepath, "w", encoding="utf8")
-        dump_args, _dump_kwargs = json.dump.call_args
-        self.assertIn(self.fake_player_match_data, dump_args)
+
+        # Players with the same name are kept apart by their URLs
+        self.assertEqual(list(player_keys(player_matches)), player_urls + ["angelino"])
+
+        with self.subTest("without a PlayerUrl column"):
+            self.assertEqual(
+                list(player_keys(player_matches.drop(columns="PlayerUrl"))),
+                ["danny ward", "danny ward", "angelino"],
+            )
+
+        with self.subTest("matches player_key"):
+            player_matches = pd.DataFrame(
+                {
+                    "Player": ["N'Golo  Kant\u00e9", "Heung-Min Son", None],
+                    "PlayerUrl": ["", None, None],
+                }
+            )
+
+            self.assertEqual(
+                list(player_keys(player_matches)),
+                [
+                    player_key(player_url, player_name)
+                    for player_url, player_name in zip(
+                        player_matches["PlayerUrl"], player_matches["Player"]
+                    )
+                ],
+            )
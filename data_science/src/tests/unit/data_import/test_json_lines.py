@@ -0,0 +1,76 @@
+# pylint: disable=missing-docstring
+
+import os
+import json
+import tempfile
+from unittest import TestCase
+
+from futbolean.data_import.json_lines import (
+    append_json_lines,
+    iter_json_lines,
+    convert_json_to_json_lines,
+    SpooledRows,
+)
+
+
+class TestJSONLines(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.temp_dir.name, "data.jsonl")
+        self.rows = [
+            {"Player": "Angeliño", "Result": "L 0–1", "OffenseGls": 0},
+            {"Player": "Angeliño", "Result": "W 3–1", "OffenseGls": 1},
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_append_json_lines(self):
+        self.assertEqual(append_json_lines(self.filepath, self.rows[:1]), 1)
+        self.assertEqual(append_json_lines(self.filepath, self.rows[1:]), 1)
+        self.assertEqual(list(iter_json_lines(self.filepath)), self.rows)
+
+        with self.subTest("after a partially-written row"):
+            with open(self.filepath, "a", encoding="utf8") as jsonl_file:
+                jsonl_file.write('{"Player": "Eder')
+
+            append_json_lines(self.filepath, self.rows)
+
+            with self.assertWarns(UserWarning):
+                rows = list(iter_json_lines(self.filepath))
+
+            self.assertEqual(rows, self.rows * 2)
+
+    def test_iter_json_lines_range(self):
+        append_json_lines(self.filepath, self.rows[:1])
+        first_row_end = os.path.getsize(self.filepath)
+        append_json_lines(self.filepath, self.rows[1:])
+
+        self.assertEqual(
+            list(iter_json_lines(self.filepath, start_offset=first_row_end)),
+            self.rows[1:],
+        )
+        self.assertEqual(
+            list(iter_json_lines(self.filepath, end_offset=first_row_end)),
+            self.rows[:1],
+        )
+
+    def test_convert_json_to_json_lines(self):
+        json_filepath = os.path.join(self.temp_dir.name, "data.json")
+
+        with open(json_filepath, "w", encoding="utf8") as json_file:
+            json.dump(self.rows, json_file, indent=2, ensure_ascii=False)
+
+        self.assertEqual(convert_json_to_json_lines(json_filepath, self.filepath), 2)
+        self.assertEqual(list(iter_json_lines(self.filepath)), self.rows)
+
+    def test_spooled_rows(self):
+        spooled_rows = SpooledRows(iter(self.rows))
+
+        self.assertEqual(len(spooled_rows), len(self.rows))
+        self.assertEqual(list(spooled_rows), self.rows)
+
+        with self.subTest("appending to a JSON Lines file"):
+            append_json_lines(self.filepath, spooled_rows)
+
+            self.assertEqual(list(iter_json_lines(self.filepath)), self.rows)
@@ -0,0 +1,51 @@
+# pylint: disable=missing-docstring
+
+from unittest import TestCase
+
+from futbolean.data_import.metrics import ImportMetrics
+
+
+METRICS_LOGGER_NAME = "tests.metrics"
+
+
+class TestImportMetrics(TestCase):
+    def setUp(self):
+        self.metrics = ImportMetrics(logger_name=METRICS_LOGGER_NAME)
+
+    def test_record(self):
+        with self.assertLogs(METRICS_LOGGER_NAME, level="INFO") as logs:
+            self.metrics.record_retry("/player_stats", 1, 2.0, status_code=503)
+            self.metrics.record_request(
+                "/player_stats", 12.0, 2048, 0.5, 100, status_code=200
+            )
+            self.metrics.record_request("/player_stats", 8.0, 1024, 0.25, 50)
+            self.metrics.record_cache_hit("/player_stats", 25)
+            self.metrics.record_batch(10, 100, 12.0, n_skipped=1)
+
+        summary = self.metrics.summary()
+
+        self.assertEqual(summary["n_requests"], 2)
+        self.assertEqual(summary["n_cached_requests"], 1)
+        self.assertEqual(summary["n_retries"], 1)
+        self.assertEqual(summary["n_bytes"], 3072)
+        self.assertEqual(summary["n_rows"], 175)
+        self.assertEqual(summary["mean_request_seconds"], 10.0)
+        self.assertEqual(summary["max_request_seconds"], 12.0)
+        self.assertEqual(summary["n_skipped_players"], 1)
+
+        with self.subTest("logs structured fields"):
+            self.assertEqual(len(logs.records), 5)
+
+            batch_record = logs.records[-1]
+
+            self.assertEqual(batch_record.event, "batch")
+            self.assertAlmostEqual(batch_record.rows_per_second, 100 / 12)
+            self.assertIn("players/s", batch_record.getMessage())
+
+        with self.subTest("format_summary"):
+            self.assertIn("2 to the data service", self.metrics.format_summary())
+
+        with self.subTest("reset"):
+            self.metrics.reset()
+
+            self.assertEqual(self.metrics.summary()["n_requests"], 0)
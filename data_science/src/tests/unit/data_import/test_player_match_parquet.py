@@ -0,0 +1,152 @@
+# pylint: disable=missing-docstring
+
+import os
+import json
+import tempfile
+from unittest import TestCase
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from futbolean.data_import.json_lines import append_json_lines
+from futbolean.data_import.player_match_parquet import (
+    write_player_match_parquet,
+    read_player_match_parquet,
+    convert_json_lines_to_parquet,
+    update_player_match_parquet_dataset,
+    season_label,
+    SEASON_COLUMN,
+)
+from futbolean.settings import BASE_DIR
+
+
+FIXTURE_FILEPATH = os.path.join(
+    BASE_DIR, "src/tests/fixtures/epl-player-match-data-2014-2015-to-2018-2019.json",
+)
+
+
+class TestPlayerMatchParquet(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.temp_dir.name, "data.parquet")
+
+        with open(FIXTURE_FILEPATH, "r") as data_file:
+            self.data = json.load(data_file)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_season_label(self):
+        self.assertEqual(season_label(pd.Timestamp("2018-08-10")), "2018-2019")
+        self.assertEqual(season_label(pd.Timestamp("2019-05-12")), "2018-2019")
+        self.assertIsNone(season_label(pd.NaT))
+
+    def test_write_player_match_parquet(self):
+        n_rows = write_player_match_parquet(self.filepath, self.data)
+
+        self.assertEqual(n_rows, len(self.data))
+
+        data_frame = read_player_match_parquet(self.filepath)
+        seasons = data_frame[SEASON_COLUMN].unique()
+
+        self.assertEqual(len(data_frame), len(self.data))
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(data_frame["Date"]))
+        self.assertTrue(pd.api.types.is_integer_dtype(data_frame["OffenseGls"]))
+
+        for column in ["Comp", "Squad", "Position"]:
+            self.assertIsInstance(data_frame[column].dtype, pd.CategoricalDtype)
+
+        for column in ["ExpectedxG", "ExpectedxG-PK", "ExpectedxA"]:
+            self.assertTrue(pd.api.types.is_float_dtype(data_frame[column]))
+
+        # Each season gets its own row group
+        self.assertEqual(pq.ParquetFile(self.filepath).num_row_groups, len(seasons))
+
+        with self.subTest("with column projection"):
+            data_frame = read_player_match_parquet(
+                self.filepath, columns=["Player", "Min"]
+            )
+
+            self.assertEqual(list(data_frame.columns), ["Player", "Min"])
+
+        with self.subTest("with a season filter"):
+            season = seasons[-1]
+            data_frame = read_player_match_parquet(
+                self.filepath, columns=["Date"], seasons=[season]
+            )
+            expected_n_rows = len(
+                [
+                    row
+                    for row in self.data
+                    if season_label(pd.Timestamp(row["Date"])) == season
+                ]
+            )
+
+            self.assertEqual(list(data_frame.columns), ["Date"])
+            self.assertEqual(len(data_frame), expected_n_rows)
+
+    def test_write_player_match_parquet_with_new_columns(self):
+        data = [{**row, "ExpectedNpxG+xA": "0.5"} for row in self.data]
+        write_player_match_parquet(self.filepath, data)
+
+        data_frame = read_player_match_parquet(self.filepath)
+
+        self.assertEqual(list(data_frame["ExpectedNpxG+xA"].unique()), ["0.5"])
+
+    def test_convert_json_lines_to_parquet(self):
+        jsonl_filepath = os.path.join(self.temp_dir.name, "data.jsonl")
+        append_json_lines(jsonl_filepath, self.data)
+
+        n_rows = convert_json_lines_to_parquet(jsonl_filepath, self.filepath)
+
+        self.assertEqual(n_rows, len(self.data))
+        data_frame = read_player_match_parquet(self.filepath)
+        self.assertEqual(
+            sorted(
+                zip(data_frame["Player"], data_frame["Date"].dt.strftime("%Y-%m-%d"))
+            ),
+            sorted((row["Player"], row["Date"]) for row in self.data),
+        )
+
+    def test_update_player_match_parquet_dataset(self):
+        jsonl_filepath = os.path.join(self.temp_dir.name, "data.jsonl")
+        dataset_dirpath = os.path.join(self.temp_dir.name, "data")
+        half_idx = len(self.data) // 2
+
+        append_json_lines(jsonl_filepath, self.data[:half_idx])
+        n_rows = update_player_match_parquet_dataset(jsonl_filepath, dataset_dirpath)
+
+        self.assertEqual(n_rows, half_idx)
+
+        append_json_lines(jsonl_filepath, self.data[half_idx:])
+        n_rows = update_player_match_parquet_dataset(jsonl_filepath, dataset_dirpath)
+
+        self.assertEqual(n_rows, len(self.data) - half_idx)
+        self.assertEqual(len(os.listdir(dataset_dirpath)), 2)
+
+        data_frame = read_player_match_parquet(dataset_dirpath)
+
+        self.assertEqual(len(data_frame), len(self.data))
+        self.assertIsInstance(data_frame["Comp"].dtype, pd.CategoricalDtype)
+
+        with self.subTest("without any new rows"):
+            self.assertEqual(
+                update_player_match_parquet_dataset(jsonl_filepath, dataset_dirpath), 0
+            )
+            self.assertEqual(len(os.listdir(dataset_dirpath)), 2)
+
+        with self.subTest("with a season filter"):
+            data_frame = read_player_match_parquet(
+                dataset_dirpath, columns=["Date"], seasons=["2018-2019"]
+            )
+
+            self.assertEqual(list(data_frame.columns), ["Date"])
+
+        with self.subTest("after the JSON Lines file was replaced"):
+            os.remove(jsonl_filepath)
+            append_json_lines(jsonl_filepath, self.data[:1])
+
+            update_player_match_parquet_dataset(jsonl_filepath, dataset_dirpath)
+
+            self.assertEqual(len(os.listdir(dataset_dirpath)), 1)
+            self.assertEqual(len(read_player_match_parquet(dataset_dirpath)), 1)
@@ -0,0 +1,55 @@
+# pylint: disable=missing-docstring
+
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from futbolean.data_import.rate_limiter import RateLimiter, EndpointRate
+
+
+RATE_LIMITER_MODULE_PATH = "futbolean.data_import.rate_limiter"
+
+
+class TestRateLimiter(TestCase):
+    def setUp(self):
+        self.state_dir = tempfile.TemporaryDirectory()
+        self.rates = {"/player_stats": EndpointRate(per_second=0.5, burst=2)}
+        self.rate_limiter = RateLimiter(
+            state_dir=self.state_dir.name, rates=self.rates, default_rate=None
+        )
+
+    def tearDown(self):
+        self.state_dir.cleanup()
+
+    @patch(f"{RATE_LIMITER_MODULE_PATH}.time")
+    def test_acquire(self, mock_time):
+        clock = {"now": 1000.0}
+        mock_time.time.side_effect = lambda: clock["now"]
+        mock_time.sleep.side_effect = lambda seconds: clock.update(
+            now=clock["now"] + seconds
+        )
+
+        waits = [self.rate_limiter.acquire("/player_stats") for _ in range(4)]
+
+        # The first two requests use up the burst, then the rest are paced
+        # at the sustained rate
+        self.assertEqual(waits, [0.0, 0.0, 2.0, 2.0])
+
+        with self.subTest("after a quiet spell"):
+            clock["now"] += 60
+
+            self.assertEqual(self.rate_limiter.acquire("/player_stats"), 0.0)
+            self.assertEqual(self.rate_limiter.acquire("/player_stats"), 0.0)
+
+        with self.subTest("shared with other limiters"):
+            # A limiter in another process reads the same state file
+            other_rate_limiter = RateLimiter(
+                state_dir=self.state_dir.name, rates=self.rates
+            )
+
+            self.assertEqual(other_rate_limiter.acquire("/player_stats"), 2.0)
+
+        with self.subTest("with an endpoint without a rate"):
+            self.assertEqual(self.rate_limiter.acquire("/player_urls"), 0.0)
+            self.assertNotIn("player_urls.json", os.listdir(self.state_dir.name))
@@ -0,0 +1,137 @@
+# pylint: disable=missing-docstring
+
+import os
+import time
+import tempfile
+from unittest import TestCase
+
+from futbolean.data_import.response_cache import ResponseCache
+
+
+PLAYER_URLS = [
+    "https://fbref.com/en/players/3515d404/James-Ward-Prowse",
+    "https://fbref.com/en/players/3bb7b8b4/Ederson",
+]
+
+
+class TestResponseCache(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(
+            cache_dir=self.cache_dir.name, ttls={"/player_stats": 60}, default_ttl=10
+        )
+        self.response = {"data": {"data": [{"Player": "Ederson"}], "skipped_urls": []}}
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_key(self):
+        self.assertEqual(
+            self.cache.key("/player_stats", {"player_urls": PLAYER_URLS}),
+            self.cache.key("/player_stats", {"player_urls": PLAYER_URLS[::-1]}),
+        )
+        self.assertNotEqual(
+            self.cache.key("/player_stats", {"player_urls": PLAYER_URLS}),
+            self.cache.key("/player_stats", {"player_urls": PLAYER_URLS[:1]}),
+        )
+
+        with self.subTest("with lists that are matched up by position"):
+            since_dates = ["2019-08-10", ""]
+
+            self.assertEqual(
+                self.cache.key(
+                    "/player_stats",
+                    {"player_urls": PLAYER_URLS, "since_dates": since_dates},
+                ),
+                self.cache.key(
+                    "/player_stats",
+                    {
+                        "player_urls": PLAYER_URLS[::-1],
+                        "since_dates": since_dates[::-1],
+                    },
+                ),
+            )
+            self.assertNotEqual(
+                self.cache.key(
+                    "/player_stats",
+                    {"player_urls": PLAYER_URLS, "since_dates": since_dates},
+                ),
+                self.cache.key(
+                    "/player_stats",
+                    {"player_urls": PLAYER_URLS, "since_dates": since_dates[::-1]},
+                ),
+            )
+
+    def test_get(self):
+        params = {"player_urls": PLAYER_URLS}
+        self.assertIsNone(self.cache.get("/player_stats", params))
+
+        self.cache.set("/player_stats", params, self.response)
+        self.assertEqual(self.cache.get("/player_stats", params), self.response)
+
+        with self.subTest("after deleting the response"):
+            self.cache.delete("/player_stats", params)
+            self.assertIsNone(self.cache.get("/player_stats", params))
+
+            self.cache.set("/player_stats", params, self.response)
+
+        with self.subTest("with an expired response"):
+            filepath = os.path.join(
+                self.cache_dir.name, self.cache.key("/player_stats", params) + ".json"
+            )
+            an_hour_ago = time.time() - 60 * 60
+            os.utime(filepath, (an_hour_ago, an_hour_ago))
+
+            self.assertIsNone(self.cache.get("/player_stats", params))
+            self.assertFalse(os.path.isfile(filepath))
+
+    def test_evict(self):
+        for idx, player_url in enumerate(PLAYER_URLS):
+            self.cache.set(
+                "/player_stats", {"player_urls": [player_url]}, self.response
+            )
+
+            filepath = os.path.join(
+                self.cache_dir.name,
+                self.cache.key("/player_stats", {"player_urls": [player_url]})
+                + ".json",
+            )
+            # Make sure access times are distinct
+            os.utime(filepath, (time.time() - 100 + idx, time.time()))
+
+        entry_size = os.path.getsize(filepath)
+        self.cache.max_bytes = entry_size
+        self.cache.evict()
+
+        self.assertIsNone(
+            self.cache.get("/player_stats", {"player_urls": PLAYER_URLS[:1]})
+        )
+        self.assertEqual(
+            self.cache.get("/player_stats", {"player_urls": PLAYER_URLS[1:]}),
+            self.response,
+        )
+
+    def test_temp_files(self):
+        abandoned_filepath = self.cache.temp_filepath()
+        two_hours_ago = time.time() - 2 * 60 * 60
+        os.utime(abandoned_filepath, (two_hours_ago, two_hours_ago))
+
+        in_progress_filepath = self.cache.temp_filepath()
+
+        with open(in_progress_filepath, "w") as temp_file:
+            temp_file.write("x" * 100)
+
+        self.cache.max_bytes = 150
+        self.cache.set("/player_stats", {"player_urls": PLAYER_URLS}, self.response)
+
+        # Abandoned temp files get removed, and ones that are still being written
+        # count towards the size limit
+        self.assertFalse(os.path.isfile(abandoned_filepath))
+        self.assertTrue(os.path.isfile(in_progress_filepath))
+        self.assertIsNone(self.cache.get("/player_stats", {"player_urls": PLAYER_URLS}))
+
+        with self.subTest("clear"):
+            os.utime(in_progress_filepath, (two_hours_ago, two_hours_ago))
+            self.cache.clear()
+
+            self.assertEqual(os.listdir(self.cache_dir.name), [])
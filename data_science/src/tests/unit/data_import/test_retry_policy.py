@@ -0,0 +1,42 @@
+# pylint: disable=missing-docstring
+
+from unittest import TestCase
+
+from futbolean.data_import.retry_policy import RetryPolicy
+
+
+class TestRetryPolicy(TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=False)
+
+    def test_is_retryable(self):
+        for status_code in [None, 429, 500, 502, 504]:
+            with self.subTest(status_code=status_code):
+                self.assertTrue(self.policy.is_retryable(status_code))
+
+        for status_code in [400, 403, 404]:
+            with self.subTest(status_code=status_code):
+                self.assertFalse(self.policy.is_retryable(status_code))
+
+    def test_delay(self):
+        self.assertEqual(
+            [self.policy.delay(attempt) for attempt in range(1, 6)],
+            [1.0, 2.0, 4.0, 5.0, 5.0],
+        )
+
+        with self.subTest("with jitter"):
+            policy = self.policy._replace(jitter=True)
+
+            for _ in range(20):
+                self.assertTrue(0 <= policy.delay(3) <= 4.0)
+
+        with self.subTest("with Retry-After in seconds"):
+            self.assertEqual(self.policy.delay(1, retry_after="30"), 30.0)
+
+        with self.subTest("with Retry-After as an HTTP date"):
+            self.assertEqual(
+                self.policy.delay(1, retry_after="Wed, 21 Oct 2015 07:28:00 GMT"), 0.0
+            )
+
+        with self.subTest("with an invalid Retry-After"):
+            self.assertEqual(self.policy.delay(2, retry_after="soon"), 2.0)
@@ -0,0 +1,63 @@
+# pylint: disable=missing-docstring
+
+import os
+import tempfile
+from unittest import TestCase
+
+import pandas as pd
+
+from futbolean.io.filtered_sql_table_data_set import FilteredSQLTableDataSet
+
+
+class TestFilteredSQLTableDataSet(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.credentials = {
+            "con": "sqlite:///" + os.path.join(self.temp_dir.name, "database.sqlite")
+        }
+        self.data = pd.DataFrame(
+            {
+                "id": [1, 2, 3, 4],
+                "league_id": [1729, 1729, 4769, 1729],
+                "season": ["2014/2015", "2015/2016", "2015/2016", "2016/2017"],
+                "goal": ["<goal />", "<goal />", "<goal />", "<goal />"],
+            }
+        )
+
+        FilteredSQLTableDataSet(table_name="Match", credentials=self.credentials).save(
+            self.data
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_load(self):
+        data_set = FilteredSQLTableDataSet(
+            table_name="Match",
+            credentials=self.credentials,
+            columns=["id", "season"],
+            filters={"league_id": 1729, "season": ["2014/2015", "2015/2016"]},
+        )
+        data = data_set.load()
+
+        self.assertEqual(list(data.columns), ["id", "season"])
+        self.assertEqual(list(data["id"]), [1, 2])
+
+        with self.subTest("without columns or filters"):
+            data_set = FilteredSQLTableDataSet(
+                table_name="Match", credentials=self.credentials
+            )
+
+            pd.testing.assert_frame_equal(data_set.load(), self.data)
+
+        with self.subTest("with a chunksize"):
+            data_set = FilteredSQLTableDataSet(
+                table_name="Match",
+                credentials=self.credentials,
+                filters={"league_id": [1729]},
+                chunksize=2,
+            )
+            chunks = list(data_set.load())
+
+            self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+            self.assertEqual(list(pd.concat(chunks)["id"]), [1, 2, 4])
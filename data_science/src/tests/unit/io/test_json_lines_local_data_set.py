@@ -0,0 +1,28 @@
+# pylint: disable=missing-docstring
+
+import os
+import tempfile
+from unittest import TestCase
+
+from futbolean.io.json_lines_local_data_set import JSONLinesLocalDataSet
+
+
+class TestJSONLinesLocalDataSet(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_set = JSONLinesLocalDataSet(
+            filepath=os.path.join(self.temp_dir.name, "data.jsonl")
+        )
+        self.data = [{"Player": "Ederson", "Min": 90}, {"Player": "Ederson", "Min": 0}]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save(self):
+        self.assertFalse(self.data_set.exists())
+
+        self.data_set.save(self.data)
+        self.data_set.save(self.data)
+
+        self.assertTrue(self.data_set.exists())
+        self.assertEqual(self.data_set.load(), self.data)
@@ -1,9 +1,19 @@
 # pylint: disable=missing-docstring
 
+import os
+import pickle
+import tempfile
+import threading
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
-from futbolean.io.json_remote_data_set import JSONRemoteDataSet
+from kedro.io import DataCatalog, DataSetError
+from kedro.pipeline import Pipeline, node
+
+from futbolean.io.json_remote_data_set import (
+    JSONRemoteDataSet,
+    prefetch_pipeline_inputs,
+)
 
 
 class TestJSONRemoteDataSet(TestCase):
@@ -48,3 +58,94 @@ class TestJSONRemoteDataSet(TestCase):
 
     def test_save(self):
         self.data_set.save({})
+
+        self.assertFalse(self.data_set.exists())
+
+    def test_local_copy(self):
+        data = [{"Player": "Angeli\u00f1o"}]
+        self.data_source.return_value = data
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepath = os.path.join(temp_dir, "data.json")
+            data_set = JSONRemoteDataSet(
+                data_source=self.data_source, filepath=filepath, max_age=60
+            )
+
+            self.assertEqual(data_set.load(), data)
+            self.assertTrue(data_set.exists())
+
+            # The fresh local copy gets loaded instead of fetching the data again
+            self.assertEqual(data_set.load(), data)
+            self.assertEqual(self.data_source.call_count, 1)
+
+            with self.subTest("when the local copy is stale"):
+                stale_time = os.path.getmtime(filepath) - 120
+                os.utime(filepath, (stale_time, stale_time))
+
+                data_set.load()
+
+                self.assertEqual(self.data_source.call_count, 2)
+
+            with self.subTest("when saving"):
+                saved_data = [{"Player": "Ederson"}]
+                data_set.save(saved_data)
+
+                self.assertEqual(data_set.load(), saved_data)
+                self.assertEqual(self.data_source.call_count, 2)
+
+    def test_prefetch(self):
+        fetch_started = threading.Event()
+        finish_fetch = threading.Event()
+
+        def slow_data_source(**_kwargs):
+            fetch_started.set()
+            finish_fetch.wait(timeout=5)
+            return [{"Player": "Ederson"}]
+
+        data_set = JSONRemoteDataSet(data_source=slow_data_source, prefetch=True)
+        unused_data_set = JSONRemoteDataSet(data_source=self.data_source, prefetch=True)
+        catalog = DataCatalog(
+            {"player_urls": data_set, "unused_player_urls": unused_data_set}
+        )
+        pipeline = Pipeline([node(len, "player_urls", "n_player_urls")])
+
+        # Creating the data set doesn't start the fetch
+        self.assertFalse(fetch_started.wait(timeout=0.05))
+
+        # Starting a pipeline does, but only for the data sets it loads
+        self.assertEqual(prefetch_pipeline_inputs(pipeline, catalog), ["player_urls"])
+        self.assertTrue(fetch_started.wait(timeout=5))
+        self.assertIs(data_set.prefetch(), data_set.prefetch())
+        self.data_source.assert_not_called()
+
+        finish_fetch.set()
+        self.assertEqual(data_set.load(), [{"Player": "Ederson"}])
+
+        with self.subTest("with a timeout"):
+            finish_fetch.clear()
+            data_set = JSONRemoteDataSet(data_source=slow_data_source, timeout=0.01)
+
+            with self.assertRaises(DataSetError):
+                data_set.load()
+
+            finish_fetch.set()
+
+        with self.subTest("with an async data_source"):
+
+            async def async_data_source(**kwargs):
+                return [kwargs]
+
+            data_set = JSONRemoteDataSet(
+                data_source=async_data_source,
+                load_kwargs={"start_season": self.start_season},
+            )
+
+            self.assertEqual(data_set.load(), [{"start_season": self.start_season}])
+
+        with self.subTest("when pickled"):
+            data_set = JSONRemoteDataSet(
+                data_source=dict, load_kwargs={"Player": "Ederson"}, prefetch=True
+            )
+            unpickled_data_set = pickle.loads(pickle.dumps(data_set))
+
+            self.assertEqual(unpickled_data_set.load(), {"Player": "Ederson"})
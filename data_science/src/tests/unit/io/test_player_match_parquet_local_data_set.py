@@ -0,0 +1,66 @@
+# pylint: disable=missing-docstring
+
+import os
+import tempfile
+from unittest import TestCase
+
+from kedro.io.core import DataSetError
+
+from futbolean.data_import.json_lines import append_json_lines
+from futbolean.data_import.player_match_parquet import (
+    update_player_match_parquet_dataset,
+)
+from futbolean.io.player_match_parquet_local_data_set import (
+    PlayerMatchParquetLocalDataSet,
+)
+
+
+class TestPlayerMatchParquetLocalDataSet(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.temp_dir.name, "data.parquet")
+        self.data = [
+            {"Date": "2018-05-13", "Player": "Ederson", "Comp": "Premier League"},
+            {"Date": "2018-08-12", "Player": "Ederson", "Comp": "Premier League"},
+        ]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save(self):
+        data_set = PlayerMatchParquetLocalDataSet(filepath=self.filepath)
+
+        self.assertFalse(data_set.exists())
+
+        data_set.save(self.data)
+
+        self.assertTrue(data_set.exists())
+        self.assertEqual(len(data_set.load()), len(self.data))
+
+        with self.subTest("with columns and seasons"):
+            data_set = PlayerMatchParquetLocalDataSet(
+                filepath=self.filepath,
+                columns=["Date", "Player"],
+                seasons=["2018-2019"],
+            )
+            data = data_set.load()
+
+            self.assertEqual(list(data.columns), ["Date", "Player"])
+            self.assertEqual(list(data["Date"].dt.strftime("%Y-%m-%d")), ["2018-08-12"])
+
+    def test_load_directory(self):
+        jsonl_filepath = os.path.join(self.temp_dir.name, "data.jsonl")
+        dataset_dirpath = os.path.join(self.temp_dir.name, "data")
+        data_set = PlayerMatchParquetLocalDataSet(filepath=dataset_dirpath)
+
+        self.assertFalse(data_set.exists())
+
+        for row in self.data:
+            append_json_lines(jsonl_filepath, [row])
+            update_player_match_parquet_dataset(jsonl_filepath, dataset_dirpath)
+
+        self.assertTrue(data_set.exists())
+        self.assertEqual(len(data_set.load()), len(self.data))
+
+        with self.assertRaises(DataSetError):
+            data_set.save(self.data)
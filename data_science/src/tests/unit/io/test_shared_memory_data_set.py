@@ -0,0 +1,86 @@
+# pylint: disable=missing-docstring
+
+import os
+import pickle
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from kedro.io.core import DataSetError
+
+from futbolean.io.shared_memory_data_set import SharedMemoryDataSet
+
+
+class TestSharedMemoryDataSet(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_set = SharedMemoryDataSet(directory=self.temp_dir.name)
+        self.data = pd.DataFrame(
+            {
+                "Player": ["Ederson", "Kyle Walker"],
+                "Min": np.array([90, 75], dtype="int64"),
+                "OffenseGls": [0.0, 1.0],
+            }
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save(self):
+        self.assertFalse(self.data_set.exists())
+
+        self.data_set.save(self.data)
+
+        self.assertTrue(self.data_set.exists())
+        self.assertEqual(os.listdir(self.temp_dir.name)[0][-6:], ".arrow")
+        pd.testing.assert_frame_equal(
+            self.data_set.load(), self.data, check_dtype=False
+        )
+
+        with self.subTest("when another process loads it"):
+            # Only the file's location gets pickled, not the data
+            data_set = pickle.loads(pickle.dumps(self.data_set))
+
+            self.assertLess(len(pickle.dumps(self.data_set)), 1000)
+            self.assertEqual(list(data_set.load()["Min"]), [90, 75])
+
+        with self.subTest("when Arrow can't represent the data"):
+            mixed_data = pd.DataFrame({"mixed": [1, "one", 1.5]})
+            self.data_set.save(mixed_data)
+
+            self.assertEqual(list(self.data_set.load()["mixed"]), [1, "one", 1.5])
+            self.assertEqual(len(os.listdir(self.temp_dir.name)), 1)
+
+    def test_save_fallback(self):
+        with tempfile.TemporaryDirectory() as fallback_dir:
+            # Writing to a directory that doesn't exist fails like a full /dev/shm
+            data_set = SharedMemoryDataSet(
+                directory=os.path.join(self.temp_dir.name, "missing"),
+                fallback_directory=fallback_dir,
+            )
+
+            for data in [self.data, pd.DataFrame({"mixed": [1, "one", 1.5]})]:
+                data_set.save(data)
+
+                self.assertEqual(len(os.listdir(fallback_dir)), 1)
+                pd.testing.assert_frame_equal(
+                    pickle.loads(pickle.dumps(data_set)).load(),
+                    data,
+                    check_dtype=False,
+                )
+
+            data_set.release()
+
+            self.assertFalse(data_set.exists())
+            self.assertEqual(os.listdir(fallback_dir), [])
+
+    def test_release(self):
+        self.data_set.save(self.data)
+        self.data_set.release()
+
+        self.assertFalse(self.data_set.exists())
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+        with self.assertRaises(DataSetError):
+            self.data_set.load()
@@ -0,0 +1,89 @@
+# pylint: disable=missing-docstring
+
+from unittest import TestCase
+
+import pandas as pd
+
+from futbolean.nodes import cleaning
+
+
+class TestCleaning(TestCase):
+    def test_clean_matches(self):
+        matches = pd.DataFrame(
+            {
+                "id": [2, 1, 3],
+                "match_api_id": [489043, 489042, 489043],
+                "date": [
+                    "2008-08-17 00:00:00",
+                    "2008-08-16 00:00:00",
+                    "2008-08-17 00:00:00",
+                ],
+            }
+        )
+
+        clean_matches = cleaning.clean_matches(matches)
+
+        self.assertNotIn("id", clean_matches.columns)
+        self.assertEqual(list(clean_matches["match_api_id"]), [489042, 489043])
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(clean_matches["date"]))
+
+    def test_clean_player_attributes(self):
+        player_attributes = pd.DataFrame(
+            {
+                "id": [1, 2, 3],
+                "player_api_id": [505942, 505942, 155782],
+                "date": ["2016-02-18", "2015-11-19", "2016-04-21"],
+                "overall_rating": [67, 62, 61],
+            }
+        )
+
+        clean_attributes = cleaning.clean_player_attributes(player_attributes)
+
+        self.assertEqual(list(clean_attributes["overall_rating"]), [61, 62, 67])
+
+    def test_clean_player_urls(self):
+        player_urls = [
+            "https://fbref.com/en/players/3bb7b8b4/Ederson",
+            "https://fbref.com/en/players/8c8e3a8c/Angelino",
+        ]
+
+        self.assertEqual(
+            cleaning.clean_player_urls(
+                {"data": player_urls + player_urls[:1], "skipped_urls": []}
+            ),
+            player_urls,
+        )
+
+    def test_clean_epl_player_matches(self):
+        player_matches = pd.DataFrame(
+            {
+                "Player": ["Ederson", "Ederson", "Ederson", "Ederson"],
+                "Date": pd.to_datetime(
+                    ["2018-08-12", None, "2018-08-12", "2018-08-19"]
+                ),
+                "Comp": ["Premier League"] * 4,
+            }
+        )
+
+        clean_player_matches = cleaning.clean_epl_player_matches(player_matches)
+
+        self.assertEqual(len(clean_player_matches), 2)
+        self.assertNotIn("player_key", clean_player_matches.columns)
+
+        with self.subTest("with players who share a name"):
+            player_urls = [
+                "https://fbref.com/en/players/1/Danny-Ward",
+                "https://fbref.com/en/players/2/Danny-Ward",
+            ]
+            player_matches = pd.DataFrame(
+                {
+                    "Player": ["Danny Ward"] * 3,
+                    "PlayerUrl": player_urls + player_urls[:1],
+                    "Date": pd.to_datetime(["2018-08-12"] * 3),
+                    "Comp": ["Premier League"] * 3,
+                }
+            )
+
+            clean_player_matches = cleaning.clean_epl_player_matches(player_matches)
+
+            self.assertEqual(list(clean_player_matches["PlayerUrl"]), player_urls)
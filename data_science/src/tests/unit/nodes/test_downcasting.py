@@ -0,0 +1,56 @@
+# pylint: disable=missing-docstring
+
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from futbolean.nodes.downcasting import downcast_dtypes, downcast_player_matches
+
+
+class TestDowncasting(TestCase):
+    def setUp(self):
+        n_rows = 100
+        self.player_matches = pd.DataFrame(
+            {
+                "Date": ["2018-08-12"] * n_rows,
+                "Birthdate": [""] * n_rows,
+                "Comp": ["Premier League"] * n_rows,
+                "Player": [f"Player {idx}" for idx in range(n_rows)],
+                "Min": np.full(n_rows, 90.0),
+                "OffenseGls": np.zeros(n_rows),
+                "DefenseTkl": np.arange(n_rows, dtype="float64") - 50,
+                "HeightCm": [np.nan] + [175.0] * (n_rows - 1),
+                "GoalkeepingSavePercentage": np.full(n_rows, 0.75),
+            }
+        )
+
+    def test_downcast_player_matches(self):
+        with self.assertLogs("futbolean.nodes.downcasting", level="INFO") as logs:
+            player_matches = downcast_player_matches(self.player_matches)
+
+        self.assertIn("Downcast player matches", logs.output[0])
+        self.assertLess(
+            player_matches.memory_usage(deep=True).sum(),
+            self.player_matches.memory_usage(deep=True).sum(),
+        )
+
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(player_matches["Date"]))
+        self.assertTrue(player_matches["Birthdate"].isnull().all())
+        self.assertIsInstance(player_matches["Comp"].dtype, pd.CategoricalDtype)
+        # Unique strings don't benefit from being categorical
+        self.assertNotIsInstance(player_matches["Player"].dtype, pd.CategoricalDtype)
+
+        self.assertEqual(player_matches["Min"].dtype, np.uint8)
+        self.assertEqual(player_matches["DefenseTkl"].dtype, np.int8)
+        self.assertEqual(player_matches["HeightCm"].dtype, np.float32)
+        self.assertEqual(player_matches["GoalkeepingSavePercentage"].dtype, np.float32)
+
+    def test_downcast_dtypes(self):
+        data_frame = pd.DataFrame({"count": [1000, 2000], "is_home": [True, False]})
+
+        downcast_data = downcast_dtypes(data_frame)
+
+        self.assertEqual(downcast_data["count"].dtype, np.uint16)
+        self.assertEqual(downcast_data["is_home"].dtype, bool)
+        pd.testing.assert_frame_equal(data_frame, downcast_data, check_dtype=False)
@@ -0,0 +1,33 @@
+# pylint: disable=missing-docstring
+
+from unittest import TestCase
+
+import pandas as pd
+
+from futbolean.nodes.features import add_team_match_features, add_player_match_features
+
+
+class TestFeatures(TestCase):
+    def test_add_team_match_features(self):
+        team_matches = pd.DataFrame({"goals": [2, 1, 0], "oppo_goals": [0, 1, 3]})
+
+        team_match_features = add_team_match_features(team_matches)
+
+        self.assertEqual(list(team_match_features["goal_difference"]), [2, 0, -3])
+        self.assertEqual(list(team_match_features["result"]), ["W", "D", "L"])
+        self.assertEqual(list(team_match_features["points"]), [3, 1, 0])
+
+    def test_add_player_match_features(self):
+        player_matches = pd.DataFrame(
+            {
+                "Date": pd.to_datetime(["2018-08-12", "2018-08-12"]),
+                "Birthdate": pd.to_datetime(["1993-08-17", None]),
+                "Start": ["Y", "N"],
+            }
+        )
+
+        player_match_features = add_player_match_features(player_matches)
+
+        self.assertAlmostEqual(player_match_features["age"][0], 24.99, places=2)
+        self.assertTrue(pd.isnull(player_match_features["age"][1]))
+        self.assertEqual(list(player_match_features["started"]), [True, False])
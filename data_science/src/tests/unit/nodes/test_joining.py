@@ -0,0 +1,150 @@
+# pylint: disable=missing-docstring
+
+from unittest import TestCase
+
+import pandas as pd
+
+from futbolean.nodes.joining import (
+    join_team_matches,
+    join_player_attributes,
+    join_player_match_attributes,
+    merge_latest,
+    TEAM_MATCH_COLUMNS,
+)
+
+
+class TestJoining(TestCase):
+    def test_join_team_matches(self):
+        matches = pd.DataFrame(
+            {
+                "match_api_id": [489042],
+                "country_id": [1729],
+                "league_id": [1729],
+                "season": ["2008/2009"],
+                "stage": [1],
+                "date": pd.to_datetime(["2008-08-17"]),
+                "home_team_api_id": [10260],
+                "away_team_api_id": [10261],
+                "home_team_goal": [1],
+                "away_team_goal": [0],
+            }
+        )
+        leagues = pd.DataFrame(
+            {"league_id": [1729], "country_id": [1729], "league_name": ["EPL"]}
+        )
+        countries = pd.DataFrame({"country_id": [1729], "country_name": ["England"]})
+        teams = pd.DataFrame(
+            {
+                "team_api_id": [10260, 10261],
+                "team_name": ["Manchester United", "Newcastle United"],
+            }
+        )
+
+        team_matches = join_team_matches(matches, leagues, countries, teams)
+
+        self.assertEqual(list(team_matches.columns), TEAM_MATCH_COLUMNS)
+        self.assertEqual(list(team_matches["at_home"]), [True, False])
+        self.assertEqual(
+            list(team_matches["oppo_team_name"]),
+            ["Newcastle United", "Manchester United"],
+        )
+        self.assertEqual(list(team_matches["goals"]), [1, 0])
+        self.assertEqual(list(team_matches["oppo_goals"]), [0, 1])
+
+    def test_join_player_attributes(self):
+        players = pd.DataFrame(
+            {
+                "player_api_id": [505942],
+                "player_fifa_api_id": [218353],
+                "player_name": ["Aaron Appindangoye"],
+            }
+        )
+        player_attributes = pd.DataFrame(
+            {
+                "player_api_id": [505942, 505942],
+                "player_fifa_api_id": [218353, 218353],
+                "overall_rating": [62, 67],
+            }
+        )
+
+        player_attribute_data = join_player_attributes(players, player_attributes)
+
+        self.assertEqual(len(player_attribute_data), 2)
+        self.assertEqual(
+            list(player_attribute_data["player_name"]), ["Aaron Appindangoye"] * 2
+        )
+
+    def test_merge_latest(self):
+        left = pd.DataFrame(
+            {
+                "player_api_id": [1, 2, 1, None, 1],
+                "Date": pd.to_datetime(
+                    ["2016-01-01", "2016-01-01", "2015-06-01", "2016-01-01", None]
+                ),
+            }
+        )
+        right = pd.DataFrame(
+            {
+                "player_api_id": [1, 1, 2],
+                "date": pd.to_datetime(["2015-09-01", "2014-09-01", "2016-02-01"]),
+                "overall_rating": [70, 65, 80],
+            }
+        )
+
+        merged = merge_latest(
+            left, right, left_on="Date", right_on="date", by="player_api_id"
+        )
+
+        # Rows keep their original order
+        self.assertEqual(list(merged["Date"]), list(left["Date"]))
+        self.assertEqual(
+            merged["overall_rating"].fillna(-1).tolist(), [70, -1, 65, -1, -1]
+        )
+
+    def test_join_player_match_attributes(self):
+        player_url = "https://fbref.com/en/players/3bb7b8b4/Ederson"
+        player_matches = pd.DataFrame(
+            {
+                "Player": ["Ederson", "Angeli\u00f1o"],
+                "PlayerUrl": pd.Categorical([player_url, None]),
+                "Date": pd.to_datetime(["2018-08-12", "2018-08-12"]).astype(
+                    "datetime64[ms]"
+                ),
+            }
+        )
+        player_index = pd.DataFrame(
+            {
+                "PlayerUrl": [player_url, "https://fbref.com/en/players/1/Angelino"],
+                "Player": ["Ederson", "Angelino"],
+                "player_api_id": [1, 2],
+            }
+        )
+        player_attributes = pd.DataFrame(
+            {
+                "player_api_id": [1, 2],
+                "player_fifa_api_id": [10, 20],
+                "date": pd.to_datetime(["2016-02-18", "2016-02-18"]),
+                "overall_rating": [80, 70],
+            }
+        )
+
+        player_match_data = join_player_match_attributes(
+            player_matches, player_index, player_attributes
+        )
+
+        self.assertEqual(list(player_match_data["player_api_id"]), [1, 2])
+        self.assertEqual(list(player_match_data["overall_rating"]), [80, 70])
+        self.assertIn("attributes_date", player_match_data.columns)
+        self.assertNotIn("player_fifa_api_id", player_match_data.columns)
+
+        with self.subTest("with a same-named player who isn't in the index"):
+            other_player_matches = player_matches.assign(
+                PlayerUrl=["https://fbref.com/en/players/2/Ederson", None]
+            )
+
+            player_match_data = join_player_match_attributes(
+                other_player_matches, player_index, player_attributes
+            )
+
+            self.assertTrue(pd.isnull(player_match_data["player_api_id"].iloc[0]))
+            self.assertEqual(player_match_data["player_api_id"].iloc[1], 2)
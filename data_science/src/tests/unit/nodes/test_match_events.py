@@ -0,0 +1,104 @@
+# pylint: disable=missing-docstring
+
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from futbolean.nodes.match_events import (
+    parse_match_events,
+    _map_in_order,
+    MATCH_EVENT_COLUMNS,
+)
+
+
+GOAL_XML = (
+    "<goal><value><comment>n</comment><stats><goals>1</goals></stats>"
+    "<elapsed>22</elapsed><player2>38807</player2><subtype>header</subtype>"
+    "<player1>37799</player1><sortorder>5</sortorder><team>10261</team>"
+    "<id>378998</id><type>goal</type><goal_type>n</goal_type></value></goal>"
+)
+CARD_XML = (
+    "<card><value><comment>y</comment><elapsed>56</elapsed>"
+    "<card_type>y</card_type><player1>24154</player1><team>10260</team>"
+    "<id>379481</id><type>card</type></value>"
+    "<value><comment>y</comment><elapsed>90</elapsed><elapsed_plus>2</elapsed_plus>"
+    "<card_type>y</card_type><player1>30627</player1><team>10261</team>"
+    "<id>379560</id><type>card</type></value></card>"
+)
+POSSESSION_XML = (
+    "<possession><value><comment>56</comment><elapsed>25</elapsed>"
+    "<subtype>possession</subtype><awaypos>44</awaypos><homepos>56</homepos>"
+    "<id>379029</id><type>special</type></value></possession>"
+)
+
+
+class TestMatchEvents(TestCase):
+    def setUp(self):
+        self.matches = pd.DataFrame(
+            {
+                "match_api_id": [489042, 489043],
+                "goal": [GOAL_XML, None],
+                "shoton": ["<shoton />", None],
+                "shotoff": [None, None],
+                "foulcommit": [None, None],
+                "card": [CARD_XML, ""],
+                "cross": [None, None],
+                "corner": [None, None],
+                "possession": [None, POSSESSION_XML],
+            }
+        )
+
+    def test_parse_match_events(self):
+        events = parse_match_events(self.matches, n_workers=1)
+
+        self.assertEqual(list(events.columns), MATCH_EVENT_COLUMNS)
+        self.assertEqual(len(events), 4)
+        self.assertEqual(
+            list(events["event_column"]), ["goal", "card", "card", "possession"]
+        )
+        self.assertEqual(list(events["match_api_id"]), [489042] * 3 + [489043])
+
+        goal = events.iloc[0]
+        self.assertEqual(goal["player1_api_id"], 37799)
+        self.assertEqual(goal["subtype"], "header")
+        # Nested <stats> elements aren't events of their own
+        self.assertEqual((events["event_column"] == "goal").sum(), 1)
+
+        self.assertEqual(events.iloc[2]["elapsed_plus"], 2)
+        self.assertEqual(events.iloc[3]["homepos"], 56)
+        self.assertIsInstance(events["type"].dtype, pd.CategoricalDtype)
+
+        with self.subTest("with multiple worker processes and chunks of matches"):
+            chunked_events = parse_match_events(
+                [self.matches.iloc[:1], self.matches.iloc[1:]],
+                n_workers=2,
+                chunk_size=1,
+            )
+
+            pd.testing.assert_frame_equal(chunked_events, events)
+
+        with self.subTest("with chunks of matches in this process"):
+            chunked_events = parse_match_events(self.matches, n_workers=1, chunk_size=1)
+
+            pd.testing.assert_frame_equal(chunked_events, events)
+
+    def test_map_in_order(self):
+        n_submitted = 0
+
+        def iter_items():
+            nonlocal n_submitted
+
+            for item in range(10):
+                n_submitted += 1
+                yield item
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = _map_in_order(
+                executor, lambda item: item ** 2, iter_items(), max_pending=3
+            )
+
+            self.assertEqual(next(results), 0)
+            # Only a few items get submitted ahead of the results
+            self.assertEqual(n_submitted, 4)
+            self.assertEqual(list(results), [item ** 2 for item in range(1, 10)])
@@ -0,0 +1,89 @@
+# pylint: disable=missing-docstring
+
+from unittest import TestCase
+
+import pandas as pd
+
+from futbolean.nodes.player_index import (
+    build_player_index,
+    player_index_lookup,
+    PLAYER_INDEX_COLUMNS,
+)
+
+
+class TestPlayerIndex(TestCase):
+    def setUp(self):
+        self.player_urls = [
+            "https://fbref.com/en/players/3bb7b8b4/Ederson",
+            "https://fbref.com/en/players/53cad200/Cesar-Azpilicueta",
+            "https://fbref.com/en/players/8df7a2fb/Ben-Mee",
+            "https://fbref.com/en/players/4806ec67/Jordan-Pickford",
+        ]
+        self.player_matches = pd.DataFrame(
+            {
+                "Player": ["Ederson", "César Azpilicueta", "Ben Mee", "Ben Mee"],
+                "Birthdate": pd.to_datetime(["1993-08-17", "1989-08-28", None, None]),
+                "HeightCm": [188, 178, 180, 180],
+                "PlayerUrl": [
+                    "https://fbref.com/en/players/3bb7b8b4/Ederson",
+                    None,
+                    None,
+                    None,
+                ],
+            }
+        )
+        self.players = pd.DataFrame(
+            {
+                "player_api_id": [1, 2, 3, 4, 5],
+                "player_name": [
+                    "Ederson Moraes",
+                    "Cesar Azpilicueta",
+                    "Ben Mee",
+                    "Ben Mee",
+                    "Jordan Pickford",
+                ],
+                "birthday": pd.to_datetime(
+                    [
+                        "1993-08-17 00:00:00",
+                        "1989-08-28 00:00:00",
+                        "1989-09-21 00:00:00",
+                        "1970-01-01 00:00:00",
+                        "1994-03-07 00:00:00",
+                    ]
+                ),
+                "height": [187.96, 177.8, 182.88, 170.18, 185.42],
+            }
+        )
+
+    def test_build_player_index(self):
+        player_index = build_player_index(
+            self.player_urls, self.player_matches, self.players, pd.DataFrame()
+        )
+
+        self.assertEqual(list(player_index.columns), PLAYER_INDEX_COLUMNS)
+        self.assertEqual(
+            player_index_lookup(player_index),
+            {
+                self.player_urls[0]: 1,
+                self.player_urls[1]: 2,
+                self.player_urls[2]: 3,
+                # Without any match data, we still match on the name in the URL
+                self.player_urls[3]: 5,
+            },
+        )
+        self.assertEqual(
+            list(player_index["match_method"]),
+            ["partial_name_birthdate", "name_birthdate", "name_height", "name"],
+        )
+
+        with self.subTest("with a previous index"):
+            previous_player_index = player_index.iloc[:2].assign(player_api_id=99)
+            player_index = build_player_index(
+                self.player_urls,
+                self.player_matches,
+                self.players,
+                previous_player_index,
+            )
+
+            # Previously-matched URLs don't get matched again
+            self.assertEqual(list(player_index["player_api_id"]), [99, 99, 3, 5])
@@ -0,0 +1,104 @@
+# pylint: disable=missing-docstring
+
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from futbolean.nodes.rolling_features import (
+    add_rolling_features,
+    update_rolling_features,
+)
+
+
+class TestRollingFeatures(TestCase):
+    def setUp(self):
+        self.player_matches = pd.DataFrame(
+            {
+                "Player": ["Ederson"] * 4 + ["Jamie Vardy"] * 3,
+                "PlayerUrl": [None] * 4
+                + ["https://fbref.com/en/players/45963054/Jamie-Vardy"] * 3,
+                "Date": pd.to_datetime(
+                    [
+                        "2018-08-19",
+                        "2018-08-12",
+                        "2018-08-25",
+                        "2018-09-01",
+                        "2018-08-10",
+                        "2018-08-18",
+                        "2018-08-27",
+                    ]
+                ),
+                "Comp": ["Premier League"] * 7,
+                "OffenseGls": [0, 0, 0, 0, 1, 2, 0],
+                "Min": [90, 80, 70, 60, 90, 90, 45],
+            }
+        )
+
+    def test_add_rolling_features(self):
+        rolling_features = add_rolling_features(
+            self.player_matches,
+            windows=[1, 2],
+            ewm_spans=[3],
+            stat_columns=["OffenseGls", "Min"],
+        )
+
+        ederson = rolling_features[rolling_features["Player"] == "Ederson"]
+        vardy = rolling_features[rolling_features["Player"] == "Jamie Vardy"]
+
+        # Matches are sorted by date, and only earlier matches count
+        self.assertEqual(list(ederson["Min"]), [80, 90, 70, 60])
+        self.assertEqual(list(ederson["Min_last_1"]), [0, 80, 90, 70])
+        self.assertEqual(list(ederson["Min_last_2"]), [0, 80, 170, 160])
+        self.assertEqual(list(vardy["OffenseGls_last_2"]), [0, 1, 3])
+
+        self.assertTrue(np.isnan(vardy["OffenseGls_ewm_3"].iloc[0]))
+        self.assertEqual(vardy["OffenseGls_ewm_3"].iloc[1], 1)
+        expected_ewm = pd.Series([1.0, 2.0]).ewm(span=3).mean().iloc[-1]
+        self.assertAlmostEqual(vardy["OffenseGls_ewm_3"].iloc[2], expected_ewm)
+
+    def test_update_rolling_features(self):
+        feature_kwargs = {
+            "windows": [2],
+            "ewm_spans": [3],
+            "stat_columns": ["OffenseGls", "Min"],
+        }
+        previous_matches = self.player_matches.iloc[[0, 1, 2, 4, 5]]
+        new_matches = self.player_matches.iloc[[2, 3, 6]]
+
+        rolling_features = update_rolling_features(
+            add_rolling_features(previous_matches, **feature_kwargs),
+            new_matches,
+            **feature_kwargs,
+        )
+
+        pd.testing.assert_frame_equal(
+            rolling_features,
+            add_rolling_features(self.player_matches, **feature_kwargs),
+            check_dtype=False,
+        )
+
+    def test_player_keys(self):
+        player_matches = pd.DataFrame(
+            {
+                "Player": ["Danny Ward", "Danny Ward", "Angeli\u00f1o", "Angelino"],
+                "PlayerUrl": [
+                    "https://fbref.com/en/players/1/Danny-Ward",
+                    "https://fbref.com/en/players/2/Danny-Ward",
+                    None,
+                    None,
+                ],
+                "Date": pd.to_datetime(["2018-08-10", "2018-08-11"] * 2),
+                "Comp": ["Premier League"] * 4,
+                "Min": [90, 45, 90, 80],
+            }
+        )
+
+        rolling_features = add_rolling_features(
+            player_matches, windows=[1], ewm_spans=[], stat_columns=["Min"]
+        ).set_index("Player")
+
+        # Players with the same name but different URLs are kept apart,
+        # and older rows without URLs are matched on normalized names
+        self.assertEqual(list(rolling_features.loc["Danny Ward", "Min_last_1"]), [0, 0])
+        self.assertEqual(rolling_features.loc["Angelino", "Min_last_1"], 90)
@@ -0,0 +1,67 @@
+# pylint: disable=missing-docstring
+
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from futbolean.nodes.team_aggregation import aggregate_team_matches, TEAM_SUM_COLUMNS
+
+
+class TestTeamAggregation(TestCase):
+    def setUp(self):
+        self.player_match_data = pd.DataFrame(
+            {
+                "Squad": pd.Categorical(
+                    ["Manchester Utd", "Manchester Utd", "Leicester City", None]
+                ),
+                "Date": pd.to_datetime(
+                    ["2015-08-08", "2015-08-08", "2015-08-08", "2015-08-08"]
+                ),
+                "Min": [90, 30, 90, 90],
+                "OffenseGls": [1, 0, 2, 5],
+                "OffenseSh": [3, 1, 4, 5],
+                "overall_rating": [80, np.nan, 70, 99],
+            }
+        )
+
+        for column in TEAM_SUM_COLUMNS:
+            if column not in self.player_match_data.columns:
+                self.player_match_data[column] = 0
+
+        self.team_matches = pd.DataFrame(
+            {
+                "match_api_id": [1987033],
+                "date": pd.to_datetime(["2015-08-08"]),
+                "season": ["2015/2016"],
+                "team_api_id": [10260],
+                "team_name": ["Manchester United"],
+                "oppo_team_api_id": [8659],
+                "at_home": [True],
+                "goals": [1],
+                "oppo_goals": [0],
+            }
+        )
+
+    def test_aggregate_team_matches(self):
+        team_player_match_stats = aggregate_team_matches(
+            self.player_match_data, self.team_matches
+        )
+
+        self.assertEqual(
+            list(team_player_match_stats["Squad"]), ["Leicester City", "Manchester Utd"]
+        )
+
+        man_utd = team_player_match_stats.iloc[1]
+        self.assertEqual(man_utd["n_players"], 2)
+        self.assertEqual(man_utd["OffenseGls"], 1)
+        self.assertEqual(man_utd["OffenseSh"], 4)
+        self.assertEqual(man_utd["Min"], 120)
+        # Only rated players count towards the team's rating
+        self.assertEqual(man_utd["overall_rating_weighted"], 80)
+        # fbref's abbreviated team names still match the Kaggle ones
+        self.assertEqual(man_utd["match_api_id"], 1987033)
+
+        leicester = team_player_match_stats.iloc[0]
+        self.assertEqual(leicester["overall_rating_weighted"], 70)
+        self.assertTrue(np.isnan(leicester["match_api_id"]))
@@ -0,0 +1,77 @@
+# pylint: disable=missing-docstring
+
+from unittest import TestCase
+import os
+
+from kedro.io import DataCatalog, MemoryDataSet
+from kedro.pipeline import Pipeline, node
+
+from futbolean.runner import HybridRunner, IO_TAG, CPU_TAG
+
+
+def fetch_numbers(count):
+    return [list(range(count)), os.getpid()]
+
+
+def square_numbers(numbers):
+    return [[number ** 2 for number in numbers], os.getpid()]
+
+
+def add_numbers(numbers, squares):
+    return sum(numbers) + sum(squares)
+
+
+class TestHybridRunner(TestCase):
+    def setUp(self):
+        self.runner = HybridRunner(max_thread_workers=2, max_process_workers=2)
+        self.pipeline = Pipeline(
+            [
+                node(
+                    fetch_numbers,
+                    "count",
+                    ["numbers", "fetch_pid"],
+                    name="fetch_numbers",
+                    tags=[IO_TAG],
+                ),
+                node(
+                    square_numbers,
+                    "numbers",
+                    ["squares", "square_pid"],
+                    name="square_numbers",
+                    tags=[CPU_TAG],
+                ),
+                node(add_numbers, ["numbers", "squares"], "total", name="add_numbers"),
+            ]
+        )
+
+    def test_run(self):
+        outputs = self.runner.run(
+            self.pipeline, DataCatalog({"count": MemoryDataSet(4)})
+        )
+
+        self.assertEqual(outputs["total"], 0 + 1 + 2 + 3 + 0 + 1 + 4 + 9)
+
+        with self.subTest("runs io nodes in this process"):
+            self.assertEqual(outputs["fetch_pid"], os.getpid())
+
+        with self.subTest("runs cpu nodes in another process"):
+            self.assertNotEqual(outputs["square_pid"], os.getpid())
+
+    def test_create_default_data_set(self):
+        self.runner.run(
+            Pipeline([self.pipeline.nodes[0]]),
+            DataCatalog({"count": MemoryDataSet(4)}),
+        )
+
+        with self.subTest("doesn't share data sets that only io nodes use"):
+            # pylint: disable=protected-access
+            self.assertIsInstance(
+                self.runner.create_default_data_set("numbers"), MemoryDataSet
+            )
+            self.assertIsNone(self.runner._manager)
+
+    def test_external_memory_data_set_output(self):
+        catalog = DataCatalog({"count": MemoryDataSet(4), "squares": MemoryDataSet()})
+
+        with self.assertRaisesRegex(AttributeError, "squares"):
+            self.runner.run(self.pipeline, catalog)